@@ -1 +1,2 @@
 from .client import CoreClient
+from .status_watcher import StatusEvent, StatusWatcher, Subscription
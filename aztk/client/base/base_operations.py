@@ -1,9 +1,10 @@
 from aztk import models
 from aztk.internal import cluster_data
 
-from .helpers import (create_user_on_cluster, create_user_on_node, delete_user_on_cluster, delete_user_on_node,
-                      generate_user_on_cluster, generate_user_on_node, get_application_log, get_recent_job,
-                      get_remote_login_settings, get_task_state, list_tasks, node_run, run, ssh_into_node, task_table)
+from .helpers import (cluster_credentials, create_user_on_cluster, create_user_on_node, delete_user_on_cluster,
+                      delete_user_on_node, generate_user_on_cluster, generate_user_on_node, get_application_log,
+                      get_recent_job, get_remote_login_settings, get_task_state, list_tasks, metadata_cache, node_run,
+                      run, ssh_into_node, task_table)
 
 
 class BaseOperations:
@@ -16,6 +17,16 @@ class BaseOperations:
             Blob service.
         secrets_configuration (:obj:`aztk.models.SecretsConfiguration`):
             Model that holds AZTK secrets used to authenticate with Azure and the clusters.
+        ssh_connection_pool (:obj:`aztk.utils.ssh.ConnectionPool`): Pool of SSH connections to cluster nodes
+            shared by all operations of the client.
+        node_executor (:obj:`aztk.utils.ssh.NodeExecutor`): Bounded executor shared by all operations that run
+            on every node of a cluster.
+        cluster_credentials (:obj:`aztk.client.base.helpers.cluster_credentials.ClusterCredentialManager`):
+            Generated users that operations use to connect to the nodes of each cluster.
+        metadata_cache (:obj:`aztk.client.base.helpers.metadata_cache.MetadataCache`): Cache of the pool, node and
+            configuration metadata of clusters.
+        artifact_store (:obj:`aztk.client.base.helpers.artifact_store.ArtifactStore`): Content addressed store of
+            the files uploaded for applications.
     """
 
     def __init__(self, context):
@@ -23,6 +34,11 @@ class BaseOperations:
         self.blob_client = context["blob_client"]
         self.table_service = context["table_service"]
         self.secrets_configuration = context["secrets_configuration"]
+        self.ssh_connection_pool = context["ssh_connection_pool"]
+        self.node_executor = context["node_executor"]
+        self.cluster_credentials = context["cluster_credentials"]
+        self.metadata_cache = context["metadata_cache"]
+        self.artifact_store = context["artifact_store"]
 
     def get_cluster_configuration(self, id: str) -> models.ClusterConfiguration:
         """Open an ssh tunnel to a node
@@ -42,7 +58,7 @@ class BaseOperations:
         Returns:
             :obj:`aztk.models.ClusterConfiguration`: Object representing the cluster's configuration
         """
-        return self.get_cluster_data(id).read_cluster_config()
+        return metadata_cache.get_cluster_configuration(self, id, cached=False)
 
     def get_cluster_data(self, id: str) -> cluster_data.ClusterData:
         """Gets the ClusterData object to manage data related to the given cluster
@@ -75,7 +91,7 @@ class BaseOperations:
         """
         ssh_into_node.ssh_into_node(self, id, node_id, username, ssh_key, password, port_forward_list, internal)
 
-    def create_user_on_node(self, id, node_id, username, ssh_key=None, password=None):
+    def create_user_on_node(self, id, node_id, username, ssh_key=None, password=None, expiry_time=None):
         """Create a user on a node
 
         Args:
@@ -84,11 +100,13 @@ class BaseOperations:
             username (:obj:`str`): name of the user to create.
             ssh_key (:obj:`str`, optional): ssh public key to create the user with, must use ssh_key or password.
             password (:obj:`str`, optional): password for the user, must use ssh_key or password.
+            expiry_time (:obj:`datetime.datetime`, optional): time at which the user expires.
+                Defaults to a year from now.
 
         Returns:
             :obj:`None`
         """
-        return create_user_on_node.create_user_on_node(self, id, node_id, username, ssh_key, password)
+        return create_user_on_node.create_user_on_node(self, id, node_id, username, ssh_key, password, expiry_time)
 
     # TODO: remove nodes as param
     def create_user_on_cluster(self, id, nodes, username, ssh_pub_key=None, password=None):
@@ -132,6 +150,23 @@ class BaseOperations:
         """
         return generate_user_on_cluster.generate_user_on_cluster(self, id, nodes)
 
+    def get_cluster_credentials(self, id, nodes, prune=True):
+        """Get the generated user that operations use to connect to the nodes of the cluster
+
+        The user is shared by all operations on the cluster until it expires, and is created on the given nodes
+        that do not have it yet.
+
+        Args:
+            id (:obj:`str`): the id of the cluster.
+            nodes (:obj:`List[ComputeNode]`): list of nodes the user must exist on.
+            prune (:obj:`bool`, optional): If True, nodes is every node in the cluster and nodes that left the
+                cluster are forgotten. Defaults to True.
+
+        Returns:
+            :obj:`tuple`: A tuple of the form (username: :obj:`str`, ssh_key: :obj:`Cryptodome.PublicKey.RSA`)
+        """
+        return self.cluster_credentials.get(self, id, nodes, prune)
+
     def delete_user_on_node(self, id: str, node_id: str, username: str) -> str:
         """Delete a user on a node
 
@@ -159,7 +194,16 @@ class BaseOperations:
         """
         return delete_user_on_cluster.delete_user_on_cluster(self, username, id, nodes)
 
-    def node_run(self, id, node_id, command, internal, container_name=None, timeout=None, block=True):
+    def node_run(self,
+                 id,
+                 node_id,
+                 command,
+                 internal,
+                 container_name=None,
+                 timeout=None,
+                 block=True,
+                 max_output_size=None,
+                 spill_output=False):
         """Run a bash command on the given node
 
         Args:
@@ -173,11 +217,17 @@ class BaseOperations:
             timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
             block=True (:obj:`bool`, optional): If True, the command blocks until execution is complete.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
 
         Returns:
             :obj:`aztk.models.NodeOutput`: object containing the output of the run command
         """
-        return node_run.node_run(self, id, node_id, command, internal, container_name, timeout, block)
+        return node_run.node_run(self, id, node_id, command, internal, container_name, timeout, block, max_output_size,
+                                 spill_output)
 
     def get_remote_login_settings(self, id: str, node_id: str):
         """Get the remote login information for a node in a cluster
@@ -191,7 +241,24 @@ class BaseOperations:
         """
         return get_remote_login_settings.get_remote_login_settings(self, id, node_id)
 
-    def run(self, id, command, internal, container_name=None, timeout=None):
+    def get_remote_login_settings_for_cluster(self, id: str, node_ids=None, max_workers: int = None):
+        """Get the remote login information for the nodes of a cluster
+
+        The nodes are resolved concurrently, and the settings of each node are cached for the lifetime of the node.
+
+        Args:
+            id (:obj:`str`): the id of the cluster the nodes are in
+            node_ids (:obj:`List[str]`, optional): the ids of the nodes to get the settings of. If None, all nodes
+                in the cluster are used. Defaults to None.
+            max_workers (:obj:`int`, optional): maximum number of nodes resolved concurrently.
+                Defaults to aztk.utils.constants.REMOTE_LOGIN_SETTINGS_CONCURRENCY.
+
+        Returns:
+            :obj:`Dict[str, aztk.models.RemoteLogin]`: the remote login settings of each node, by node id
+        """
+        return get_remote_login_settings.get_remote_login_settings_for_cluster(self, id, node_ids, max_workers)
+
+    def run(self, id, command, internal, container_name=None, timeout=None, max_output_size=None, spill_output=False):
         """Run a bash command on every node in the cluster
 
         Args:
@@ -203,11 +270,50 @@ class BaseOperations:
                 If None, the command will run on the host VM. Defaults to None.
             timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
 
         Returns:
             :obj:`List[azkt.models.NodeOutput]`: list of NodeOutput objects containing the output of the run command
         """
-        return run.cluster_run(self, id, command, internal, container_name, timeout)
+        return run.cluster_run(self, id, command, internal, container_name, timeout, max_output_size, spill_output)
+
+    def run_stream(self,
+                   id,
+                   command,
+                   internal,
+                   container_name=None,
+                   timeout=None,
+                   lines=False,
+                   max_output_size=None,
+                   spill_output=False):
+        """Run a bash command on every node in the cluster and yield the output of each node as soon as it finishes
+
+        Args:
+            id (:obj:`str`): the id of the cluster to run the command on.
+            command (:obj:`str`): the bash command to execute on the node.
+            internal (:obj:`bool`): if true, this will connect to the node using its internal IP.
+                Only use this if running within the same VNET as the cluster. Defaults to False.
+            container_name=None (:obj:`str`, optional): the name of the container to run the command in.
+                If None, the command will run on the host VM. Defaults to None.
+            timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
+                Defaults to None.
+            lines=False (:obj:`bool`, optional): If True, every line of output is also yielded as an
+                :obj:`aztk.models.SSHLog` as soon as the node writes it. Defaults to False.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
+
+        Returns:
+            :obj:`Iterator[aztk.models.NodeOutput]`: generator of NodeOutput objects, in the order nodes finish
+        """
+        return run.cluster_run_stream(self, id, command, internal, container_name, timeout, lines, max_output_size,
+                                      spill_output)
 
     def get_application_log(self, id: str, application_name: str, tail=False, current_bytes: int = 0):
         """Get the log for a running or completed application
@@ -0,0 +1,173 @@
+import concurrent.futures
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import List
+
+import azure.batch.models as batch_models
+import azure.common
+
+from aztk.utils import blob_upload, constants, file_utils, helpers, sas
+
+
+class FileHashIndex:
+    """On disk index of the SHA-256 of local files, so files that did not change are not hashed again
+
+    A file is identified by its real path, size and modification time.
+
+    Args:
+        path (:obj:`str`, optional): path of the index file. Defaults to aztk.utils.constants.ARTIFACT_INDEX_PATH.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or constants.ARTIFACT_INDEX_PATH
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def get_sha256(self, file_path: str) -> str:
+        file_path = os.path.realpath(os.path.expanduser(file_path))
+        stat = os.stat(file_path)
+        with self._lock:
+            entry = self._load().get(file_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        sha256 = self._hash(file_path)
+        with self._lock:
+            self._load()[file_path] = dict(size=stat.st_size, mtime=stat.st_mtime_ns, sha256=sha256)
+            self._save()
+        return sha256
+
+    @staticmethod
+    def _hash(file_path):
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as stream:
+            for chunk in iter(lambda: stream.read(constants.ARTIFACT_HASH_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="UTF-8") as stream:
+                    self._entries = json.load(stream)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            file_utils.write_json_atomic(self.path, self._entries)
+        except OSError as e:
+            logging.debug("Failed to write the artifact index %s: %r", self.path, e)
+
+
+class ArtifactStore:
+    """Content addressed store of the files uploaded for applications
+
+    Files are stored once in a container shared by every cluster and job, in a blob named after their SHA-256,
+    so a file that was already uploaded, by this client or another, is not uploaded again. The hashes of local
+    files are kept in a FileHashIndex, so unchanged files are not hashed again either.
+
+    Stored files are not deleted with the clusters and jobs that use them. Reusing a stored file updates its last
+    modified time, and prune() deletes the files that were not used for longer than the resource files handed out
+    for them stay readable.
+
+    Args:
+        blob_client (:obj:`azure.storage.blob.BlockBlobService`): client of the storage account the files are
+            stored in.
+        container_name (:obj:`str`, optional): name of the container the files are stored in.
+            Defaults to aztk.utils.constants.ARTIFACT_CONTAINER_NAME.
+        index (:obj:`aztk.client.base.helpers.artifact_store.FileHashIndex`, optional): index of the hashes of
+            local files. Defaults to a FileHashIndex at aztk.utils.constants.ARTIFACT_INDEX_PATH.
+        progress_callback (:obj:`Callable`, optional): called with an :obj:`aztk.utils.blob_upload.UploadProgress`
+            as files are uploaded. Defaults to None.
+    """
+
+    def __init__(self, blob_client, container_name: str = None, index: FileHashIndex = None, progress_callback=None):
+        self.blob_client = blob_client
+        self.container_name = container_name or constants.ARTIFACT_CONTAINER_NAME
+        self.index = index or FileHashIndex()
+        self.progress_callback = progress_callback
+        # sha256 -> future of the name of the stored blob, so concurrent uploads of a file happen once
+        self._blobs = {}
+        self._lock = threading.Lock()
+
+    def upload(self, file_path: str, node_path: str = None) -> batch_models.ResourceFile:
+        """Store a local file, unless a file with the same content is already stored
+
+        Args:
+            file_path (:obj:`str`): path of the local file.
+            node_path (:obj:`str`, optional): path of the file on the node. Defaults to the name of the file.
+
+        Returns:
+            :obj:`azure.batch.models.ResourceFile`: resource file that downloads the stored file to node_path.
+        """
+        file_path = helpers.normalize_path(file_path)
+        blob_name = self._store(self.index.get_sha256(file_path), file_path)
+        node_path = node_path or os.path.basename(file_path)
+        return sas.get_sas_provider(self.blob_client).get_resource_file(self.container_name, blob_name, node_path)
+
+    def _store(self, sha256, file_path):
+        with self._lock:
+            future = self._blobs.get(sha256)
+            owner = future is None
+            if owner:
+                future = self._blobs[sha256] = concurrent.futures.Future()
+        if owner:
+            try:
+                blob_name = "sha256/" + sha256
+                blob_upload.ensure_container(self.blob_client, self.container_name)
+                if not blob_upload.touch(self.blob_client, self.container_name, blob_name):
+                    blob_upload.upload_file(self.blob_client, self.container_name, blob_name, file_path,
+                                            self.progress_callback)
+                future.set_result(blob_name)
+            except Exception as e:
+                # a failed upload is attempted again by the next caller
+                with self._lock:
+                    del self._blobs[sha256]
+                future.set_exception(e)
+        return future.result()
+
+    def prune(self, older_than: datetime.timedelta = None) -> List[str]:
+        """Delete the stored files that were not uploaded or reused for longer than older_than
+
+        Node scripts bundles, which nodes download again whenever they start, are only deleted once they were not
+        used for longer than aztk.utils.constants.DEFINITION_SAS_EXPIRY.
+
+        Args:
+            older_than (:obj:`datetime.timedelta`, optional): time after which an unused file is deleted. A file is
+                no longer readable by the resource files handed out for it once their shared access signature
+                expired. Defaults to the expiry of the SAS provider of the blob client.
+
+        Returns:
+            :obj:`List[str]`: names of the deleted blobs.
+        """
+        older_than = older_than or sas.get_sas_provider(self.blob_client).expiry
+        now = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            blobs = list(self.blob_client.list_blobs(self.container_name))
+        except azure.common.AzureMissingResourceHttpError:
+            return []
+        deleted = []
+        for blob in blobs:
+            # see aztk.internal.cluster_data.node_data.NodeScriptsBundle.blob_name
+            lifetime = constants.DEFINITION_SAS_EXPIRY if blob.name.startswith("node-scripts/") else older_than
+            if now - blob.properties.last_modified <= lifetime:
+                continue
+            try:
+                # a blob reused since it was listed is modified, and kept
+                self.blob_client.delete_blob(
+                    self.container_name, blob.name, if_unmodified_since=blob.properties.last_modified)
+            except azure.common.AzureHttpError as e:
+                if e.status_code not in (404, 412):
+                    raise
+                continue
+            deleted.append(blob.name)
+        with self._lock:
+            for blob_name in deleted:
+                if blob_name.startswith("sha256/"):
+                    self._blobs.pop(blob_name[len("sha256/"):], None)
+        return deleted
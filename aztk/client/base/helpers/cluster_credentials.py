@@ -0,0 +1,188 @@
+import collections
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from azure.batch.models import BatchErrorException
+from Cryptodome.PublicKey import RSA
+
+from aztk import error
+from aztk.utils import constants, file_utils, helpers, secure_utils
+
+
+class _Credentials:
+    def __init__(self, username, ssh_key, expiry, nodes=None):
+        self.username = username
+        self.ssh_key = ssh_key
+        self.expiry = expiry
+        # node id -> last boot time of the node when the user was created on it
+        self.nodes = nodes or {}
+
+    def to_dict(self):
+        return dict(
+            username=self.username,
+            ssh_key=self.ssh_key.exportKey().decode("utf-8"),
+            expiry=self.expiry,
+            nodes=self.nodes,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["username"], RSA.importKey(data["ssh_key"]), data["expiry"], data["nodes"])
+
+
+class ClusterCredentialManager:
+    """Generated users that operations use to connect to the nodes of a cluster
+
+    One user is generated per cluster and reused by every operation until its time to live runs out. The user is
+    only created on the nodes that do not have it yet, so a node that joins the cluster, or is rebooted, gets it
+    on the next operation. Users are created with a Batch expiry time, and a user whose time to live ran out is
+    deleted the next time credentials for its cluster are requested.
+
+    Users are kept on disk, readable by the user only, so every process of the user, such as each CLI command,
+    reuses them instead of creating a user of its own.
+
+    Args:
+        ttl (:obj:`int`, optional): number of seconds a generated user is handed out for.
+            Defaults to aztk.utils.constants.CLUSTER_CREDENTIALS_TTL.
+        path (:obj:`str`, optional): directory the users are kept in.
+            Defaults to aztk.utils.constants.CLUSTER_CREDENTIALS_PATH.
+        account (:obj:`str`, optional): url of the Batch account of the clusters, cluster ids are only unique per
+            account. Defaults to "".
+    """
+
+    def __init__(self, ttl: int = None, path: str = None, account: str = ""):
+        self.ttl = ttl or constants.CLUSTER_CREDENTIALS_TTL
+        self.path = path or constants.CLUSTER_CREDENTIALS_PATH
+        self.account = account
+        self._credentials = {}
+        self._lock = threading.Lock()
+        self._cluster_locks = collections.defaultdict(threading.Lock)
+
+    def get(self, base_operations, id, nodes, prune=True):
+        """Get the generated user of a cluster, creating it on the given nodes if they do not have it
+
+        Args:
+            base_operations (:obj:`aztk.client.base.BaseOperations`): operations used to create and delete users.
+            id (:obj:`str`): the id of the cluster.
+            nodes (:obj:`List[ComputeNode]`): the nodes the user must exist on.
+            prune (:obj:`bool`, optional): If True, nodes is every node of the cluster, and nodes that are not in
+                it anymore are forgotten. Defaults to True.
+
+        Raises:
+            :obj:`aztk.error.AztkError`: if the user could not be created on some of the nodes.
+
+        Returns:
+            :obj:`tuple`: A tuple of the form (username: :obj:`str`, ssh_key: :obj:`Cryptodome.PublicKey.RSA`)
+        """
+        with self._lock:
+            cluster_lock = self._cluster_locks[id]
+        with cluster_lock:
+            credentials = self._credentials.get(id) or self._load(id)
+            expired = None
+            if credentials and credentials.expiry <= time.time():
+                expired, credentials = credentials, None
+            if credentials is None:
+                credentials = _Credentials(secure_utils.generate_random_string(), RSA.generate(2048),
+                                           time.time() + self.ttl)
+            self._credentials[id] = credentials
+            if prune:
+                node_ids = {node.id for node in nodes}
+                credentials.nodes = {
+                    node_id: boot_time for node_id, boot_time in credentials.nodes.items() if node_id in node_ids
+                }
+            missing = [
+                node for node in nodes
+                if node.id not in credentials.nodes or credentials.nodes[node.id] != str(node.last_boot_time)
+            ]
+            failures = self._create(base_operations, id, credentials, missing) if missing else {}
+            self._save(id, credentials)
+        if expired:
+            self._delete(base_operations, id, expired)
+        if failures:
+            raise error.AztkError("Failed to create user {} on nodes of cluster {}: {}".format(
+                credentials.username, id,
+                "; ".join("{}: {}".format(node_id, message) for node_id, message in sorted(failures.items()))))
+        return credentials.username, credentials.ssh_key
+
+    def invalidate(self, base_operations, id, delete_user=True):
+        """Forget the generated user of a cluster
+
+        If delete_user is True, the user is also deleted from the nodes it was created on.
+        """
+        with self._lock:
+            cluster_lock = self._cluster_locks[id]
+        with cluster_lock:
+            credentials = self._credentials.pop(id, None) or self._load(id)
+            self._remove(id)
+        if credentials and delete_user:
+            self._delete(base_operations, id, credentials)
+        elif credentials:
+            base_operations.ssh_connection_pool.evict_user(credentials.username)
+
+    def _create(self, base_operations, id, credentials, nodes):
+        """Create the user on nodes, and return the error message of every node it could not be created on"""
+        ssh_pub_key = credentials.ssh_key.publickey().exportKey("OpenSSH").decode("utf-8")
+        # leave operations started just before the time to live runs out the time to finish
+        expiry_time = datetime.fromtimestamp(credentials.expiry + self.ttl, timezone.utc)
+        failures = {}
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            futures = {
+                executor.submit(
+                    base_operations.create_user_on_node,
+                    id,
+                    node.id,
+                    credentials.username,
+                    ssh_pub_key,
+                    expiry_time=expiry_time): node for node in nodes
+            }
+            for future in concurrent.futures.as_completed(futures):
+                node = futures[future]
+                exception = future.exception()
+                if isinstance(exception, BatchErrorException):
+                    failures[node.id] = helpers.format_batch_exception(exception)
+                elif exception:
+                    failures[node.id] = str(exception)
+                else:
+                    credentials.nodes[node.id] = str(node.last_boot_time)
+        return failures
+
+    def _delete(self, base_operations, id, credentials):
+        base_operations.ssh_connection_pool.evict_user(credentials.username)
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(base_operations.delete_user_on_node, id, node_id, credentials.username)
+                for node_id in credentials.nodes
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                # the user expires on its own if it cannot be deleted, or the node is gone
+                if future.exception():
+                    logging.debug("Failed to delete user %s: %s", credentials.username, repr(future.exception()))
+
+    def _file(self, id):
+        key = hashlib.sha256("{}|{}".format(self.account, id).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, key + ".json")
+
+    def _load(self, id):
+        try:
+            with open(self._file(id), "r", encoding="UTF-8") as stream:
+                return _Credentials.from_dict(json.load(stream))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, id, credentials):
+        try:
+            file_utils.write_json_atomic(self._file(id), credentials.to_dict(), directory_mode=0o700)
+        except OSError as e:
+            logging.debug("Failed to write the credentials of cluster %s: %r", id, e)
+
+    def _remove(self, id):
+        try:
+            os.remove(self._file(id))
+        except OSError:
+            pass
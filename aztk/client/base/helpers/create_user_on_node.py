@@ -6,7 +6,13 @@ from azure.batch.models import BatchErrorException
 from aztk.utils import get_ssh_key
 
 
-def __create_user(self, id: str, node_id: str, username: str, password: str = None, ssh_key: str = None) -> str:
+def __create_user(self,
+                  id: str,
+                  node_id: str,
+                  username: str,
+                  password: str = None,
+                  ssh_key: str = None,
+                  expiry_time: datetime = None) -> str:
     """
         Create a pool user
         :param pool: the pool to add the user to
@@ -14,6 +20,7 @@ def __create_user(self, id: str, node_id: str, username: str, password: str = No
         :param username: username of the user to add
         :param password: password of the user to add
         :param ssh_key: ssh_key of the user to add
+        :param expiry_time: time the user expires at, defaults to a year from now
     """
     # Create new ssh user for the given node
     self.batch_client.compute_node.add_user(
@@ -24,17 +31,25 @@ def __create_user(self, id: str, node_id: str, username: str, password: str = No
             is_admin=True,
             password=password,
             ssh_public_key=get_ssh_key.get_user_public_key(ssh_key, self.secrets_configuration),
-            expiry_time=datetime.now(timezone.utc) + timedelta(days=365),
+            expiry_time=expiry_time or datetime.now(timezone.utc) + timedelta(days=365),
         ),
     )
 
 
-def create_user_on_node(base_client, id, node_id, username, ssh_key=None, password=None):
+def create_user_on_node(base_client, id, node_id, username, ssh_key=None, password=None, expiry_time=None):
     try:
-        __create_user(base_client, id=id, node_id=node_id, username=username, ssh_key=ssh_key, password=password)
+        __create_user(
+            base_client,
+            id=id,
+            node_id=node_id,
+            username=username,
+            ssh_key=ssh_key,
+            password=password,
+            expiry_time=expiry_time)
     except BatchErrorException as error:
         try:
             base_client.delete_user_on_node(id, node_id, username)
-            base_client.create_user_on_node(id=id, node_id=node_id, username=username, ssh_key=ssh_key)
+            base_client.create_user_on_node(
+                id=id, node_id=node_id, username=username, ssh_key=ssh_key, expiry_time=expiry_time)
         except BatchErrorException as error:
             raise error
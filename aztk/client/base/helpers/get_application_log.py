@@ -1,12 +1,10 @@
-import time
-
 import azure
 import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 
 from aztk import error, models
 from aztk.models import Task, TaskState
-from aztk.utils import constants, helpers
+from aztk.utils import constants, helpers, waiter
 
 output_file = constants.TASK_WORKING_DIR + "/" + constants.SPARK_SUBMIT_LOGS_FILE
 
@@ -24,28 +22,24 @@ def __wait_for_app_to_be_running(base_operations, cluster_id: str, application_n
         Wait for the batch task to leave the waiting state into running(or completed if it was fast enough)
     """
 
-    while True:
+    def poll():
         task_state = base_operations.get_task_state(cluster_id, application_name)
+        return task_state not in [batch_models.TaskState.active, batch_models.TaskState.preparing], task_state
 
-        if task_state in [batch_models.TaskState.active, batch_models.TaskState.preparing]:
-            # TODO: log
-            time.sleep(5)
-        else:
-            return base_operations.get_batch_task(id=cluster_id, task_id=application_name)
+    waiter.Waiter().wait(poll, "application {} to start".format(application_name))
+    return base_operations.get_batch_task(id=cluster_id, task_id=application_name)
 
 
 def __get_output_file_properties(batch_client, cluster_id: str, application_name: str):
-    while True:
+    def poll():
         try:
-            file = helpers.get_file_properties(cluster_id, application_name, output_file, batch_client)
-            return file
+            return True, helpers.get_file_properties(cluster_id, application_name, output_file, batch_client)
         except BatchErrorException as e:
             if e.response.status_code == 404:
-                # TODO: log
-                time.sleep(5)
-                continue
-            else:
-                raise e
+                return False, None
+            raise e
+
+    return waiter.Waiter().wait(poll, "output of application {}".format(application_name))
 
 
 def get_log_from_storage(blob_client, container_name, application_name, task):
@@ -74,12 +68,11 @@ def get_log_from_storage(blob_client, container_name, application_name, task):
 
 
 def wait_for_scheduling_target_task(base_operations, cluster_id, application_name):
-    application_state = base_operations.get_task_state(cluster_id, application_name)
-    while TaskState(application_state) not in [TaskState.Completed, TaskState.Failed]:
-        time.sleep(3)
-        # TODO: enable logger
-        # log.debug("{} {}: application not yet complete".format(cluster_id, application_name))
+    def poll():
         application_state = base_operations.get_task_state(cluster_id, application_name)
+        return TaskState(application_state) in [TaskState.Completed, TaskState.Failed], application_state
+
+    waiter.Waiter().wait(poll, "application {}".format(application_name))
     return base_operations.get_task_from_table(cluster_id, application_name)
 
 
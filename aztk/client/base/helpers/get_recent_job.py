@@ -1,3 +1,4 @@
+import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 
 from aztk import error
@@ -8,7 +9,8 @@ from aztk.utils import helpers
 # cluster impl is planned to change to job schedule
 def get_recent_job(core_job_operations, id):
     try:
-        job_schedule = core_job_operations.batch_client.job_schedule.get(id)
+        job_schedule = core_job_operations.batch_client.job_schedule.get(
+            id, job_schedule_get_options=batch_models.JobScheduleGetOptions(select="executionInfo"))
         return core_job_operations.batch_client.job.get(job_schedule.execution_info.recent_job.id)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
@@ -1,18 +1,28 @@
+import concurrent.futures
+
 from azure.batch.models import BatchErrorException
 
 from aztk import error, models
-from aztk.utils import helpers
+from aztk.utils import constants, helpers
+
+from . import metadata_cache
 
 
 def _get_remote_login_settings(base_client, pool_id: str, node_id: str):
     """
     Get the remote_login_settings for node
+    The remote login endpoint of a node does not change during its lifetime, so it is cached until the cluster is
+    deleted.
     :param pool_id
     :param node_id
     :returns aztk.models.RemoteLogin
     """
-    result = base_client.batch_client.compute_node.get_remote_login_settings(pool_id, node_id)
-    return models.RemoteLogin(ip_address=result.remote_login_ip_address, port=str(result.remote_login_port))
+
+    def fetch(etag):
+        result = base_client.batch_client.compute_node.get_remote_login_settings(pool_id, node_id)
+        return models.RemoteLogin(ip_address=result.remote_login_ip_address, port=str(result.remote_login_port)), None
+
+    return base_client.metadata_cache.get(("remote_login_settings", pool_id, node_id), fetch, ttl=float("inf"))
 
 
 def get_remote_login_settings(base_client, cluster_id: str, node_id: str):
@@ -20,3 +30,17 @@ def get_remote_login_settings(base_client, cluster_id: str, node_id: str):
         return _get_remote_login_settings(base_client, cluster_id, node_id)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
+
+
+def get_remote_login_settings_for_cluster(base_client, cluster_id: str, node_ids=None, max_workers: int = None):
+    try:
+        if node_ids is None:
+            node_ids = [node.id for node in metadata_cache.list_nodes(base_client, cluster_id, cached=False)]
+        node_ids = list(node_ids)
+        max_workers = max_workers or constants.REMOTE_LOGIN_SETTINGS_CONCURRENCY
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(min(max_workers, len(node_ids)), 1)) as executor:
+            results = executor.map(lambda node_id: _get_remote_login_settings(base_client, cluster_id, node_id),
+                                   node_ids)
+            return dict(zip(node_ids, results))
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import azure.batch.models as batch_models
+from azure.batch.models import BatchErrorException
+
+from aztk.utils import constants
+
+NOT_MODIFIED = 304
+
+
+class _Entry:
+    def __init__(self, value, etag, fetched_at):
+        self.value = value
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+class MetadataCache:
+    """Read-through cache of the pool, node and configuration metadata of clusters
+
+    Cached reads are served from memory for `ttl` seconds. Past that, and for reads that must be fresh, an entry
+    that has an ETag is revalidated with a conditional request, so an unchanged entry costs a round trip without
+    a body. Entries without an ETag are fetched again. Operations that change a cluster invalidate its entries.
+
+    Args:
+        ttl (:obj:`int`, optional): number of seconds cached reads are served from memory for.
+            Defaults to aztk.utils.constants.METADATA_CACHE_TTL.
+    """
+
+    def __init__(self, ttl: int = None):
+        self.ttl = constants.METADATA_CACHE_TTL if ttl is None else ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch, cached=True, ttl=None):
+        """Get the value of key
+
+        Args:
+            key (:obj:`tuple`): key of the entry, its second item is the id of the cluster it belongs to.
+            fetch (:obj:`Callable`): called with the ETag of the cached entry, or None. Returns None if the entry
+                was not modified, else a (value, etag) tuple.
+            cached (:obj:`bool`, optional): If False, the entry is always revalidated or fetched.
+                Defaults to True.
+            ttl (:obj:`float`, optional): number of seconds the entry is served from memory for, if it differs
+                from the ttl of the cache. Defaults to None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        if cached and entry and now - entry.fetched_at < ttl:
+            return entry.value
+        result = fetch(entry.etag if entry else None)
+        if result is None:
+            entry.fetched_at = now
+            return entry.value
+        value, etag = result
+        with self._lock:
+            self._entries[key] = _Entry(value, etag, now)
+        return value
+
+    def invalidate(self, id: str):
+        """Drop every entry of the cluster with the given id"""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == id]:
+                del self._entries[key]
+
+
+def get_pool(base_operations, id: str, cached: bool = True) -> batch_models.CloudPool:
+    def fetch(etag):
+        try:
+            pool = base_operations.batch_client.pool.get(
+                id, pool_get_options=batch_models.PoolGetOptions(if_none_match=etag) if etag else None)
+        except BatchErrorException as e:
+            if etag and e.response is not None and e.response.status_code == NOT_MODIFIED:
+                return None
+            raise
+        return pool, pool.e_tag
+
+    return base_operations.metadata_cache.get(("pool", id), fetch, cached)
+
+
+def list_nodes(base_operations, id: str, cached: bool = True):
+    return base_operations.metadata_cache.get(
+        ("nodes", id), lambda etag: (list(base_operations.batch_client.compute_node.list(id)), None), cached)
+
+
+def get_node(base_operations, id: str, node_id: str, cached: bool = True) -> batch_models.ComputeNode:
+    return base_operations.metadata_cache.get(
+        ("node", id, node_id), lambda etag: (base_operations.batch_client.compute_node.get(id, node_id), None), cached)
+
+
+def get_cluster_configuration(base_operations, id: str, cached: bool = True):
+    return base_operations.metadata_cache.get(
+        ("cluster_configuration", id),
+        lambda etag: base_operations.get_cluster_data(id).read_cluster_config_if_modified(etag),
+        cached,
+    )
@@ -2,7 +2,16 @@ from aztk import error, models
 from aztk.utils import ssh as ssh_lib
 
 
-def node_run(base_client, cluster_id, node_id, command, internal, container_name=None, timeout=None, block=True):
+def node_run(base_client,
+             cluster_id,
+             node_id,
+             command,
+             internal,
+             container_name=None,
+             timeout=None,
+             block=True,
+             max_output_size=None,
+             spill_output=False):
     cluster = base_client.get(cluster_id)
     pool, nodes = cluster.pool, list(cluster.nodes)
     try:
@@ -13,18 +22,18 @@ def node_run(base_client, cluster_id, node_id, command, internal, container_name
         node_rls = models.RemoteLogin(ip_address=node.ip_address, port="22")
     else:
         node_rls = base_client.get_remote_login_settings(pool.id, node.id)
-    try:
-        generated_username, ssh_key = base_client.generate_user_on_node(pool.id, node.id)
-        output = ssh_lib.node_exec_command(
-            node.id,
-            command,
-            generated_username,
-            node_rls.ip_address,
-            node_rls.port,
-            ssh_key=ssh_key.exportKey().decode("utf-8"),
-            container_name=container_name,
-            timeout=timeout,
-            block=block)
-        return output
-    finally:
-        base_client.delete_user_on_node(cluster_id, node.id, generated_username)
+    generated_username, ssh_key = base_client.get_cluster_credentials(pool.id, [node], prune=False)
+    output = ssh_lib.node_exec_command(
+        node.id,
+        command,
+        generated_username,
+        node_rls.ip_address,
+        node_rls.port,
+        ssh_key=ssh_key.exportKey().decode("utf-8"),
+        container_name=container_name,
+        timeout=timeout,
+        block=block,
+        connection_pool=base_client.ssh_connection_pool,
+        max_output_size=max_output_size,
+        spill_output=spill_output)
+    return output
@@ -8,30 +8,97 @@ from aztk.utils import ssh as ssh_lib
 from aztk.utils import helpers
 
 
-def cluster_run(base_operations, cluster_id, command, internal, container_name=None, timeout=None):
+def _get_cluster_nodes(base_operations, cluster_id, internal):
     cluster = base_operations.get(cluster_id)
     pool, nodes = cluster.pool, list(cluster.nodes)
     if internal:
         cluster_nodes = [(node, models.RemoteLogin(ip_address=node.ip_address, port="22")) for node in nodes]
     else:
-        cluster_nodes = [(node, base_operations.get_remote_login_settings(pool.id, node.id)) for node in nodes]
+        remote_login_settings = base_operations.get_remote_login_settings_for_cluster(
+            pool.id,
+            [node.id for node in nodes])
+        cluster_nodes = [(node, remote_login_settings[node.id]) for node in nodes]
+    return pool, nodes, cluster_nodes
+
+
+def _get_cluster_connection(base_operations, cluster_id, internal):
+    pool, nodes, cluster_nodes = _get_cluster_nodes(base_operations, cluster_id, internal)
     try:
-        generated_username, ssh_key = base_operations.generate_user_on_cluster(pool.id, nodes)
+        generated_username, ssh_key = base_operations.get_cluster_credentials(pool.id, nodes)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
+    return cluster_nodes, generated_username, ssh_key
+
 
+def _exec_command(base_operations, connection, command, container_name, timeout, max_output_size, spill_output):
+    cluster_nodes, generated_username, ssh_key = connection
+    return ssh_lib.clus_exec_command(
+        command,
+        generated_username,
+        cluster_nodes,
+        ssh_key=ssh_key.exportKey().decode("utf-8"),
+        container_name=container_name,
+        timeout=timeout,
+        connection_pool=base_operations.ssh_connection_pool,
+        node_executor=base_operations.node_executor,
+        max_output_size=max_output_size,
+        spill_output=spill_output,
+    )
+
+
+def cluster_run(base_operations,
+                cluster_id,
+                command,
+                internal,
+                container_name=None,
+                timeout=None,
+                max_output_size=None,
+                spill_output=False):
+    connection = _get_cluster_connection(base_operations, cluster_id, internal)
     try:
         output = asyncio.get_event_loop().run_until_complete(
-            ssh_lib.clus_exec_command(
-                command,
-                generated_username,
-                cluster_nodes,
-                ssh_key=ssh_key.exportKey().decode("utf-8"),
-                container_name=container_name,
-                timeout=timeout,
-            ))
+            _exec_command(base_operations, connection, command, container_name, timeout, max_output_size, spill_output))
         return output
     except OSError as exc:
         raise exc
-    finally:
-        base_operations.delete_user_on_cluster(pool.id, nodes, generated_username)
+
+
+async def cluster_run_async(base_operations,
+                            cluster_id,
+                            command,
+                            internal,
+                            container_name=None,
+                            timeout=None,
+                            max_output_size=None,
+                            spill_output=False,
+                            executor=None):
+    connection = await asyncio.get_event_loop().run_in_executor(executor, _get_cluster_connection, base_operations,
+                                                                cluster_id, internal)
+    return await _exec_command(base_operations, connection, command, container_name, timeout, max_output_size,
+                               spill_output)
+
+
+def cluster_run_stream(base_operations,
+                       cluster_id,
+                       command,
+                       internal,
+                       container_name=None,
+                       timeout=None,
+                       lines=False,
+                       max_output_size=None,
+                       spill_output=False):
+    cluster_nodes, generated_username, ssh_key = _get_cluster_connection(base_operations, cluster_id, internal)
+
+    yield from ssh_lib.clus_exec_command_stream(
+        command,
+        generated_username,
+        cluster_nodes,
+        ssh_key=ssh_key.exportKey().decode("utf-8"),
+        container_name=container_name,
+        timeout=timeout,
+        connection_pool=base_operations.ssh_connection_pool,
+        node_executor=base_operations.node_executor,
+        lines=lines,
+        max_output_size=max_output_size,
+        spill_output=spill_output,
+    )
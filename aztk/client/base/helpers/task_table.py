@@ -1,3 +1,4 @@
+import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 from azure.common import AzureConflictHttpError, AzureMissingResourceHttpError
 # pylint: disable=import-error,no-name-in-module
@@ -7,6 +8,9 @@ from aztk.error import AztkError
 from aztk.models import Task, TaskState
 from aztk.utils import BackOffPolicy, helpers, retry, try_func
 
+# properties of a Batch task read by __convert_batch_task_to_aztk_task
+BATCH_TASK_SELECT = "id,nodeInfo,state,stateTransitionTime,commandLine,executionInfo"
+
 
 def __convert_entity_to_task(entity):
     return Task(
@@ -143,5 +147,8 @@ def get_batch_task(batch_client, id, task_id):
 @try_func(
     exception_formatter=None, raise_exception=AztkError, catch_exceptions=(BatchErrorException, AzureConflictHttpError))
 def list_batch_tasks(batch_client, id):
-    tasks = [__convert_batch_task_to_aztk_task(task) for task in batch_client.task.list(id)]
+    tasks = [
+        __convert_batch_task_to_aztk_task(task) for task in batch_client.task.list(
+            id, task_list_options=batch_models.TaskListOptions(select=BATCH_TASK_SELECT))
+    ]
     return tasks
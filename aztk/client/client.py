@@ -1,5 +1,9 @@
 from aztk import models
-from aztk.utils import azure_api
+from aztk.client.base.helpers.artifact_store import ArtifactStore
+from aztk.client.base.helpers.cluster_credentials import ClusterCredentialManager
+from aztk.client.base.helpers.metadata_cache import MetadataCache
+from aztk.utils import azure_api, sas, ssh
+from aztk.utils.retry import RequestGovernor
 
 
 class CoreClient:
@@ -15,18 +19,37 @@ class CoreClient:
         self.batch_client = None
         self.blob_client = None
         self.table_service = None
+        self.ssh_connection_pool = None
+        self.node_executor = None
+        self.cluster_credentials = None
+        self.metadata_cache = None
+        self.request_governor = None
+        self.artifact_store = None
+        self.sas_provider = None
 
     def _get_context(self, secrets_configuration: models.SecretsConfiguration):
         self.secrets_configuration = secrets_configuration
 
         azure_api.validate_secrets(secrets_configuration)
-        self.batch_client = azure_api.make_batch_client(secrets_configuration)
-        self.blob_client = azure_api.make_blob_client(secrets_configuration)
-        self.table_service = azure_api.make_table_service(secrets_configuration)
+        self.request_governor = RequestGovernor()
+        self.batch_client = azure_api.make_batch_client(secrets_configuration, self.request_governor)
+        self.blob_client = azure_api.make_blob_client(secrets_configuration, self.request_governor)
+        self.table_service = azure_api.make_table_service(secrets_configuration, self.request_governor)
+        self.ssh_connection_pool = ssh.ConnectionPool()
+        self.node_executor = ssh.NodeExecutor()
+        self.cluster_credentials = ClusterCredentialManager(account=self.batch_client.config.base_url)
+        self.metadata_cache = MetadataCache()
+        self.artifact_store = ArtifactStore(self.blob_client)
+        self.sas_provider = sas.get_sas_provider(self.blob_client)
         context = {
             "batch_client": self.batch_client,
             "blob_client": self.blob_client,
             "table_service": self.table_service,
             "secrets_configuration": self.secrets_configuration,
+            "ssh_connection_pool": self.ssh_connection_pool,
+            "node_executor": self.node_executor,
+            "cluster_credentials": self.cluster_credentials,
+            "metadata_cache": self.metadata_cache,
+            "artifact_store": self.artifact_store,
         }
         return context
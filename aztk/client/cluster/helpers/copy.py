@@ -4,46 +4,98 @@ from azure.batch.models import BatchErrorException
 
 import aztk.models as models
 from aztk import error
+from aztk.utils import constants, helpers
 from aztk.utils import ssh as ssh_lib
-from aztk.utils import helpers
 
 
-def cluster_copy(
-        cluster_operations,
-        cluster_id,
-        source_path,
-        destination_path=None,
-        container_name=None,
-        internal=False,
-        get=False,
-        timeout=None,
-):
+def _master_first(pool, cluster_nodes):
+    master_node_id = next(
+        (metadata.value for metadata in pool.metadata or [] if metadata.name == constants.MASTER_NODE_METADATA_KEY),
+        None)
+    return sorted(cluster_nodes, key=lambda cluster_node: cluster_node[0].id != master_node_id)
+
+
+def _get_cluster_connection(cluster_operations, cluster_id, internal):
     cluster = cluster_operations.get(cluster_id)
     pool, nodes = cluster.pool, list(cluster.nodes)
     if internal:
         cluster_nodes = [(node, models.RemoteLogin(ip_address=node.ip_address, port="22")) for node in nodes]
     else:
-        cluster_nodes = [(node, cluster_operations.get_remote_login_settings(pool.id, node.id)) for node in nodes]
+        remote_login_settings = cluster_operations.get_remote_login_settings_for_cluster(
+            pool.id,
+            [node.id for node in nodes])
+        cluster_nodes = [(node, remote_login_settings[node.id]) for node in nodes]
 
     try:
-        generated_username, ssh_key = cluster_operations.generate_user_on_cluster(pool.id, nodes)
+        generated_username, ssh_key = cluster_operations.get_cluster_credentials(pool.id, nodes)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
+    return pool, cluster_nodes, generated_username, ssh_key
+
+
+def _copy(cluster_operations, connection, source_path, destination_path, container_name, get, timeout, broadcast):
+    pool, cluster_nodes, generated_username, ssh_key = connection
+    if broadcast and not get:
+        # upload to the master only, the other nodes receive the file from within the cluster
+        return ssh_lib.clus_broadcast_copy(
+            container_name=container_name,
+            username=generated_username,
+            nodes=_master_first(pool, cluster_nodes),
+            source_path=source_path,
+            destination_path=destination_path,
+            ssh_key=ssh_key.exportKey().decode("utf-8"),
+            timeout=timeout,
+            connection_pool=cluster_operations.ssh_connection_pool,
+            node_executor=cluster_operations.node_executor,
+        )
+    return ssh_lib.clus_copy(
+        container_name=container_name,
+        username=generated_username,
+        nodes=cluster_nodes,
+        source_path=source_path,
+        destination_path=destination_path,
+        ssh_key=ssh_key.exportKey().decode("utf-8"),
+        get=get,
+        timeout=timeout,
+        connection_pool=cluster_operations.ssh_connection_pool,
+        node_executor=cluster_operations.node_executor,
+    )
 
+
+def cluster_copy(
+        cluster_operations,
+        cluster_id,
+        source_path,
+        destination_path=None,
+        container_name=None,
+        internal=False,
+        get=False,
+        timeout=None,
+        broadcast=False,
+):
+    connection = _get_cluster_connection(cluster_operations, cluster_id, internal)
     try:
         output = asyncio.get_event_loop().run_until_complete(
-            ssh_lib.clus_copy(
-                container_name=container_name,
-                username=generated_username,
-                nodes=cluster_nodes,
-                source_path=source_path,
-                destination_path=destination_path,
-                ssh_key=ssh_key.exportKey().decode("utf-8"),
-                get=get,
-                timeout=timeout,
-            ))
+            _copy(cluster_operations, connection, source_path, destination_path, container_name, get, timeout,
+                  broadcast))
         return output
     except (OSError, BatchErrorException) as exc:
         raise exc
-    finally:
-        cluster_operations.delete_user_on_cluster(pool.id, nodes, generated_username)
+
+
+async def cluster_copy_async(
+        cluster_operations,
+        cluster_id,
+        source_path,
+        destination_path=None,
+        container_name=None,
+        internal=False,
+        get=False,
+        timeout=None,
+        broadcast=False,
+        executor=None,
+):
+    connection = await asyncio.get_event_loop().run_in_executor(executor, _get_cluster_connection, cluster_operations,
+                                                                cluster_id, internal)
+    return await _copy(cluster_operations, connection, source_path, destination_path, container_name, get, timeout,
+                       broadcast)
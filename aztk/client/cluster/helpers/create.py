@@ -24,6 +24,7 @@ def create_pool_and_job_and_table(
     """
     # save cluster configuration in storage
     core_cluster_operations.get_cluster_data(cluster_conf.cluster_id).save_cluster_config(cluster_conf)
+    core_cluster_operations.metadata_cache.invalidate(cluster_conf.cluster_id)
 
     # reuse pool_id as job_id
     pool_id = cluster_conf.cluster_id
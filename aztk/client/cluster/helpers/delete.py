@@ -22,6 +22,10 @@ def delete_pool_and_job_and_table(core_cluster_operations, pool_id: str, keep_lo
 
     table_deleted = core_cluster_operations.delete_task_table(pool_id)
 
+    core_cluster_operations.metadata_cache.invalidate(pool_id)
+    # the generated user goes away with the pool
+    core_cluster_operations.cluster_credentials.invalidate(core_cluster_operations, pool_id, delete_user=False)
+
     if job_exists:
         delete_object(core_cluster_operations.batch_client.job.delete, pool_id)
 
@@ -1,13 +1,15 @@
 # TODO: return Cluster instead of (pool, nodes)
 from aztk import models
+from aztk.client.base.helpers import metadata_cache
 
 
-def get_pool_details(core_cluster_operations, cluster_id: str):
+def get_pool_details(core_cluster_operations, cluster_id: str, cached: bool = False):
     """
         Print the information for the given cluster
         :param cluster_id: Id of the cluster
-        :return pool: CloudPool, nodes: ComputeNodePaged
+        :param cached: if True, metadata read within the last METADATA_CACHE_TTL seconds may be returned
+        :return pool: CloudPool, nodes: List[ComputeNode]
     """
-    pool = core_cluster_operations.batch_client.pool.get(cluster_id)
-    nodes = core_cluster_operations.batch_client.compute_node.list(pool_id=cluster_id)
+    pool = metadata_cache.get_pool(core_cluster_operations, cluster_id, cached)
+    nodes = metadata_cache.list_nodes(core_cluster_operations, cluster_id, cached)
     return models.Cluster(pool, nodes)
@@ -1,12 +1,20 @@
+import azure.batch.models as batch_models
+
 from aztk import models
 from aztk.utils import constants
 
+# properties of a pool read by aztk.models.Cluster and the cluster list views
+CLUSTER_POOL_SELECT = ("id,state,allocationState,vmSize,creationTime,currentDedicatedNodes,currentLowPriorityNodes,"
+                       "targetDedicatedNodes,targetLowPriorityNodes,metadata")
+
 
 def list_clusters(cluster_client, software_metadata_key):
     """
         List all the cluster on your account.
+        Pools cannot be filtered on their metadata by the service, so only the properties clusters need are listed.
     """
-    pools = cluster_client.batch_client.pool.list()
+    pools = cluster_client.batch_client.pool.list(
+        pool_list_options=batch_models.PoolListOptions(select=CLUSTER_POOL_SELECT))
     software_metadata = (constants.AZTK_SOFTWARE_METADATA_KEY, software_metadata_key)
     cluster_metadata = (constants.AZTK_MODE_METADATA_KEY, constants.AZTK_CLUSTER_MODE_METADATA)
 
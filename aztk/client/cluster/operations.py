@@ -22,27 +22,39 @@ class CoreClusterOperations(BaseOperations):
         return create.create_pool_and_job_and_table(self, cluster_configuration, software_metadata_key, start_task,
                                                     vm_image_model)
 
-    def get(self, id: str):
+    def get(self, id: str, cached: bool = False):
         """Get the state and configuration of a cluster
 
         Args:
             id (:obj:`str`): the id of the cluster to get.
+            cached (:obj:`bool`, optional): If True, pool and node metadata read in the last
+                aztk.utils.constants.METADATA_CACHE_TTL seconds may be returned. Defaults to False.
 
         Returns:
             :obj:`aztk.models.Cluster`: A Cluster object representing the state and configuration of the cluster.
         """
-        return get.get_pool_details(self, id)
-
-    def copy(self, id, source_path, destination_path=None, container_name=None, internal=False, get=False,
-             timeout=None):
+        return get.get_pool_details(self, id, cached)
+
+    def copy(self,
+             id,
+             source_path,
+             destination_path=None,
+             container_name=None,
+             internal=False,
+             get=False,
+             timeout=None,
+             broadcast=False):
         """Copy files to or from every node in a cluster.
 
         Args:
             id (:obj:`str`): the id of the cluster to copy files with.
-            source_path (:obj:`str`): the path of the file to copy from.
+            source_path (:obj:`str`): the path of the file to copy from. When copying to the nodes, this can be a
+                directory, in which case only the files that are missing or differ on each node are copied.
             destination_path (:obj:`str`, optional): the local directory path where the output should be written.
-                If None, a SpooledTemporaryFile will be returned in the NodeOutput object, else the file will be
-                written to this path. Defaults to None.
+                If None, a temporary file will be returned in the NodeOutput object, else the file will be
+                written to this path. Temporary files are kept in memory up to a total of
+                aztk.utils.constants.SSH_DOWNLOAD_MEMORY_BUDGET bytes across nodes, and on disk beyond that.
+                Defaults to None.
             container_name (:obj:`str`, optional): the name of the container to copy to or from.
                 If None, the copy operation will occur on the host VM, Defaults to None.
             internal (:obj:`bool`, optional): if True, this will connect to the node using its internal IP.
@@ -51,12 +63,17 @@ class CoreClusterOperations(BaseOperations):
                 Else, the file is copied from the client to the node. Defaults to False.
             timeout (:obj:`int`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
+            broadcast (:obj:`bool`, optional): If True, the file is uploaded to the master node only and sent
+                from node to node inside the cluster. The nodes authenticate to each other with a key pair
+                generated for the copy, whose private key is staged on the nodes and removed from all of them when
+                the copy ends. Ignored if get is True. Defaults to False.
 
         Returns:
             :obj:`List[aztk.models.NodeOutput]`:
                 A list of NodeOutput objects representing the output of the copy command.
         """
-        return copy.cluster_copy(self, id, source_path, destination_path, container_name, internal, get, timeout)
+        return copy.cluster_copy(self, id, source_path, destination_path, container_name, internal, get, timeout,
+                                 broadcast)
 
     def delete(self, id: str, keep_logs: bool = False):
         """Copy files to or from every node in a cluster.
@@ -84,14 +101,17 @@ class CoreClusterOperations(BaseOperations):
         """
         return list.list_clusters(self, software_metadata_key)
 
-    def wait(self, id, task_name):
+    def wait(self, id, task_name, timeout=None):
         """Wait until the task has completed
 
         Args:
             id (:obj:`str`): the id of the job the task was submitted to
-            task_name (:obj:`str`): the name of the task to wait for
+            task_name (:obj:`str` or :obj:`List[str]`): the name of the task to wait for. If a list of names is
+                given, wait until all of the tasks have completed, with a single list call per poll.
+            timeout (:obj:`float`, optional): number of seconds to wait before raising
+                :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
 
         Returns:
             :obj:`None`
         """
-        return wait_for_task_to_complete.wait_for_task_to_complete(self, id, task_name)
+        return wait_for_task_to_complete.wait_for_task_to_complete(self, id, task_name, timeout)
@@ -28,6 +28,7 @@ def submit_job(
         """
     core_job_operations.get_cluster_data(job_configuration.id).save_cluster_config(
         job_configuration.to_cluster_config())
+    core_job_operations.metadata_cache.invalidate(job_configuration.id)
 
     # get a verified node agent sku
     sku_to_use, image_ref_to_use = helpers.select_latest_verified_vm_image_with_node_agent_sku(
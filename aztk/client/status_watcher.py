@@ -0,0 +1,254 @@
+import collections
+import logging
+import queue
+import random
+import threading
+
+import azure.batch.models as batch_models
+
+from aztk.client.base.helpers import metadata_cache
+from aztk.models import SchedulingTarget
+from aztk.utils import constants, helpers
+
+CLUSTER = "cluster"
+NODE = "node"
+APPLICATION = "application"
+
+# number of pool ids per filtered pool list query, to keep the filter short
+_POOL_FILTER_SIZE = 20
+
+
+class StatusEvent:
+    """A change of state of a watched cluster, node or application
+
+    Attributes:
+        kind (:obj:`str`): one of "cluster", "node" or "application".
+        cluster_id (:obj:`str`): the id of the cluster the entity belongs to.
+        id (:obj:`str`): the id of the cluster, node or application.
+        state (:obj:`str`): the new state of the entity, or None if it does not exist anymore.
+        previous_state (:obj:`str`): the state of the entity before the change, or None if it was not seen before.
+    """
+
+    def __init__(self, kind, cluster_id, id, state, previous_state):
+        self.kind = kind
+        self.cluster_id = cluster_id
+        self.id = id
+        self.state = state
+        self.previous_state = previous_state
+
+    def __repr__(self):
+        return "StatusEvent({}, {}, {}, {} -> {})".format(self.kind, self.cluster_id, self.id, self.previous_state,
+                                                          self.state)
+
+
+class Subscription:
+    """A subscription to the state changes of a cluster, the nodes of a cluster or an application
+
+    Events are passed to the callback of the subscription if it has one, else they are queued and can be iterated
+    with events().
+    """
+
+    def __init__(self, watcher, kind, cluster_id, id=None, callback=None):
+        self.kind = kind
+        self.cluster_id = cluster_id
+        self.id = id
+        self.callback = callback
+        self.cancelled = False
+        self._queue = None if callback else queue.Queue()
+        self._watcher = watcher
+
+    def events(self, timeout: float = None):
+        """Yield the events of the subscription as they arrive, until it is cancelled
+
+        Args:
+            timeout (:obj:`float`, optional): number of seconds to wait for the next event before stopping.
+                If None, wait indefinitely. Defaults to None.
+        """
+        if self._queue is None:
+            raise ValueError("Events of a subscription with a callback are passed to the callback")
+        while not self.cancelled:
+            try:
+                event = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if event is None:
+                return
+            yield event
+
+    def cancel(self):
+        """Stop receiving events"""
+        self._watcher._unsubscribe(self)
+        self.cancelled = True
+        if self._queue is not None:
+            self._queue.put(None)
+
+    def _deliver(self, event):
+        if self.callback is None:
+            self._queue.put(event)
+            return
+        try:
+            self.callback(event)
+        except Exception as e:
+            logging.warning("Status watcher callback failed for %r: %r", event, e)
+
+
+class StatusWatcher:
+    """Watches the state of many clusters, nodes and applications with a minimal number of requests
+
+    Subscriptions are merged: every poll makes one filtered pool list for all watched clusters, one node list per
+    cluster whose nodes are watched and one task list per cluster whose applications are watched, whatever the
+    number of subscribers. Only the properties holding the state are selected. Polls run on a background thread
+    every `interval` seconds, and events are delivered on that thread.
+
+    Args:
+        base_operations (:obj:`aztk.client.base.BaseOperations`): operations used to make the requests.
+        interval (:obj:`float`, optional): number of seconds between polls.
+            Defaults to aztk.utils.constants.STATUS_WATCHER_INTERVAL.
+    """
+
+    def __init__(self, base_operations, interval: float = None):
+        self.base_operations = base_operations
+        self.interval = constants.STATUS_WATCHER_INTERVAL if interval is None else interval
+        # (kind, cluster_id) -> subscriptions
+        self._subscriptions = collections.defaultdict(list)
+        # (kind, cluster_id, id) -> last seen state
+        self._states = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def watch_cluster(self, cluster_id: str, callback=None):
+        """Subscribe to the state changes of a cluster"""
+        return self._subscribe(CLUSTER, cluster_id, None, callback)
+
+    def watch_nodes(self, cluster_id: str, callback=None):
+        """Subscribe to the state changes of the nodes of a cluster"""
+        return self._subscribe(NODE, cluster_id, None, callback)
+
+    def watch_application(self, cluster_id: str, application_name: str = None, callback=None):
+        """Subscribe to the state changes of an application, or of all applications of a cluster if no name is given"""
+        return self._subscribe(APPLICATION, cluster_id, application_name, callback)
+
+    def start(self):
+        """Start polling on a background thread"""
+        with self._lock:
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling, subscriptions stay registered"""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def poll(self):
+        """Poll the state of every watched entity once and deliver the events of the entities that changed"""
+        with self._lock:
+            watched = {key: list(subscriptions) for key, subscriptions in self._subscriptions.items() if subscriptions}
+        cluster_ids = sorted(cluster_id for kind, cluster_id in watched if kind == CLUSTER)
+
+        observed = {}
+        failed = set()
+        if cluster_ids:
+            self._list(observed, failed, CLUSTER, None, lambda: self._list_cluster_states(cluster_ids))
+        for kind, cluster_id in watched:
+            if kind == NODE:
+                self._list(observed, failed, kind, cluster_id, lambda: self._list_node_states(cluster_id))
+            elif kind == APPLICATION:
+                self._list(observed, failed, kind, cluster_id, lambda: self._list_application_states(cluster_id))
+
+        for (kind, cluster_id), subscriptions in watched.items():
+            # the states of a failed list are unknown until the next poll, no event is delivered for them
+            if (kind, cluster_id) not in failed and (kind, None) not in failed:
+                self._dispatch(kind, cluster_id, subscriptions, observed)
+
+    def _subscribe(self, kind, cluster_id, id, callback):
+        subscription = Subscription(self, kind, cluster_id, id, callback)
+        with self._lock:
+            self._subscriptions[(kind, cluster_id)].append(subscription)
+            # a new subscriber first receives the states already known
+            known = [
+                StatusEvent(kind, cluster_id, key[2], state, None)
+                for key, state in sorted(self._states.items())
+                if key[:2] == (kind, cluster_id) and (id is None or key[2] == id)
+            ]
+        for event in known:
+            subscription._deliver(event)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get((subscription.kind, subscription.cluster_id), [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.interval * random.uniform(0.9, 1.1))
+
+    def _list(self, observed, failed, kind, cluster_id, list_states):
+        try:
+            observed.update(list_states())
+        except Exception as e:
+            logging.warning("Status watcher failed to list %s states of %s: %r", kind, cluster_id or "clusters", e)
+            failed.add((kind, cluster_id))
+
+    def _dispatch(self, kind, cluster_id, subscriptions, observed):
+        key = (kind, cluster_id)
+        current = {entity_key: state for entity_key, state in observed.items() if entity_key[:2] == key}
+        with self._lock:
+            previous = {entity_key: state for entity_key, state in self._states.items() if entity_key[:2] == key}
+            for entity_key in previous:
+                if entity_key not in current:
+                    del self._states[entity_key]
+            self._states.update(current)
+        events = [
+            StatusEvent(kind, cluster_id, entity_key[2], current.get(entity_key), previous.get(entity_key))
+            for entity_key in sorted(set(current) | set(previous))
+            if current.get(entity_key) != previous.get(entity_key)
+        ]
+        for event in events:
+            for subscription in subscriptions:
+                if subscription.id is None or subscription.id == event.id:
+                    subscription._deliver(event)
+
+    def _list_cluster_states(self, cluster_ids):
+        batch_client = self.base_operations.batch_client
+        states = {}
+        for i in range(0, len(cluster_ids), _POOL_FILTER_SIZE):
+            chunk = cluster_ids[i:i + _POOL_FILTER_SIZE]
+            options = batch_models.PoolListOptions(
+                filter=" or ".join("id eq '{}'".format(cluster_id) for cluster_id in chunk),
+                select="id,state,allocationState")
+            for pool in batch_client.pool.list(pool_list_options=options):
+                state = pool.allocation_state if pool.state is batch_models.PoolState.active else pool.state
+                states[(CLUSTER, pool.id, pool.id)] = state.value
+        return states
+
+    def _list_node_states(self, cluster_id):
+        options = batch_models.ComputeNodeListOptions(select="id,state")
+        return {(NODE, cluster_id, node.id): node.state.value
+                for node in self.base_operations.batch_client.compute_node.list(
+                    cluster_id, compute_node_list_options=options)}
+
+    def _list_application_states(self, cluster_id):
+        scheduling_target = metadata_cache.get_cluster_configuration(self.base_operations, cluster_id).scheduling_target
+        if scheduling_target is not None and scheduling_target is not SchedulingTarget.Any:
+            entities = self.base_operations.table_service.query_entities(
+                helpers.convert_id_to_table_id(cluster_id), select="RowKey,state")
+            return {(APPLICATION, cluster_id, entity["RowKey"]): entity["state"] for entity in entities}
+        options = batch_models.TaskListOptions(select="id,state")
+        return {(APPLICATION, cluster_id, task.id): task.state.value
+                for task in self.base_operations.batch_client.task.list(cluster_id, task_list_options=options)}
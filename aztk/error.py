@@ -20,6 +20,14 @@ class AzureApiInitError(AztkError):
     pass
 
 
+class WaitTimeoutError(AztkError):
+    pass
+
+
+class WaitCancelledError(AztkError):
+    pass
+
+
 class InvalidPluginConfigurationError(AztkError):
     pass
 
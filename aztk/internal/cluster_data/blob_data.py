@@ -1,7 +1,7 @@
-import datetime
-
 import azure.batch.models as batch_models
-from azure.storage.blob import BlobPermissions, BlockBlobService
+from azure.storage.blob import BlockBlobService
+
+from aztk.utils import constants, sas
 
 
 class BlobData:
@@ -16,13 +16,5 @@ class BlobData:
         self.blob_client = blob_client
 
     def to_resource_file(self, dest: str = None) -> batch_models.ResourceFile:
-        sas_token = self.blob_client.generate_blob_shared_access_signature(
-            self.container,
-            self.blob,
-            permission=BlobPermissions.READ,
-            expiry=datetime.datetime.utcnow() + datetime.timedelta(days=365),
-        )
-
-        sas_url = self.blob_client.make_blob_url(self.container, self.blob, sas_token=sas_token)
-
-        return batch_models.ResourceFile(file_path=dest or self.dest, blob_source=sas_url)
+        return sas.get_sas_provider(self.blob_client).get_resource_file(self.container, self.blob, dest or self.dest,
+                                                                        constants.DEFINITION_SAS_EXPIRY)
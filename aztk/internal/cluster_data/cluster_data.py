@@ -1,5 +1,8 @@
 import io
 import logging
+import threading
+import weakref
+from typing import List
 
 import azure.common
 import yaml
@@ -7,10 +10,14 @@ from msrest.exceptions import ClientRequestError
 
 from aztk import error
 from aztk.models import ClusterConfiguration
-from aztk.utils import BackOffPolicy, retry
+from aztk.utils import BackOffPolicy, blob_upload, constants, retry
 
 from .blob_data import BlobData
-from .node_data import NodeData
+from .node_data import NodeData, get_node_scripts_bundle
+
+# blob client -> names of the node scripts bundles it uploaded, or found stored, during the session
+_node_scripts_blobs = weakref.WeakKeyDictionary()
+_node_scripts_lock = threading.Lock()
 
 
 class ClusterData:
@@ -35,25 +42,42 @@ class ClusterData:
         container_name = cluster_config.cluster_id
         self.blob_client.create_blob_from_text(container_name, blob_path, content)
 
-    @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
     def read_cluster_config(self):
+        return self.read_cluster_config_if_modified()[0]
+
+    @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
+    def read_cluster_config_if_modified(self, etag: str = None):
+        """
+        Read the cluster configuration unless its ETag is still etag
+        :return: None if the configuration was not modified, else a (configuration, etag) tuple
+        """
         blob_path = self.CLUSTER_DIR + "/" + self.CLUSTER_CONFIG_FILE
         try:
-            result = self.blob_client.get_blob_to_text(self.cluster_id, blob_path)
-            return yaml.load(result.content)
+            result = self.blob_client.get_blob_to_text(self.cluster_id, blob_path, if_none_match=etag)
+            return yaml.load(result.content), result.properties.etag
         except azure.common.AzureMissingResourceHttpError:
             raise error.AztkError("Cluster {} doesn't have cluster configuration in storage".format(self.cluster_id))
+        except azure.common.AzureHttpError as e:
+            if etag and e.status_code == 304:
+                return None
+            raise
         except yaml.YAMLError:
             raise error.AztkError("Cluster {} contains invalid cluster configuration in blob".format(self.cluster_id))
 
     @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
-    def upload_file(self, blob_path: str, local_path: str) -> BlobData:
-        self.blob_client.create_blob_from_path(self.cluster_id, blob_path, local_path)
+    def upload_file(self, blob_path: str, local_path: str, progress_callback=None) -> BlobData:
+        blob_upload.upload_file(self.blob_client, self.cluster_id, blob_path, local_path, progress_callback)
         return BlobData(self.blob_client, self.cluster_id, blob_path)
 
     @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
     def upload_bytes(self, blob_path: str, bytes_io: io.BytesIO) -> BlobData:
-        self.blob_client.create_blob_from_bytes(self.cluster_id, blob_path, bytes_io.getvalue())
+        blob_upload.upload_bytes(self.blob_client, self.cluster_id, blob_path, bytes_io.getvalue())
+        return BlobData(self.blob_client, self.cluster_id, blob_path)
+
+    @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
+    def upload_stream(self, blob_path: str, stream, count: int = None) -> BlobData:
+        stream.seek(0)
+        blob_upload.upload_stream(self.blob_client, self.cluster_id, blob_path, stream, count)
         return BlobData(self.blob_client, self.cluster_id, blob_path)
 
     def upload_cluster_file(self, blob_path: str, local_path: str) -> BlobData:
@@ -66,13 +90,44 @@ class ClusterData:
         blob_data.dest = blob_path
         return blob_data
 
-    def upload_node_data(self, node_data: NodeData) -> BlobData:
-        return self.upload_cluster_file("node-scripts.zip", node_data.zip_path)
+    def upload_node_data(self, node_data: NodeData) -> List[BlobData]:
+        """
+        Upload the node scripts bundle, unless it is already stored, and the zip of the node data of the cluster
+        :return: the blobs of the two zips, to unzip on the node in order
+        """
+        node_scripts = self.upload_node_scripts()
+        try:
+            blob_data = self.upload_stream(self.CLUSTER_DIR + "/node-data.zip", node_data.zip_file, node_data.size)
+        finally:
+            node_data.close()
+        blob_data.dest = "node-data.zip"
+        return [node_scripts, blob_data]
+
+    @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
+    def upload_node_scripts(self) -> BlobData:
+        """
+        Store the node scripts bundle in the container shared by every cluster, unless it is already stored
+        """
+        bundle = get_node_scripts_bundle()
+        container_name = constants.ARTIFACT_CONTAINER_NAME
+        with _node_scripts_lock:
+            blobs = _node_scripts_blobs.setdefault(self.blob_client, set())
+            stored = bundle.blob_name in blobs
+        if not stored:
+            blob_upload.ensure_container(self.blob_client, container_name)
+            if not blob_upload.touch(self.blob_client, container_name, bundle.blob_name):
+                blob_upload.upload_bytes(self.blob_client, container_name, bundle.blob_name, bundle.data)
+            with _node_scripts_lock:
+                blobs.add(bundle.blob_name)
+        blob_data = BlobData(self.blob_client, container_name, bundle.blob_name)
+        blob_data.dest = "node-scripts.zip"
+        return blob_data
 
     @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
     def _ensure_container(self):
-        self.blob_client.create_container(self.cluster_id, fail_on_exist=False)
+        blob_upload.ensure_container(self.blob_client, self.cluster_id)
 
     @retry(retry_count=4, retry_interval=1, backoff_policy=BackOffPolicy.exponential, exceptions=(ClientRequestError))
     def delete_container(self, container_name: str):
+        blob_upload.forget_container(self.blob_client, container_name)
         self.blob_client.delete_container(container_name)
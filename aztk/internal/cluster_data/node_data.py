@@ -1,6 +1,9 @@
 import fnmatch
+import functools
+import hashlib
 import io
 import os
+import tempfile
 import zipfile
 from pathlib import Path
 from typing import List
@@ -9,26 +12,78 @@ import yaml
 
 from aztk import models
 from aztk.utils import constants, file_utils, secure_utils
+from aztk.version import __version__
 
 ROOT_PATH = constants.ROOT_PATH
 
 # Constants for node data
 NODE_SCRIPT_FOLDER = "aztk"
 PLUGIN_FOLDER = "plugins"
+NODE_SCRIPT_EXCLUDE = ["*.pyc*", "*.png"]
+# Fixed timestamp of the entries of the node scripts bundle, the earliest a zip can store
+BUNDLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class NodeScriptsBundle:
+    """
+    Zip of the node scripts, the part of the node data that is the same for every cluster
+
+    The zip is built deterministically, with sorted entries and fixed timestamps, so the same scripts always give
+    the same content and the bundle can be stored once, under its SHA-256, for every cluster.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.sha256 = hashlib.sha256(data).hexdigest()
+
+    @property
+    def blob_name(self) -> str:
+        return "node-scripts/{0}/{1}.zip".format(__version__, self.sha256)
+
+    @classmethod
+    def build(cls, path: str = None):
+        path = path or os.path.join(ROOT_PATH, NODE_SCRIPT_FOLDER)
+        entries = []
+        for base, dirs, files in os.walk(path):
+            dirs.sort()
+            relative_folder = os.path.relpath(base, path)
+            for file in sorted(files):
+                if _include_file(file, NODE_SCRIPT_EXCLUDE):
+                    entries.append((os.path.join(base, file),
+                                    os.path.normpath(os.path.join(NODE_SCRIPT_FOLDER, relative_folder, file))))
+
+        data = io.BytesIO()
+        with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for file_path, zip_path in entries:
+                with io.open(file_path, "r", encoding="UTF-8") as f:
+                    content = f.read().replace("\r\n", "\n")
+                info = zipfile.ZipInfo(zip_path.replace(os.sep, "/"), date_time=BUNDLE_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o600 << 16
+                zipf.writestr(info, content)
+        return cls(data.getvalue())
+
+
+@functools.lru_cache(maxsize=1)
+def get_node_scripts_bundle() -> NodeScriptsBundle:
+    """Build the node scripts bundle once per process"""
+    return NodeScriptsBundle.build()
 
 
 class NodeData:
     """
     Class made to bundle data to be uploaded to the node as a zip
+
+    The node scripts are not part of it, see NodeScriptsBundle. The zip is written to a file spooled to disk once
+    it grows over NODE_DATA_SPOOL_SIZE, so user jars are never held in memory.
     """
 
     def __init__(self, cluster_config: models.ClusterConfiguration):
-        self.zip_path = io.BytesIO()
+        self.zip_file = tempfile.SpooledTemporaryFile(max_size=constants.NODE_DATA_SPOOL_SIZE)
         self.cluster_config = cluster_config
-        self.zipf = zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED)
+        self.zipf = zipfile.ZipFile(self.zip_file, "w", zipfile.ZIP_DEFLATED)
 
     def add_core(self):
-        self._add_node_scripts()
         self._add_plugins()
         self._add_spark_configuration()
         self._add_user_conf()
@@ -36,8 +91,22 @@ class NodeData:
 
     def done(self):
         self.zipf.close()
+        self.zip_file.seek(0)
         return self
 
+    @property
+    def size(self) -> int:
+        """Size of the zip in bytes, once done"""
+        position = self.zip_file.tell()
+        self.zip_file.seek(0, io.SEEK_END)
+        size = self.zip_file.tell()
+        self.zip_file.seek(position)
+        return size
+
+    def close(self):
+        """Discard the zip, and its temporary file if it was spooled to disk"""
+        self.zip_file.close()
+
     def add_file(self, file: str, zip_dir: str, binary: bool = True):
         if not file:
             return
@@ -130,13 +199,14 @@ class NodeData:
 
         self.zipf.writestr(os.path.join("plugins", "plugins-manifest.yaml"), yaml.dump(data))
 
-    def _add_node_scripts(self):
-        self.add_dir(os.path.join(ROOT_PATH, NODE_SCRIPT_FOLDER), NODE_SCRIPT_FOLDER, exclude=["*.pyc*", "*.png"])
-
     def _includeFile(self, filename: str, exclude: List[str]) -> bool:
-        exclude = exclude or []
-        for pattern in exclude:
-            if fnmatch.fnmatch(filename, pattern):
-                return False
+        return _include_file(filename, exclude)
+
+
+def _include_file(filename: str, exclude: List[str]) -> bool:
+    exclude = exclude or []
+    for pattern in exclude:
+        if fnmatch.fnmatch(filename, pattern):
+            return False
 
-        return True
+    return True
@@ -3,7 +3,27 @@ from typing import Union
 
 
 class NodeOutput:
-    def __init__(self, id: str, output: Union[SpooledTemporaryFile, str] = None, error: Exception = None):
+    """Output of a command or copy run on a node
+
+    Attributes:
+        id (:obj:`str`): the id of the node.
+        output (:obj:`str`): the output of the command. Downloaded files are returned as a
+            :obj:`tempfile.SpooledTemporaryFile` holding their content.
+        error (:obj:`Exception`): the error raised on the node, or None if it succeeded.
+        latency (:obj:`float`): number of seconds the node took to finish.
+        output_file (:obj:`tempfile.SpooledTemporaryFile`): set instead of output when the command was run with
+            spill_output=True and its output was larger than aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD.
+            The file holds the output as bytes, positioned at its start. None otherwise.
+    """
+
+    def __init__(self,
+                 id: str,
+                 output: Union[SpooledTemporaryFile, str] = None,
+                 error: Exception = None,
+                 latency: float = None,
+                 output_file: SpooledTemporaryFile = None):
         self.id = id
         self.output = output
         self.error = error
+        self.latency = latency
+        self.output_file = output_file
@@ -2,6 +2,7 @@
     Code that handle spark configuration
 """
 import datetime
+import functools
 import os
 import shutil
 import time
@@ -39,6 +40,19 @@ def get_node(node_id: str) -> batchmodels.ComputeNode:
     return batch_client.compute_node.get(config.pool_id, node_id)
 
 
+@functools.lru_cache(maxsize=None)
+def get_master_node_id() -> str:
+    """
+        The master is elected before any node starts spark and never changes, so the pool is only read once.
+    """
+    return pick_master.get_master_node_id(get_pool())
+
+
+@functools.lru_cache(maxsize=None)
+def get_master_node() -> batchmodels.ComputeNode:
+    return get_node(get_master_node_id())
+
+
 def list_nodes() -> List[batchmodels.ComputeNode]:
     """
         List all the nodes in the pool.
@@ -52,8 +66,7 @@ def setup_connection():
     """
         This setup spark config with which nodes are slaves and which are master
     """
-    master_node_id = pick_master.get_master_node_id(batch_client.pool.get(config.pool_id))
-    master_node = get_node(master_node_id)
+    master_node = get_master_node()
 
     master_config_file = os.path.join(spark_conf_folder, "master")
     master_file = open(master_config_file, "w", encoding="UTF-8")
@@ -66,7 +79,7 @@ def setup_connection():
 
 def wait_for_master():
     print("Waiting for master to be ready.")
-    master_node_id = pick_master.get_master_node_id(batch_client.pool.get(config.pool_id))
+    master_node_id = get_master_node_id()
 
     if master_node_id == config.node_id:
         return
@@ -97,8 +110,7 @@ def start_spark_master():
 def start_spark_worker():
     wait_for_master()
     exe = os.path.join(spark_home, "sbin", "start-slave.sh")
-    master_node_id = pick_master.get_master_node_id(batch_client.pool.get(config.pool_id))
-    master_node = get_node(master_node_id)
+    master_node = get_master_node()
 
     cmd = [exe, "spark://{0}:7077".format(master_node.ip_address), "--webui-port", str(config.spark_worker_ui_port)]
     print("Connecting to master with '{0}'".format(" ".join(cmd)))
@@ -9,7 +9,7 @@ from aztk.node_scripts.core import config
 from aztk.node_scripts.install.pick_master import get_master_node_id
 from aztk.node_scripts.scheduling import common, scheduling_target
 from aztk.spark.models import ApplicationState
-from aztk.utils import constants
+from aztk.utils import constants, helpers
 
 
 def read_downloaded_tasks():
@@ -28,12 +28,11 @@ def read_downloaded_tasks():
     return tasks
 
 
-def affinitize_task_to_master(batch_client, cluster_id, task):
+def get_master_affinity_info(batch_client, cluster_id):
     pool = batch_client.pool.get(config.pool_id)
     master_node_id = get_master_node_id(pool)
     master_node = batch_client.compute_node.get(pool_id=cluster_id, node_id=master_node_id)
-    task.affinity_info = batch_models.AffinityInformation(affinity_id=master_node.affinity_id)
-    return task
+    return batch_models.AffinityInformation(affinity_id=master_node.affinity_id)
 
 
 def schedule_tasks(tasks):
@@ -42,11 +41,11 @@ def schedule_tasks(tasks):
     """
     batch_client = config.batch_client
 
+    # the master does not change while the job runs, so resolve it once for all tasks
+    affinity_info = get_master_affinity_info(batch_client, os.environ["AZ_BATCH_POOL_ID"])
     for task in tasks:
-        # affinitize task to master
-        task = affinitize_task_to_master(batch_client, os.environ["AZ_BATCH_POOL_ID"], task)
-        # schedule the task
-        batch_client.task.add(job_id=os.environ["AZ_BATCH_JOB_ID"], task=task)
+        task.affinity_info = affinity_info
+    helpers.add_task_collection(os.environ["AZ_BATCH_JOB_ID"], tasks, batch_client)
 
 
 def select_scheduling_target_node(spark_cluster_operations, cluster_id, scheduling_target):
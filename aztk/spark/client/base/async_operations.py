@@ -0,0 +1,18 @@
+import asyncio
+import functools
+
+
+class SparkAsyncBaseOperations:
+    """Base of the async operations, running the calls of the sync operations on an executor
+
+    Args:
+        operations: the sync operations the calls are made with.
+        executor (:obj:`concurrent.futures.Executor`): executor the blocking calls run on.
+    """
+
+    def __init__(self, operations, executor):
+        self._operations = operations
+        self._executor = executor
+
+    def _run(self, function, *args, **kwargs):
+        return asyncio.get_event_loop().run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
@@ -1,69 +1,36 @@
+import concurrent.futures
 import os
 
 import azure.batch.models as batch_models
 import yaml
 
-from aztk.utils import helpers
+from aztk.utils import constants, helpers
 from aztk.utils.command_builder import CommandBuilder
 
 
-def generate_application_task(core_base_operations, container_id, application, remote=False):
-    resource_files = []
+def generate_application_task(core_base_operations, container_id, application, remote=False, upload_file=None):
+    """
+        Files of the application are stored concurrently in the artifact store of core_base_operations.
+        upload_file, if given, is called with the application name and the path of each file of the application
+        instead, and returns its resource file
+    """
+    if upload_file is None:
+
+        def upload_file(application_name, file_path):
+            return core_base_operations.artifact_store.upload(file_path)
 
     # The application provided is not hosted remotely and therefore must be uploaded
-    if not remote:
-        app_resource_file = helpers.upload_file_to_container(
-            container_name=container_id,
-            application_name=application.name,
-            file_path=application.application,
-            blob_client=core_base_operations.blob_client,
-            use_full_path=False,
-        )
+    file_paths = [] if remote else [application.application]
+    # Upload dependent JARS, python files and other dependent files
+    file_paths += application.jars + application.py_files + application.files
 
-        # Upload application file
-        resource_files.append(app_resource_file)
+    max_workers = max(min(len(file_paths), constants.ARTIFACT_UPLOAD_CONCURRENCY), 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resource_files = list(executor.map(lambda file_path: upload_file(application.name, file_path), file_paths))
 
+    if not remote:
         application.application = "$AZ_BATCH_TASK_WORKING_DIR/" + os.path.basename(application.application)
 
-    # Upload dependent JARS
-    jar_resource_file_paths = []
-    for jar in application.jars:
-        current_jar_resource_file_path = helpers.upload_file_to_container(
-            container_name=container_id,
-            application_name=application.name,
-            file_path=jar,
-            blob_client=core_base_operations.blob_client,
-            use_full_path=False,
-        )
-        jar_resource_file_paths.append(current_jar_resource_file_path)
-        resource_files.append(current_jar_resource_file_path)
-
-    # Upload dependent python files
-    py_files_resource_file_paths = []
-    for py_file in application.py_files:
-        current_py_files_resource_file_path = helpers.upload_file_to_container(
-            container_name=container_id,
-            application_name=application.name,
-            file_path=py_file,
-            blob_client=core_base_operations.blob_client,
-            use_full_path=False,
-        )
-        py_files_resource_file_paths.append(current_py_files_resource_file_path)
-        resource_files.append(current_py_files_resource_file_path)
-
-    # Upload other dependent files
-    files_resource_file_paths = []
-    for file in application.files:
-        files_resource_file_path = helpers.upload_file_to_container(
-            container_name=container_id,
-            application_name=application.name,
-            file_path=file,
-            blob_client=core_base_operations.blob_client,
-            use_full_path=False,
-        )
-        files_resource_file_paths.append(files_resource_file_path)
-        resource_files.append(files_resource_file_path)
-
     # Upload application definition
     application.jars = [os.path.basename(jar) for jar in application.jars]
     application.py_files = [os.path.basename(py_files) for py_files in application.py_files]
@@ -101,3 +68,19 @@ def generate_application_task(core_base_operations, container_id, application, r
     )
 
     return task
+
+
+def generate_application_tasks(spark_base_operations, core_base_operations, container_id, applications, remote=False):
+    """
+        Generate the tasks of many applications at once. Applications are generated concurrently, and the
+        artifact store uploads a file used by several applications once.
+    """
+    applications = list(applications)
+    max_workers = max(min(len(applications), constants.APPLICATION_UPLOAD_CONCURRENCY), 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda application: spark_base_operations._generate_application_task(
+                    core_base_operations, container_id, application, remote),
+                applications,
+            ))
@@ -56,7 +56,7 @@ def __get_secrets_env(core_base_operations):
 
 
 def __cluster_install_cmd(
-        zip_resource_file: batch_models.ResourceFile,
+        zip_resource_files: List[batch_models.ResourceFile],
         gpu_enabled: bool,
         docker_repo: str = None,
         docker_run_options: str = None,
@@ -85,9 +85,10 @@ def __cluster_install_cmd(
         "time("
         "apt-get -y update;"
         "apt-get -y --no-install-recommends install unzip;"
-        "unzip -o $AZ_BATCH_TASK_WORKING_DIR/{0};"
+        "{0}"
         "chmod 777 $AZ_BATCH_TASK_WORKING_DIR/aztk/node_scripts/setup_host.sh;"
-        ") 2>&1".format(zip_resource_file.file_path),
+        ") 2>&1".format("".join("unzip -o $AZ_BATCH_TASK_WORKING_DIR/{0};".format(zip_resource_file.file_path)
+                                for zip_resource_file in zip_resource_files)),
         '/bin/bash $AZ_BATCH_TASK_WORKING_DIR/aztk/node_scripts/setup_host.sh {0} {1} "{2}"'.format(
             constants.DOCKER_SPARK_CONTAINER_NAME,
             docker_repo,
@@ -101,7 +102,7 @@ def __cluster_install_cmd(
 
 def generate_cluster_start_task(
         core_base_operations,
-        zip_resource_file: batch_models.ResourceFile,
+        zip_resource_files: List[batch_models.ResourceFile],
         cluster_id: str,
         gpu_enabled: bool,
         docker_repo: str = None,
@@ -113,10 +114,13 @@ def generate_cluster_start_task(
     """
         This will return the start task object for the pool to be created.
         :param cluster_id str: Id of the cluster(Used for uploading the resource files)
-        :param zip_resource_file: Resource file object pointing to the zip file containing scripts to run on the node
+        :param zip_resource_files: Resource file objects pointing to the zip files containing scripts to run on the
+            node, unzipped in order. A single resource file is also accepted.
     """
 
-    resource_files = [zip_resource_file]
+    if isinstance(zip_resource_files, batch_models.ResourceFile):
+        zip_resource_files = [zip_resource_files]
+    resource_files = list(zip_resource_files)
     spark_web_ui_port = constants.DOCKER_SPARK_WEB_UI_PORT
     spark_worker_ui_port = constants.DOCKER_SPARK_WORKER_UI_PORT
     spark_job_ui_port = constants.DOCKER_SPARK_JOB_UI_PORT
@@ -136,7 +140,7 @@ def generate_cluster_start_task(
                                                                                mixed_mode))
 
     # start task command
-    command = __cluster_install_cmd(zip_resource_file, gpu_enabled, docker_repo, docker_run_options, file_shares)
+    command = __cluster_install_cmd(resource_files, gpu_enabled, docker_repo, docker_run_options, file_shares)
 
     return batch_models.StartTask(
         command_line=helpers.wrap_commands_in_shell(command),
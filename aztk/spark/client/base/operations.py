@@ -15,7 +15,7 @@ class SparkBaseOperations:
     def _generate_cluster_start_task(
             self,
             core_base_operations,
-            zip_resource_file: batch_models.ResourceFile,
+            zip_resource_files: List[batch_models.ResourceFile],
             id: str,
             gpu_enabled: bool,
             docker_repo: str = None,
@@ -27,8 +27,8 @@ class SparkBaseOperations:
         """Generate the Azure Batch Start Task to provision a Spark cluster.
 
         Args:
-            zip_resource_file (:obj:`azure.batch.models.ResourceFile`): a single zip file of all necessary data
-                to upload to the cluster.
+            zip_resource_files (:obj:`List[azure.batch.models.ResourceFile]`): the zip files of all necessary data
+                to upload to the cluster, unzipped in order.
             id (:obj:`str`): the id of the cluster.
             gpu_enabled (:obj:`bool`): if True, the cluster is GPU enabled.
             docker_repo (:obj:`str`, optional): the docker repository and tag that identifies the docker image to use.
@@ -45,7 +45,7 @@ class SparkBaseOperations:
         """
         return generate_cluster_start_task.generate_cluster_start_task(
             core_base_operations,
-            zip_resource_file,
+            zip_resource_files,
             id,
             gpu_enabled,
             docker_repo,
@@ -56,7 +56,12 @@ class SparkBaseOperations:
         )
 
     # TODO: make this private or otherwise not public
-    def _generate_application_task(self, core_base_operations, container_id, application, remote=False):
+    def _generate_application_task(self,
+                                   core_base_operations,
+                                   container_id,
+                                   application,
+                                   remote=False,
+                                   upload_file=None):
         """Generate the Azure Batch Start Task to provision a Spark cluster.
 
         Args:
@@ -65,12 +70,14 @@ class SparkBaseOperations:
             remote (:obj:`bool`): If True, the application file will not be uploaded, it is assumed to be reachable
                 by the cluster already. This is useful when your application is stored in a mounted Azure File Share
                 and not the client. Defaults to False.
+            upload_file (:obj:`Callable`, optional): called with the application name and the path of each file to
+                upload, returns the :obj:`azure.batch.models.ResourceFile` of the uploaded file. Defaults to None.
 
         Returns:
             :obj:`azure.batch.models.TaskAddParameter`: the Task definition for the Application.
         """
         return generate_application_task.generate_application_task(core_base_operations, container_id, application,
-                                                                   remote)
+                                                                   remote, upload_file)
 
     def _list_applications(self, core_base_operations, id):
         """Get information on tasks submitted to a cluster
@@ -1,7 +1,10 @@
-from aztk.client import CoreClient
+from concurrent.futures import ThreadPoolExecutor
+
+from aztk.client import CoreClient, StatusWatcher
 from aztk.spark import models
-from aztk.spark.client.cluster import ClusterOperations
-from aztk.spark.client.job import JobOperations
+from aztk.spark.client.cluster import AsyncClusterOperations, ClusterOperations
+from aztk.spark.client.job import AsyncJobOperations, JobOperations
+from aztk.utils import constants
 
 
 class Client(CoreClient):
@@ -10,6 +13,12 @@ class Client(CoreClient):
         Attributes:
             cluster (:obj:`aztk.spark.client.cluster.ClusterOperations`): Cluster
             job (:obj:`aztk.spark.client.job.JobOperations`): Job
+            request_governor (:obj:`aztk.utils.retry.RequestGovernor`): rate limits and retries the requests of the
+                client, get_counters() returns the number of throttled and retried requests by service
+            sas_provider (:obj:`aztk.utils.sas.SasProvider`): generates the shared access signatures of resource
+                files, its expiry, max_age and container_scope can be changed
+            artifact_store (:obj:`aztk.client.base.helpers.artifact_store.ArtifactStore`): stores the files of
+                applications, prune() deletes the files no cluster or job used recently
     """
 
     def __init__(self, secrets_configuration: models.SecretsConfiguration):
@@ -17,3 +26,55 @@ class Client(CoreClient):
         context = self._get_context(secrets_configuration)
         self.cluster = ClusterOperations(context)
         self.job = JobOperations(context)
+
+    def status_watcher(self, interval: float = None):
+        """Create a watcher of the state of clusters, nodes and applications
+
+        Subscriptions of the watcher are merged into a minimal set of periodic list requests. Call start() on the
+        watcher, or use it as a context manager, to start polling.
+
+        Args:
+            interval (:obj:`float`, optional): number of seconds between polls.
+                Defaults to aztk.utils.constants.STATUS_WATCHER_INTERVAL.
+
+        Returns:
+            :obj:`aztk.client.StatusWatcher`: the watcher
+        """
+        return StatusWatcher(self.cluster._core_cluster_operations, interval)
+
+
+class AsyncClient:
+    """The asyncio client used to create and manage Spark clusters
+
+        Its operations are coroutines with the same arguments and results as the operations of
+        :obj:`aztk.spark.Client`. Batch, Blob and Table calls run on a thread pool shared by all operations of the
+        client, waits poll without blocking the event loop, and run and copy fan out to the nodes on the event loop.
+
+        Attributes:
+            cluster (:obj:`aztk.spark.client.cluster.AsyncClusterOperations`): Cluster
+            job (:obj:`aztk.spark.client.job.AsyncJobOperations`): Job
+            client (:obj:`aztk.spark.Client`): the sync client the operations are made with
+
+        Args:
+            secrets_configuration (:obj:`aztk.spark.models.SecretsConfiguration`): the secrets of the client.
+            max_workers (:obj:`int`, optional): maximum number of blocking calls run concurrently.
+                Defaults to aztk.utils.constants.ASYNC_CLIENT_MAX_WORKERS.
+    """
+
+    def __init__(self, secrets_configuration: models.SecretsConfiguration, max_workers: int = None):
+        self.client = Client(secrets_configuration)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or constants.ASYNC_CLIENT_MAX_WORKERS)
+        self.cluster = AsyncClusterOperations(self.client.cluster, self._executor)
+        self.job = AsyncJobOperations(self.client.job, self._executor)
+
+    def close(self):
+        """Stop the thread pool of the client and close its pooled SSH connections"""
+        self._executor.shutdown(wait=False)
+        self.client.node_executor.shutdown(wait=False)
+        self.client.ssh_connection_pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1 +1,2 @@
+from .async_operations import AsyncClusterOperations
 from .operations import ClusterOperations
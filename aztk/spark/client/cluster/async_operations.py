@@ -0,0 +1,160 @@
+from typing import List
+
+from azure.batch.models import BatchErrorException
+
+from aztk import error
+from aztk.client.base.helpers import run as core_run
+from aztk.client.cluster.helpers import copy as core_copy
+from aztk.spark import models
+from aztk.spark.client.base.async_operations import SparkAsyncBaseOperations
+from aztk.utils import helpers
+
+from .helpers import wait
+
+
+class AsyncClusterOperations(SparkAsyncBaseOperations):
+    """Async Spark ClusterOperations object
+
+    Every method is a coroutine with the same arguments and result as the method of the same name of
+    :obj:`aztk.spark.client.cluster.ClusterOperations`. Batch, Blob and Table calls run on the executor of the client,
+    so calls made concurrently do not block each other or the event loop.
+
+    Attributes:
+        _operations (:obj:`aztk.spark.client.cluster.ClusterOperations`): the sync operations the calls are made with.
+    """
+
+    async def create(self, cluster_configuration: models.ClusterConfiguration, wait: bool = False):
+        return await self._run(self._operations.create, cluster_configuration, wait)
+
+    async def delete(self, id: str, keep_logs: bool = False):
+        return await self._run(self._operations.delete, id, keep_logs)
+
+    async def get(self, id: str, cached: bool = False):
+        return await self._run(self._operations.get, id, cached)
+
+    async def list(self):
+        return await self._run(self._operations.list)
+
+    async def submit(self,
+                     id: str,
+                     application: models.ApplicationConfiguration,
+                     remote: bool = False,
+                     wait: bool = False,
+                     internal: bool = False):
+        await self._run(self._operations.submit, id, application, remote, False, internal)
+        if wait:
+            await self.wait(id, application.name)
+
+    async def submit_many(self,
+                          id: str,
+                          applications: List[models.ApplicationConfiguration],
+                          remote: bool = False,
+                          wait: bool = False,
+                          internal: bool = False):
+        await self._run(self._operations.submit_many, id, applications, remote, False, internal)
+        if wait:
+            await self.wait(id, [application.name for application in applications])
+
+    async def wait(self, id: str, application_name, timeout: float = None):
+        """Wait until the application has completed, polling without blocking the event loop
+
+        Args:
+            id (:obj:`str`): the id of the cluster the application was submitted to
+            application_name (:obj:`str` or :obj:`List[str]`): the name of the application to wait for. If a list
+                of names is given, wait until all of the applications have completed.
+            timeout (:obj:`float`, optional): number of seconds to wait before raising
+                :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
+        """
+        application_names = [application_name] if isinstance(application_name, str) else application_name
+        await wait.wait_for_applications_to_complete_async(self._operations._core_cluster_operations, id,
+                                                           application_names, timeout, self._executor)
+
+    async def get_application_log(self, id: str, application_name: str, tail=False, current_bytes: int = 0):
+        return await self._run(self._operations.get_application_log, id, application_name, tail, current_bytes)
+
+    async def get_application_state(self, id: str, application_name: str):
+        return await self._run(self._operations.get_application_state, id, application_name)
+
+    async def list_applications(self, id: str):
+        return await self._run(self._operations.list_applications, id)
+
+    async def get_configuration(self, id: str):
+        return await self._run(self._operations.get_configuration, id)
+
+    async def run(self,
+                  id: str,
+                  command: str,
+                  host=False,
+                  internal: bool = False,
+                  timeout=None,
+                  max_output_size=None,
+                  spill_output=False):
+        try:
+            return await core_run.cluster_run_async(
+                self._operations._core_cluster_operations,
+                id,
+                command,
+                internal,
+                container_name="spark" if not host else None,
+                timeout=timeout,
+                max_output_size=max_output_size,
+                spill_output=spill_output,
+                executor=self._executor)
+        except BatchErrorException as e:
+            raise error.AztkError(helpers.format_batch_exception(e))
+
+    async def node_run(self,
+                       id: str,
+                       node_id: str,
+                       command: str,
+                       host=False,
+                       internal: bool = False,
+                       timeout=None,
+                       block=True,
+                       max_output_size=None,
+                       spill_output=False):
+        return await self._run(self._operations.node_run, id, node_id, command, host, internal, timeout, block,
+                               max_output_size, spill_output)
+
+    async def copy(self,
+                   id: str,
+                   source_path: str,
+                   destination_path: str,
+                   host: bool = False,
+                   internal: bool = False,
+                   timeout: int = None,
+                   broadcast: bool = False):
+        try:
+            return await core_copy.cluster_copy_async(
+                self._operations._core_cluster_operations,
+                id,
+                source_path,
+                destination_path=destination_path,
+                container_name=None if host else "spark",
+                internal=internal,
+                timeout=timeout,
+                broadcast=broadcast,
+                executor=self._executor)
+        except BatchErrorException as e:
+            raise error.AztkError(helpers.format_batch_exception(e))
+
+    async def download(self,
+                       id: str,
+                       source_path: str,
+                       destination_path: str = None,
+                       host: bool = False,
+                       internal: bool = False,
+                       timeout: int = None):
+        try:
+            return await core_copy.cluster_copy_async(
+                self._operations._core_cluster_operations,
+                id,
+                source_path,
+                destination_path=destination_path,
+                container_name=None if host else "spark",
+                internal=internal,
+                get=True,
+                timeout=timeout,
+                executor=self._executor)
+        except BatchErrorException as e:
+            raise error.AztkError(helpers.format_batch_exception(e))
@@ -12,6 +12,7 @@ def cluster_copy(
         host: bool = False,
         internal: bool = False,
         timeout: int = None,
+        broadcast: bool = False,
 ):
     try:
         container_name = None if host else "spark"
@@ -23,6 +24,7 @@ def cluster_copy(
             get=False,
             internal=internal,
             timeout=timeout,
+            broadcast=broadcast,
         )
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
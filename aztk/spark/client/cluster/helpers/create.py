@@ -46,7 +46,7 @@ def create_cluster(core_cluster_operations,
     try:
         zip_resource_files = None
         node_data = NodeData(cluster_conf).add_core().done()
-        zip_resource_files = cluster_data.upload_node_data(node_data).to_resource_file()
+        zip_resource_files = [blob_data.to_resource_file() for blob_data in cluster_data.upload_node_data(node_data)]
 
         start_task = spark_cluster_operations._generate_cluster_start_task(
             core_cluster_operations,
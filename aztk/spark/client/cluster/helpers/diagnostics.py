@@ -24,7 +24,10 @@ def _run(spark_cluster_operations, cluster_id, output_directory=None, brief=Fals
         # write run output or error to debug/ directory
         with open(os.path.join(output_directory, "debug-output.txt"), "w", encoding="UTF-8") as stream:
             for node_output in run_output:
-                stream.write(node_output.error) if node_output.error else stream.write(node_output.output)
+                if node_output.error:
+                    stream.write(str(node_output.error))
+                else:
+                    stream.write(node_output.output)
     else:
         result = spark_cluster_operations.download(cluster_id, remote_path, host=True)
 
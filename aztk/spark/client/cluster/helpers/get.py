@@ -5,9 +5,9 @@ from aztk.spark import models
 from aztk.utils import helpers
 
 
-def get_cluster(core_cluster_operations, cluster_id: str):
+def get_cluster(core_cluster_operations, cluster_id: str, cached: bool = False):
     try:
-        cluster = core_cluster_operations.get(cluster_id)
+        cluster = core_cluster_operations.get(cluster_id, cached)
         return models.Cluster(cluster)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
@@ -10,3 +10,11 @@ def get_remote_login_settings(core_cluster_operations, id: str, node_id: str):
         return models.RemoteLogin(core_cluster_operations.get_remote_login_settings(id, node_id))
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
+
+
+def get_remote_login_settings_for_cluster(core_cluster_operations, id: str, node_ids=None, max_workers: int = None):
+    try:
+        remote_login_settings = core_cluster_operations.get_remote_login_settings_for_cluster(id, node_ids, max_workers)
+        return {node_id: models.RemoteLogin(settings) for node_id, settings in remote_login_settings.items()}
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
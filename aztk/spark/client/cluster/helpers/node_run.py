@@ -13,6 +13,8 @@ def node_run(
         internal: bool = False,
         timeout=None,
         block=False,
+        max_output_size=None,
+        spill_output=False,
 ):
     try:
         return core_cluster_operations.node_run(
@@ -22,6 +24,8 @@ def node_run(
             internal,
             container_name="spark" if not host else None,
             timeout=timeout,
-            block=block)
+            block=block,
+            max_output_size=max_output_size,
+            spill_output=spill_output)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
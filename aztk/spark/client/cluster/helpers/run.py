@@ -9,9 +9,40 @@ def cluster_run(core_cluster_operations,
                 command: str,
                 host=False,
                 internal: bool = False,
-                timeout=None):
+                timeout=None,
+                max_output_size=None,
+                spill_output=False):
     try:
         return core_cluster_operations.run(
-            cluster_id, command, internal, container_name="spark" if not host else None, timeout=timeout)
+            cluster_id,
+            command,
+            internal,
+            container_name="spark" if not host else None,
+            timeout=timeout,
+            max_output_size=max_output_size,
+            spill_output=spill_output)
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
+
+
+def cluster_run_stream(core_cluster_operations,
+                       cluster_id: str,
+                       command: str,
+                       host=False,
+                       internal: bool = False,
+                       timeout=None,
+                       lines=False,
+                       max_output_size=None,
+                       spill_output=False):
+    try:
+        yield from core_cluster_operations.run_stream(
+            cluster_id,
+            command,
+            internal,
+            container_name="spark" if not host else None,
+            timeout=timeout,
+            lines=lines,
+            max_output_size=max_output_size,
+            spill_output=spill_output)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
@@ -1,24 +1,37 @@
+import concurrent.futures
+import shlex
+
 import azure.batch.models as batch_models
 import yaml
 from azure.batch.models import BatchErrorException
 
 from aztk import error
+from aztk import models as base_models
+from aztk.client.base.helpers import metadata_cache
 from aztk.error import AztkError
 from aztk.spark import models
-from aztk.utils import constants, helpers
+from aztk.spark.client.base.helpers import generate_application_task
+from aztk.utils import constants, helpers, waiter
+from aztk.utils import ssh as ssh_lib
 
 
 def __get_node(core_cluster_operations, node_id: str, cluster_id: str) -> batch_models.ComputeNode:
     return core_cluster_operations.batch_client.compute_node.get(cluster_id, node_id)
 
 
-def affinitize_task_to_master(core_cluster_operations, spark_cluster_operations, cluster_id, task):
-    cluster = spark_cluster_operations.get(cluster_id)
+def get_master_affinity_info(core_cluster_operations, spark_cluster_operations, cluster_id):
+    cluster = spark_cluster_operations.get(cluster_id, cached=True)
+    if cluster.master_node_id is None:
+        # the master may have been selected since the cluster was cached
+        cluster = spark_cluster_operations.get(cluster_id)
     if cluster.master_node_id is None:
         raise AztkError("Master has not yet been selected. Please wait until the cluster is finished provisioning.")
-    master_node = core_cluster_operations.batch_client.compute_node.get(
-        pool_id=cluster_id, node_id=cluster.master_node_id)
-    task.affinity_info = batch_models.AffinityInformation(affinity_id=master_node.affinity_id)
+    master_node = metadata_cache.get_node(core_cluster_operations, cluster_id, cluster.master_node_id)
+    return batch_models.AffinityInformation(affinity_id=master_node.affinity_id)
+
+
+def affinitize_task_to_master(core_cluster_operations, spark_cluster_operations, cluster_id, task):
+    task.affinity_info = get_master_affinity_info(core_cluster_operations, spark_cluster_operations, cluster_id)
     return task
 
 
@@ -34,35 +47,24 @@ def upload_serialized_task_to_storage(blob_client, cluster_id, task):
 
 def select_scheduling_target_node(spark_cluster_operations, cluster_id, scheduling_target):
     # for now, limit to only targeting master
-    cluster = spark_cluster_operations.get(cluster_id)
+    cluster = spark_cluster_operations.get(cluster_id, cached=True)
     if not cluster.master_node_id:
         return None
     return cluster.master_node_id
 
 
-def schedule_with_target(
-        core_cluster_operations,
-        spark_cluster_operations,
-        cluster_id,
-        scheduling_target,
-        task,
-        wait,
-        internal,
-):
-    # upload "real" task definition to storage
-    serialized_task_resource_file = upload_serialized_task_to_storage(core_cluster_operations.blob_client, cluster_id,
-                                                                      task)
-    # # schedule "ghost" task
-    ghost_task = batch_models.TaskAddParameter(
+def get_ghost_task(task):
+    """Task that only reserves the id of a task scheduled on a target node, and is never run by Batch"""
+    return batch_models.TaskAddParameter(
         id=task.id,
         command_line="/bin/bash",
     )
-    # tell the node to run the task
-    core_cluster_operations.batch_client.task.add(cluster_id, task=ghost_task)
 
+
+def get_scheduled_task_command(cluster_id, task, serialized_task_resource_file):
     task_working_dir = "/mnt/aztk/startup/tasks/workitems/{}".format(task.id)
 
-    task_cmd = (
+    return (
         r"source ~/.bashrc; "
         r"mkdir -p {0};"
         r"export PYTHONPATH=$PYTHONPATH:$AZTK_WORKING_DIR; "
@@ -72,13 +74,81 @@ def schedule_with_target(
         r'$AZTK_WORKING_DIR/.aztk-env/.venv/bin/python $AZTK_WORKING_DIR/aztk/node_scripts/scheduling/submit.py "{2}" >> {3} 2>&1'.
         format(task_working_dir, cluster_id, serialized_task_resource_file.blob_source,
                constants.SPARK_SUBMIT_LOGS_FILE))
+
+
+def schedule_with_target(
+        core_cluster_operations,
+        spark_cluster_operations,
+        cluster_id,
+        scheduling_target,
+        task,
+        wait,
+        internal,
+):
+    # upload "real" task definition to storage
+    serialized_task_resource_file = upload_serialized_task_to_storage(core_cluster_operations.blob_client, cluster_id,
+                                                                      task)
+    # # schedule "ghost" task
+    core_cluster_operations.batch_client.task.add(cluster_id, task=get_ghost_task(task))
+
+    # tell the node to run the task
+    task_cmd = get_scheduled_task_command(cluster_id, task, serialized_task_resource_file)
     node_id = select_scheduling_target_node(spark_cluster_operations, cluster_id, scheduling_target)
     node_run_output = spark_cluster_operations.node_run(
         cluster_id, node_id, task_cmd, timeout=120, block=wait, internal=internal)
 
 
+def schedule_many_with_target(
+        core_cluster_operations,
+        spark_cluster_operations,
+        cluster_id,
+        scheduling_target,
+        tasks,
+        internal,
+):
+    """
+    Schedule many tasks on the target node: the task definitions are uploaded concurrently, the ghost tasks are
+    added in bulk and every task is started in the background by a single script sent over one SSH session
+    """
+    tasks = list(tasks)
+    blob_client = core_cluster_operations.blob_client
+    max_workers = max(min(len(tasks), constants.APPLICATION_UPLOAD_CONCURRENCY), 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        serialized_task_resource_files = list(
+            executor.map(lambda task: upload_serialized_task_to_storage(blob_client, cluster_id, task), tasks))
+
+    helpers.add_task_collection(cluster_id,
+                                [get_ghost_task(task) for task in tasks], core_cluster_operations.batch_client)
+
+    # start every task in the background, detached from the session, as node_run does with block=False
+    script = ""
+    for task, resource_file in zip(tasks, serialized_task_resource_files):
+        task_cmd = "set -e -o pipefail; " + get_scheduled_task_command(cluster_id, task, resource_file)
+        script += "setsid /bin/bash -c {} < /dev/null > /dev/null 2>&1 &\n".format(shlex.quote(task_cmd))
+
+    node_id = select_scheduling_target_node(spark_cluster_operations, cluster_id, scheduling_target)
+    node = metadata_cache.get_node(core_cluster_operations, cluster_id, node_id)
+    if internal:
+        node_rls = base_models.RemoteLogin(ip_address=node.ip_address, port="22")
+    else:
+        node_rls = core_cluster_operations.get_remote_login_settings(cluster_id, node_id)
+    username, ssh_key = core_cluster_operations.get_cluster_credentials(cluster_id, [node], prune=False)
+    node_output = ssh_lib.node_exec_script(
+        node_id,
+        script,
+        username,
+        node_rls.ip_address,
+        node_rls.port,
+        ssh_key=ssh_key.exportKey().decode("utf-8"),
+        container_name="spark",
+        timeout=120,
+        connection_pool=core_cluster_operations.ssh_connection_pool)
+    if node_output.error:
+        raise AztkError("Failed to start the applications on node {}: {}".format(node_id, node_output.error))
+
+
 def get_cluster_scheduling_target(core_cluster_operations, cluster_id):
-    cluster_configuration = core_cluster_operations.get_cluster_data(cluster_id).read_cluster_config()
+    cluster_configuration = metadata_cache.get_cluster_configuration(core_cluster_operations, cluster_id)
     return cluster_configuration.scheduling_target
 
 
@@ -124,3 +194,54 @@ def submit(
                            internal)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
+
+
+def submit_applications(
+        core_cluster_operations,
+        spark_cluster_operations,
+        cluster_id,
+        applications,
+        remote: bool = False,
+        wait: bool = False,
+        internal: bool = False,
+):
+    """
+    Submit many spark apps, sharing the cluster lookups and adding the tasks in bulk
+    """
+    applications = list(applications)
+    names = [application.name for application in applications]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise AztkError("Application names must be unique, found duplicates: {}".format(", ".join(duplicates)))
+
+    scheduling_target = get_cluster_scheduling_target(core_cluster_operations, cluster_id)
+    affinity_info = get_master_affinity_info(core_cluster_operations, spark_cluster_operations, cluster_id)
+    tasks = generate_application_task.generate_application_tasks(spark_cluster_operations, core_cluster_operations,
+                                                                 cluster_id, applications, remote)
+    for task in tasks:
+        task.affinity_info = affinity_info
+
+    if scheduling_target is not models.SchedulingTarget.Any:
+        schedule_many_with_target(core_cluster_operations, spark_cluster_operations, cluster_id, scheduling_target,
+                                  tasks, internal)
+    else:
+        helpers.add_task_collection(cluster_id, tasks, core_cluster_operations.batch_client)
+
+    if wait:
+        waiter.wait_for_tasks(core_cluster_operations.batch_client, cluster_id, [task.id for task in tasks])
+
+
+def submit_many(
+        core_cluster_operations,
+        spark_cluster_operations,
+        cluster_id: str,
+        applications,
+        remote: bool = False,
+        wait: bool = False,
+        internal: bool = False,
+):
+    try:
+        submit_applications(core_cluster_operations, spark_cluster_operations, cluster_id, applications, remote, wait,
+                            internal)
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
@@ -1,11 +1,27 @@
 from azure.batch.models import BatchErrorException
 
 from aztk import error
-from aztk.utils import helpers
+from aztk.utils import helpers, waiter
 
 
-def wait_for_application_to_complete(core_cluster_operations, id, application_name):
+def wait_for_application_to_complete(core_cluster_operations, id, application_name, timeout=None):
     try:
-        return core_cluster_operations.wait(id, application_name)
+        return core_cluster_operations.wait(id, application_name, timeout)
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
+
+
+async def wait_for_applications_to_complete_async(core_cluster_operations,
+                                                  id,
+                                                  application_names,
+                                                  timeout=None,
+                                                  executor=None):
+    try:
+        await waiter.wait_for_tasks_async(
+            core_cluster_operations.batch_client,
+            id,
+            application_names,
+            waiter=waiter.Waiter(timeout=timeout),
+            executor=executor)
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
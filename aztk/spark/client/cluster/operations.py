@@ -1,3 +1,5 @@
+from typing import List
+
 from aztk.client.cluster import CoreClusterOperations
 from aztk.spark import models
 from aztk.spark.client.base import SparkBaseOperations
@@ -34,6 +36,9 @@ class ClusterOperations(SparkBaseOperations):
     def delete(self, id: str, keep_logs: bool = False):
         """Delete a cluster.
 
+        The application files of the cluster are kept in the artifact store shared by every cluster and job, use
+        artifact_store.prune() of the client to delete the files no cluster or job used recently.
+
         Args:
             id (:obj:`str`): the id of the cluster to delete.
             keep_logs (:obj:`bool`): If True, the logs related to this cluster in Azure Storage are not deleted.
@@ -43,16 +48,18 @@ class ClusterOperations(SparkBaseOperations):
         """
         return delete.delete_cluster(self._core_cluster_operations, id, keep_logs)
 
-    def get(self, id: str):
+    def get(self, id: str, cached: bool = False):
         """Get details about the state of a cluster.
 
         Args:
             id (:obj:`str`): the id of the cluster to get.
+            cached (:obj:`bool`, optional): If True, pool and node metadata read in the last
+                aztk.utils.constants.METADATA_CACHE_TTL seconds may be returned. Defaults to False.
 
         Returns:
             :obj:`aztk.spark.models.Cluster`: A Cluster object representing the state and configuration of the cluster.
         """
-        return get.get_cluster(self._core_cluster_operations, id)
+        return get.get_cluster(self._core_cluster_operations, id, cached)
 
     def list(self):
         """List all clusters.
@@ -90,6 +97,36 @@ class ClusterOperations(SparkBaseOperations):
         """
         return submit.submit(self._core_cluster_operations, self, id, application, remote, wait, internal)
 
+    def submit_many(
+            self,
+            id: str,
+            applications: List[models.ApplicationConfiguration],
+            remote: bool = False,
+            wait: bool = False,
+            internal: bool = False,
+    ):
+        """Submit many applications to a cluster at once.
+
+        The cluster is looked up once for all applications, their files are uploaded concurrently, with files
+        shared by several applications uploaded once, and their tasks are added in bulk.
+
+        Args:
+            id (:obj:`str`): the id of the cluster to submit the applications to.
+            applications (:obj:`List[aztk.spark.models.ApplicationConfiguration]`): Application definitions.
+                Application names must be unique.
+            remote (:obj:`bool`): If True, the application files will not be uploaded, they are assumed to be
+                reachable by the cluster already. Defaults to False.
+            internal (:obj:`bool`): if True, this will connect to the node using its internal IP.
+                Only use this if running within the same VNET as the cluster. This only applies if the cluster's
+                SchedulingTarget is not set to SchedulingTarget.Any. Defaults to False.
+            wait (:obj:`bool`, optional): If True, this function blocks until all applications have completed.
+                Defaults to False.
+
+        Returns:
+            :obj:`None`
+        """
+        return submit.submit_many(self._core_cluster_operations, self, id, applications, remote, wait, internal)
+
     def create_user(self, id: str, username: str, password: str = None, ssh_key: str = None):
         """Create a user on every node in the cluster
 
@@ -128,7 +165,14 @@ class ClusterOperations(SparkBaseOperations):
         """
         return self._list_applications(self._core_cluster_operations, id)
 
-    def run(self, id: str, command: str, host=False, internal: bool = False, timeout=None):
+    def run(self,
+            id: str,
+            command: str,
+            host=False,
+            internal: bool = False,
+            timeout=None,
+            max_output_size=None,
+            spill_output=False):
         """Run a bash command on every node in the cluster
 
         Args:
@@ -140,12 +184,53 @@ class ClusterOperations(SparkBaseOperations):
                 If None, the command will run on the host VM. Defaults to None.
             timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
 
         Returns:
             :obj:`List[aztk.spark.models.NodeOutput]`:
                 list of NodeOutput objects containing the output of the run command
         """
-        return run.cluster_run(self._core_cluster_operations, id, command, host, internal, timeout)
+        return run.cluster_run(self._core_cluster_operations, id, command, host, internal, timeout, max_output_size,
+                               spill_output)
+
+    def run_stream(self,
+                   id: str,
+                   command: str,
+                   host=False,
+                   internal: bool = False,
+                   timeout=None,
+                   lines=False,
+                   max_output_size=None,
+                   spill_output=False):
+        """Run a bash command on every node in the cluster and yield the output of each node as soon as it finishes
+
+        Args:
+            id (:obj:`str`): the id of the cluster to run the command on.
+            command (:obj:`str`): the bash command to execute on the node.
+            host (:obj:`bool`, optional): If True, the command is run on the host VM instead of the
+                Spark container. Defaults to False.
+            internal (:obj:`bool`): if true, this will connect to the node using its internal IP.
+                Only use this if running within the same VNET as the cluster. Defaults to False.
+            timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
+                Defaults to None.
+            lines=False (:obj:`bool`, optional): If True, every line of output is also yielded as an
+                :obj:`aztk.models.SSHLog` tagged with the node id as soon as it is written. Defaults to False.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
+
+        Returns:
+            :obj:`Iterator[aztk.spark.models.NodeOutput]`:
+                generator of NodeOutput objects, yielded in the order the nodes finish
+        """
+        return run.cluster_run_stream(self._core_cluster_operations, id, command, host, internal, timeout, lines,
+                                      max_output_size, spill_output)
 
     def node_run(
             self,
@@ -156,6 +241,8 @@ class ClusterOperations(SparkBaseOperations):
             internal: bool = False,
             timeout=None,
             block=True,
+            max_output_size=None,
+            spill_output=False,
     ):
         """Run a bash command on the given node
 
@@ -170,10 +257,16 @@ class ClusterOperations(SparkBaseOperations):
             timeout=None (:obj:`str`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
             block=True (:obj:`bool`, optional): If True, the command blocks until execution is complete.
+            max_output_size=None (:obj:`int`, optional): maximum number of bytes of output to keep per node.
+                If the output is larger, only its beginning and end are kept. Defaults to None.
+            spill_output=False (:obj:`bool`, optional): If True, output larger than
+                aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD is spilled to a temporary file, set as the
+                output_file of the NodeOutput instead of its output. Defaults to False.
         Returns:
             :obj:`aztk.spark.models.NodeOutput`: object containing the output of the run command
         """
-        return node_run.node_run(self._core_cluster_operations, id, node_id, command, host, internal, timeout, block)
+        return node_run.node_run(self._core_cluster_operations, id, node_id, command, host, internal, timeout, block,
+                                 max_output_size, spill_output)
 
     def copy(
             self,
@@ -183,12 +276,14 @@ class ClusterOperations(SparkBaseOperations):
             host: bool = False,
             internal: bool = False,
             timeout: int = None,
+            broadcast: bool = False,
     ):
         """Copy a file to every node in a cluster.
 
         Args:
             id (:obj:`str`): the id of the cluster to copy files with.
-            source_path (:obj:`str`): the local path of the file to copy.
+            source_path (:obj:`str`): the local path of the file to copy. If it is a directory, only the files that
+                are missing or differ on each node are copied, as a compressed archive.
             destination_path (:obj:`str`, optional): the path on each node the file is copied to.
             container_name (:obj:`str`, optional): the name of the container to copy to or from.
                 If None, the copy operation will occur on the host VM, Defaults to None.
@@ -196,13 +291,17 @@ class ClusterOperations(SparkBaseOperations):
                 Only use this if running within the same VNET as the cluster. Defaults to False.
             timeout (:obj:`int`, optional): The timeout in seconds for establishing a connection to the node.
                 Defaults to None.
+            broadcast (:obj:`bool`, optional): If True, the file is uploaded to the master node only and sent
+                from node to node inside the cluster, so the data uploaded does not grow with the size of the
+                cluster. The nodes authenticate to each other with a key pair generated for the copy, whose private
+                key is staged on the nodes and removed from all of them when the copy ends. Defaults to False.
 
         Returns:
             :obj:`List[aztk.spark.models.NodeOutput]`:
                 A list of NodeOutput objects representing the output of the copy command.
         """
         return copy.cluster_copy(self._core_cluster_operations, id, source_path, destination_path, host, internal,
-                                 timeout)
+                                 timeout, broadcast)
 
     def download(
             self,
@@ -219,8 +318,10 @@ class ClusterOperations(SparkBaseOperations):
             id (:obj:`str`): the id of the cluster to copy files with.
             source_path (:obj:`str`): the path of the file to copy from.
             destination_path (:obj:`str`, optional): the local directory path where the output should be written.
-                If None, a SpooledTemporaryFile will be returned in the NodeOutput object, else the file will be
-                written to this path. Defaults to None.
+                If None, a temporary file will be returned in the NodeOutput object, else the file will be
+                written to this path. Temporary files are kept in memory up to a total of
+                aztk.utils.constants.SSH_DOWNLOAD_MEMORY_BUDGET bytes across nodes, and on disk beyond that.
+                Defaults to None.
             container_name (:obj:`str`, optional): the name of the container to copy to or from.
                 If None, the copy operation will occur on the host VM, Defaults to None.
             internal (:obj:`bool`, optional): if True, this will connect to the node using its internal IP.
@@ -241,8 +342,10 @@ class ClusterOperations(SparkBaseOperations):
         Args:
             id (:obj:`str`): the id of the cluster to copy files with.
             output_directory (:obj:`str`, optional): the local directory path where the output should be written.
-                If None, a SpooledTemporaryFile will be returned in the NodeOutput object, else the file will be
-                written to this path. Defaults to None.
+                If None, a temporary file will be returned in the NodeOutput object, else the file will be
+                written to this path. Temporary files are kept in memory up to a total of
+                aztk.utils.constants.SSH_DOWNLOAD_MEMORY_BUDGET bytes across nodes, and on disk beyond that.
+                Defaults to None.
 
         Returns:
             :obj:`List[aztk.spark.models.NodeOutput]`:
@@ -281,17 +384,38 @@ class ClusterOperations(SparkBaseOperations):
         """
         return get_remote_login_settings.get_remote_login_settings(self._core_cluster_operations, id, node_id)
 
-    def wait(self, id: str, application_name: str):
+    def get_remote_login_settings_for_cluster(self, id: str, node_ids=None, max_workers: int = None):
+        """Get the remote login information for the nodes of a cluster
+
+        The nodes are resolved concurrently, and the settings of each node are cached for the lifetime of the node.
+
+        Args:
+            id (:obj:`str`): the id of the cluster the nodes are in
+            node_ids (:obj:`List[str]`, optional): the ids of the nodes to get the settings of. If None, all nodes
+                in the cluster are used. Defaults to None.
+            max_workers (:obj:`int`, optional): maximum number of nodes resolved concurrently.
+                Defaults to aztk.utils.constants.REMOTE_LOGIN_SETTINGS_CONCURRENCY.
+
+        Returns:
+            :obj:`Dict[str, aztk.spark.models.RemoteLogin]`: the remote login settings of each node, by node id
+        """
+        return get_remote_login_settings.get_remote_login_settings_for_cluster(self._core_cluster_operations, id,
+                                                                               node_ids, max_workers)
+
+    def wait(self, id: str, application_name, timeout: float = None):
         """Wait until the application has completed
 
         Args:
             id (:obj:`str`): the id of the cluster the application was submitted to
-            application_name (:obj:`str`): the name of the application to wait for
+            application_name (:obj:`str` or :obj:`List[str]`): the name of the application to wait for. If a list
+                of names is given, wait until all of the applications have completed.
+            timeout (:obj:`float`, optional): number of seconds to wait before raising
+                :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
 
         Returns:
             :obj:`None`
         """
-        return wait.wait_for_application_to_complete(self._core_cluster_operations, id, application_name)
+        return wait.wait_for_application_to_complete(self._core_cluster_operations, id, application_name, timeout)
 
     def get_configuration(self, id: str):
         """Get the initial configuration of the cluster
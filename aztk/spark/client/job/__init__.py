@@ -1 +1,2 @@
+from .async_operations import AsyncJobOperations
 from .operations import JobOperations
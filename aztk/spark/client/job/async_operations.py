@@ -0,0 +1,56 @@
+from aztk.spark import models
+from aztk.spark.client.base.async_operations import SparkAsyncBaseOperations
+
+from .helpers import wait_until_complete
+
+
+class AsyncJobOperations(SparkAsyncBaseOperations):
+    """Async Spark JobOperations object
+
+    Every method is a coroutine with the same arguments and result as the method of the same name of
+    :obj:`aztk.spark.client.job.JobOperations`.
+
+    Attributes:
+        _operations (:obj:`aztk.spark.client.job.JobOperations`): the sync operations the calls are made with.
+    """
+
+    async def list(self):
+        return await self._run(self._operations.list)
+
+    async def delete(self, id, keep_logs: bool = False):
+        return await self._run(self._operations.delete, id, keep_logs)
+
+    async def get(self, id):
+        return await self._run(self._operations.get, id)
+
+    async def get_application(self, id, application_name):
+        return await self._run(self._operations.get_application, id, application_name)
+
+    async def get_application_log(self, id, application_name):
+        return await self._run(self._operations.get_application_log, id, application_name)
+
+    async def list_applications(self, id):
+        return await self._run(self._operations.list_applications, id)
+
+    async def stop(self, id):
+        return await self._run(self._operations.stop, id)
+
+    async def stop_application(self, id, application_name):
+        return await self._run(self._operations.stop_application, id, application_name)
+
+    async def submit(self, job_configuration: models.JobConfiguration, wait: bool = False):
+        job = await self._run(self._operations.submit, job_configuration, False)
+        if wait:
+            await self.wait(job_configuration.id)
+        return job
+
+    async def wait(self, id, timeout: float = None):
+        """Wait until the job has completed, polling without blocking the event loop
+
+        Args:
+            id (:obj:`str`): the id of the job the application belongs to
+            timeout (:obj:`float`, optional): number of seconds to wait before raising
+                :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
+        """
+        await wait_until_complete.wait_until_job_finished_async(self._operations._core_job_operations, id, timeout,
+                                                                self._executor)
@@ -1,3 +1,4 @@
+import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 
 from aztk import error
@@ -9,12 +10,21 @@ def _get_job(core_job_operations, job_id):
     job = core_job_operations.batch_client.job_schedule.get(job_id)
     tasks = [app for app in core_job_operations.list_tasks(id=job_id) if app.id != job_id]
     recent_run_job = core_job_operations.get_recent_job(job_id)
-    pool_prefix = recent_run_job.pool_info.auto_pool_specification.auto_pool_id_prefix
     pool = nodes = None
-    for cloud_pool in core_job_operations.batch_client.pool.list():
-        if pool_prefix in cloud_pool.id:
-            pool = cloud_pool
-            break
+    if recent_run_job.execution_info and recent_run_job.execution_info.pool_id:
+        try:
+            pool = core_job_operations.batch_client.pool.get(recent_run_job.execution_info.pool_id)
+        except BatchErrorException as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+    else:
+        # auto pool ids are the prefix followed by a generated suffix
+        pool_prefix = recent_run_job.pool_info.auto_pool_specification.auto_pool_id_prefix
+        pool = next(
+            iter(
+                core_job_operations.batch_client.pool.list(
+                    pool_list_options=batch_models.PoolListOptions(filter="startswith(id, '{}')".format(pool_prefix)))),
+            None)
     if pool:
         nodes = core_job_operations.batch_client.compute_node.list(pool_id=pool.id)
     return job, tasks, pool, nodes
@@ -1,12 +1,19 @@
+import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 
 from aztk import error
 from aztk.spark import models
 from aztk.utils import helpers
 
+# properties of a job schedule read by aztk.spark.models.Job
+JOB_SCHEDULE_SELECT = "id,lastModified,state,stateTransitionTime,creationTime"
+
 
 def _list_jobs(core_job_operations):
-    return [cloud_job_schedule for cloud_job_schedule in core_job_operations.batch_client.job_schedule.list()]
+    return [
+        cloud_job_schedule for cloud_job_schedule in core_job_operations.batch_client.job_schedule.list(
+            job_schedule_list_options=batch_models.JobScheduleListOptions(select=JOB_SCHEDULE_SELECT))
+    ]
 
 
 def list_jobs(core_job_operations):
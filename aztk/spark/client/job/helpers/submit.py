@@ -6,6 +6,7 @@ from aztk import error
 from aztk import models as base_models
 from aztk.internal.cluster_data import NodeData
 from aztk.spark import models
+from aztk.spark.client.base.helpers import generate_application_task
 from aztk.spark.models import SchedulingTarget
 from aztk.utils import helpers
 from aztk.utils.command_builder import CommandBuilder
@@ -83,7 +84,7 @@ def submit_job(core_job_operations,
         job_configuration.validate()
         cluster_data = core_job_operations.get_cluster_data(job_configuration.id)
         node_data = NodeData(job_configuration.to_cluster_config()).add_core().done()
-        zip_resource_files = cluster_data.upload_node_data(node_data).to_resource_file()
+        zip_resource_files = [blob_data.to_resource_file() for blob_data in cluster_data.upload_node_data(node_data)]
 
         start_task = spark_job_operations._generate_cluster_start_task(
             core_job_operations,
@@ -96,11 +97,11 @@ def submit_job(core_job_operations,
             worker_on_master=job_configuration.worker_on_master,
         )
 
-        application_tasks = []
-        for application in job_configuration.applications:
-            application_tasks.append((
-                application,
-                spark_job_operations._generate_application_task(core_job_operations, job_configuration.id, application),
+        application_tasks = list(
+            zip(
+                job_configuration.applications,
+                generate_application_task.generate_application_tasks(
+                    spark_job_operations, core_job_operations, job_configuration.id, job_configuration.applications),
             ))
 
         job_manager_task = generate_job_manager_task(core_job_operations, job_configuration, application_tasks)
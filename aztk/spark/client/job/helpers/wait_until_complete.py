@@ -1,22 +1,39 @@
-import time
+import asyncio
 
 import azure.batch.models as batch_models
 from azure.batch.models import BatchErrorException
 
 from aztk import error
-from aztk.utils import helpers
+from aztk.utils import helpers, waiter
 
 
-def _wait_until_job_finished(core_job_operations, job_id):
-    job_state = core_job_operations.batch_client.job_schedule.get(job_id).state
+def _job_finished_poll(core_job_operations, job_id):
+    options = batch_models.JobScheduleGetOptions(select="state")
 
-    while job_state not in [batch_models.JobScheduleState.completed, batch_models.JobScheduleState.terminating]:
-        time.sleep(3)
-        job_state = core_job_operations.batch_client.job_schedule.get(job_id).state
+    def poll():
+        job_state = core_job_operations.batch_client.job_schedule.get(job_id, job_schedule_get_options=options).state
+        finished = job_state in [batch_models.JobScheduleState.completed, batch_models.JobScheduleState.terminating]
+        return finished, job_state
 
+    return poll
 
-def wait_until_job_finished(core_job_operations, job_id):
+
+def _wait_until_job_finished(core_job_operations, job_id, timeout=None):
+    waiter.Waiter(timeout=timeout).wait(_job_finished_poll(core_job_operations, job_id), "job {}".format(job_id))
+
+
+def wait_until_job_finished(core_job_operations, job_id, timeout=None):
+    try:
+        _wait_until_job_finished(core_job_operations, job_id, timeout)
+    except BatchErrorException as e:
+        raise error.AztkError(helpers.format_batch_exception(e))
+
+
+async def wait_until_job_finished_async(core_job_operations, job_id, timeout=None, executor=None):
+    poll = _job_finished_poll(core_job_operations, job_id)
+    loop = asyncio.get_event_loop()
     try:
-        _wait_until_job_finished(core_job_operations, job_id)
+        await waiter.Waiter(timeout=timeout).wait_async(lambda: loop.run_in_executor(executor, poll),
+                                                        "job {}".format(job_id))
     except BatchErrorException as e:
         raise error.AztkError(helpers.format_batch_exception(e))
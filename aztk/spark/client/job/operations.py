@@ -28,6 +28,9 @@ class JobOperations(SparkBaseOperations):
     def delete(self, id, keep_logs: bool = False):
         """Delete a job.
 
+        The application files of the job are kept in the artifact store shared by every cluster and job, use
+        artifact_store.prune() of the client to delete the files no cluster or job used recently.
+
         Args:
             id (:obj:`str`): the id of the job to delete.
             keep_logs (:obj:`bool`): If True, the logs related to this job in Azure Storage are not deleted.
@@ -122,12 +125,14 @@ class JobOperations(SparkBaseOperations):
         """
         return submit.submit_job(self._core_job_operations, self, job_configuration, wait)
 
-    def wait(self, id):
+    def wait(self, id, timeout: float = None):
         """Wait until the job has completed.
         Args:
             id (:obj:`str`): the id of the job the application belongs to
+            timeout (:obj:`float`, optional): number of seconds to wait before raising
+                :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
 
         Returns:
             :obj:`None`
         """
-        wait_until_complete.wait_until_job_finished(self._core_job_operations, id)
+        wait_until_complete.wait_until_job_finished(self._core_job_operations, id, timeout)
@@ -1,41 +1,43 @@
 from __future__ import print_function
 
-import datetime
-import time
-
 import azure.batch.models as batch_models
 
-from aztk.utils import constants
+from aztk.error import WaitTimeoutError
+from aztk.utils import constants, waiter
 
 
 class MasterInvalidStateError(Exception):
     pass
 
 
+def _get_master_node_id(core_operations, cluster_id: str):
+    pool = core_operations.batch_client.pool.get(
+        cluster_id, pool_get_options=batch_models.PoolGetOptions(select="metadata"))
+    return next(
+        (metadata.value for metadata in pool.metadata or [] if metadata.name == constants.MASTER_NODE_METADATA_KEY),
+        None)
+
+
 def wait_for_master_to_be_ready(core_operations, spark_operations, cluster_id: str):
+    master = {}
+    node_get_options = batch_models.ComputeNodeGetOptions(select="state")
 
-    master_node_id = None
-    start_time = datetime.datetime.now()
-    while True:
-        if not master_node_id:
-            master_node_id = spark_operations.get(cluster_id).master_node_id
-            if not master_node_id:
-                time.sleep(5)
-                continue
+    def poll():
+        if not master.get("id"):
+            master["id"] = _get_master_node_id(core_operations, cluster_id)
+            if not master["id"]:
+                return False, None
 
-        master_node = core_operations.batch_client.compute_node.get(cluster_id, master_node_id)
+        state = core_operations.batch_client.compute_node.get(
+            cluster_id, master["id"], compute_node_get_options=node_get_options).state
 
-        if master_node.state in [batch_models.ComputeNodeState.idle, batch_models.ComputeNodeState.running]:
-            break
-        elif master_node.state is batch_models.ComputeNodeState.start_task_failed:
+        if state is batch_models.ComputeNodeState.start_task_failed:
             raise MasterInvalidStateError("Start task failed on master")
-        elif master_node.state in [batch_models.ComputeNodeState.unknown, batch_models.ComputeNodeState.unusable]:
+        elif state in [batch_models.ComputeNodeState.unknown, batch_models.ComputeNodeState.unusable]:
             raise MasterInvalidStateError("Master is in an invalid state")
-        else:
-            now = datetime.datetime.now()
-
-            delta = now - start_time
-            if delta.total_seconds() > constants.WAIT_FOR_MASTER_TIMEOUT:
-                raise MasterInvalidStateError("Master didn't become ready before timeout.")
+        return state in [batch_models.ComputeNodeState.idle, batch_models.ComputeNodeState.running], state
 
-            time.sleep(10)
+    try:
+        waiter.Waiter(timeout=constants.WAIT_FOR_MASTER_TIMEOUT).wait(poll, "master of cluster {}".format(cluster_id))
+    except WaitTimeoutError:
+        raise MasterInvalidStateError("Master didn't become ready before timeout.")
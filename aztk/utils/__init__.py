@@ -1,4 +1,5 @@
-from . import (azure_api, command_builder, constants, file_utils, get_ssh_key, helpers, secure_utils)
+from . import (azure_api, blob_upload, command_builder, constants, file_utils, get_ssh_key, helpers, sas, secure_utils,
+               vm_image_cache, waiter)
 from .deprecation import deprecate, deprecated
 from .retry import BackOffPolicy, retry
 from .try_func import try_func
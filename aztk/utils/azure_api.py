@@ -8,8 +8,13 @@ from azure.cosmosdb.table.tableservice import TableService
 from azure.mgmt.batch import BatchManagementClient
 from azure.mgmt.storage import StorageManagementClient
 from azure.storage.common import CloudStorageAccount
+from azure.storage.common.retry import ExponentialRetry
+from msrest.pipeline import HTTPPolicy, Pipeline
+from msrest.pipeline.requests import PipelineRequestsHTTPSender, RequestsCredentialsPolicy, RequestsPatchSession
+from msrest.universal_http.requests import RequestsHTTPSender
 
 from aztk import error
+from aztk.utils import constants
 from aztk.version import __version__
 
 RESOURCE_ID_PATTERN = re.compile("^/subscriptions/(?P<subscription>[^/]+)"
@@ -27,12 +32,13 @@ def validate_secrets(secrets):
             raise error.AzureApiInitError("ServicePrincipal storage_account_resource_id is not in expected format")
 
 
-def make_batch_client(secrets):
+def make_batch_client(secrets, request_governor=None):
     """
         Creates a batch client object
         :param str batch_account_key: batch account key
         :param str batch_account_name: batch account name
         :param str batch_service_url: batch service url
+        :param RequestGovernor request_governor: rate limits and retries the requests of the client
     """
     # Validate the given config
     credentials = None
@@ -67,16 +73,21 @@ def make_batch_client(secrets):
     # Set retry policy
     batch_client.config.retry_policy.retries = 5
     batch_client.config.add_user_agent("aztk/{}".format(__version__))
+    if request_governor:
+        # the client only retries connection errors, the governor retries throttled and failed responses
+        batch_client.config.retry_policy.policy.status_forcelist = []
+        govern_batch_client(batch_client, request_governor)
 
     return batch_client
 
 
-def make_blob_client(secrets):
+def make_blob_client(secrets, request_governor=None):
     """
         Creates a blob client object
         :param str storage_account_key: storage account key
         :param str storage_account_name: storage account name
         :param str storage_account_suffix: storage account suffix
+        :param RequestGovernor request_governor: rate limits and retries the requests of the client
     """
 
     if secrets.shared_key:
@@ -110,10 +121,14 @@ def make_blob_client(secrets):
         storage_client = CloudStorageAccount(accountname, key)
         blob_client = storage_client.create_block_blob_service()
 
+    blob_client.MAX_BLOCK_SIZE = constants.BLOB_UPLOAD_BLOCK_SIZE
+    blob_client.MAX_SINGLE_PUT_SIZE = constants.BLOB_UPLOAD_SINGLE_PUT_SIZE
+    if request_governor:
+        govern_storage_client(blob_client, request_governor, "blob")
     return blob_client
 
 
-def make_table_service(secrets):
+def make_table_service(secrets, request_governor=None):
     if secrets.shared_key:
         table_service = TableService(
             account_name=secrets.shared_key.storage_account_name,
@@ -142,9 +157,71 @@ def make_table_service(secrets):
         ).keys[0].value)
         table_service = TableService(account_name=accountname, account_key=key)
 
+    if request_governor:
+        govern_storage_client(table_service, request_governor, "table")
     return table_service
 
 
+class GovernedBatchPolicy(HTTPPolicy):
+    """Pipeline policy of the batch client that sends its requests through a request governor
+
+    It comes first in the pipeline, so a request sent again is signed again.
+    """
+
+    def __init__(self, request_governor):
+        super().__init__()
+        self.request_governor = request_governor
+
+    def send(self, request, **kwargs):
+        return self.request_governor.send("batch", lambda: self.next.send(request, **kwargs),
+                                          request.http_request.method)
+
+
+def govern_batch_client(batch_client, request_governor):
+    """Replace the pipeline of a batch client with the default msrest pipeline behind a GovernedBatchPolicy"""
+    config = batch_client.config
+    config.pipeline = Pipeline(
+        [
+            GovernedBatchPolicy(request_governor),
+            config.user_agent_policy,
+            RequestsCredentialsPolicy(config.credentials),
+            RequestsPatchSession(),
+            config.http_logger_policy,
+        ],
+        PipelineRequestsHTTPSender(RequestsHTTPSender(config)),
+    )
+
+
+class GovernedStorageRetry(ExponentialRetry):
+    """Retry policy of the storage clients that waits for the delays of a request governor
+
+    Throttled (429) responses of the table service are retried too.
+    """
+
+    def __init__(self, request_governor, service):
+        super().__init__(max_attempts=request_governor.max_retries)
+        self.request_governor = request_governor
+        self.service = service
+
+    def retry(self, context):
+        return self._retry(context, self._backoff)
+
+    def _should_retry(self, context):
+        if context.response is not None and context.response.status == 429:
+            return True
+        return super()._should_retry(context)
+
+    def _backoff(self, context):
+        if not hasattr(context, "retry_state"):
+            context.retry_state = self.request_governor.new_retry_state()
+        return self.request_governor.next_delay(self.service, context.response, context.retry_state)
+
+
+def govern_storage_client(storage_client, request_governor, service):
+    storage_client.retry = GovernedStorageRetry(request_governor, service).retry
+    storage_client.request_callback = lambda request: request_governor.acquire(service)
+
+
 def retry_function(function, retry_attempts: int, retry_interval: int, exception: Exception, *args, **kwargs):
     import time
 
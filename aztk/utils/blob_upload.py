@@ -0,0 +1,156 @@
+import functools
+import threading
+import time
+import weakref
+
+import azure.common
+
+from aztk.utils import constants
+
+# blob client -> names of the containers it created, or found to exist, during the session
+_containers = weakref.WeakKeyDictionary()
+_containers_lock = threading.Lock()
+
+
+class UploadProgress:
+    """Progress of the upload of a blob, passed to progress callbacks
+
+    Attributes:
+        container_name (:obj:`str`): name of the container the blob is uploaded to.
+        blob_name (:obj:`str`): name of the blob.
+        file_path (:obj:`str`): path of the local file uploaded, or None if bytes are uploaded.
+        current (:obj:`int`): number of bytes uploaded so far.
+        total (:obj:`int`): size of the blob in bytes.
+        elapsed (:obj:`float`): number of seconds since the upload started.
+    """
+
+    def __init__(self, container_name: str, blob_name: str, file_path: str = None):
+        self.container_name = container_name
+        self.blob_name = blob_name
+        self.file_path = file_path
+        self.current = 0
+        self.total = None
+        self.elapsed = 0
+        self._start = time.monotonic()
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.current / self.elapsed if self.elapsed else 0
+
+    @property
+    def done(self) -> bool:
+        return self.total is not None and self.current >= self.total
+
+    def _update(self, current, total):
+        self.current = current
+        self.total = total
+        self.elapsed = time.monotonic() - self._start
+
+
+def ensure_container(blob_client, container_name: str):
+    """Create a container unless the client already created it, or found it, during the session"""
+    with _containers_lock:
+        containers = _containers.setdefault(blob_client, set())
+        if container_name in containers:
+            return
+    blob_client.create_container(container_name, fail_on_exist=False)
+    with _containers_lock:
+        containers.add(container_name)
+
+
+def forget_container(blob_client, container_name: str):
+    """Forget that a container exists, when it is deleted"""
+    with _containers_lock:
+        _containers.get(blob_client, set()).discard(container_name)
+
+
+def upload_file(blob_client,
+                container_name: str,
+                blob_name: str,
+                file_path: str,
+                progress_callback=None,
+                max_connections: int = None):
+    """Upload a local file to a blob
+
+    Files larger than the single put size of the client are uploaded in blocks of its block size, on
+    max_connections connections, and the MD5 of every request is verified by the service.
+
+    Args:
+        progress_callback (:obj:`Callable`, optional): called with an
+            :obj:`aztk.utils.blob_upload.UploadProgress` as blocks are uploaded. Defaults to None.
+        max_connections (:obj:`int`, optional): number of blocks uploaded in parallel.
+            Defaults to aztk.utils.constants.BLOB_UPLOAD_CONCURRENCY.
+    """
+    create_blob = functools.partial(
+        blob_client.create_blob_from_path,
+        container_name,
+        blob_name,
+        file_path,
+        max_connections=max_connections or constants.BLOB_UPLOAD_CONCURRENCY)
+    _upload(blob_client, UploadProgress(container_name, blob_name, file_path), progress_callback, create_blob)
+
+
+def upload_bytes(blob_client, container_name: str, blob_name: str, data: bytes, progress_callback=None):
+    """Upload bytes to a blob, see upload_file"""
+    create_blob = functools.partial(
+        blob_client.create_blob_from_bytes,
+        container_name,
+        blob_name,
+        data,
+        max_connections=constants.BLOB_UPLOAD_CONCURRENCY)
+    _upload(blob_client, UploadProgress(container_name, blob_name), progress_callback, create_blob)
+
+
+def upload_stream(blob_client, container_name: str, blob_name: str, stream, count: int = None, progress_callback=None):
+    """Upload a seekable stream to a blob from its current position, see upload_file
+
+    Only one block per connection is read in memory at a time, whatever the size of the stream.
+    """
+    start = stream.tell()
+
+    def create_blob(**kwargs):
+        # rewind, the stream may have been partially read by an attempt on a deleted container
+        stream.seek(start)
+        blob_client.create_blob_from_stream(
+            container_name, blob_name, stream, count=count, max_connections=constants.BLOB_UPLOAD_CONCURRENCY, **kwargs)
+
+    _upload(blob_client, UploadProgress(container_name, blob_name), progress_callback, create_blob)
+
+
+def upload_text(blob_client, container_name: str, blob_name: str, text: str):
+    """Upload text to a blob"""
+    create_blob = functools.partial(blob_client.create_blob_from_text, container_name, blob_name, text)
+    _upload(blob_client, UploadProgress(container_name, blob_name), None, create_blob)
+
+
+def touch(blob_client, container_name: str, blob_name: str) -> bool:
+    """Mark a stored blob as used, which updates its last modified time
+
+    Returns:
+        :obj:`bool`: False if the blob does not exist.
+    """
+    try:
+        blob_client.set_blob_metadata(container_name, blob_name, dict(last_used=str(int(time.time()))))
+    except azure.common.AzureMissingResourceHttpError:
+        return False
+    return True
+
+
+def _upload(blob_client, progress, progress_callback, create_blob):
+    container_name = progress.container_name
+    ensure_container(blob_client, container_name)
+
+    def report(current, total):
+        progress._update(current, total)
+        progress_callback(progress)
+
+    kwargs = dict(validate_content=True)
+    if progress_callback:
+        kwargs["progress_callback"] = report
+    try:
+        create_blob(**kwargs)
+    except azure.common.AzureMissingResourceHttpError:
+        # the container was deleted since the client found it, create it again
+        forget_container(blob_client, container_name)
+        ensure_container(blob_client, container_name)
+        create_blob(**kwargs)
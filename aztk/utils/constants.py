@@ -1,3 +1,4 @@
+import datetime
 import os
 """
     DOCKER
@@ -54,6 +55,143 @@ MASTER_NODE_METADATA_KEY = "_spark_master_node"
     Value: 20 minutes
 """
 WAIT_FOR_MASTER_TIMEOUT = 60 * 20
+"""
+    Number of seconds waiters sleep after a poll that observed a change
+"""
+WAITER_INITIAL_DELAY = 1
+"""
+    Maximum number of seconds waiters sleep between polls while nothing changes
+"""
+WAITER_MAX_DELAY = 15
+"""
+    Number of bytes of command output kept in memory before it is spilled to disk
+    Value: 16 MiB
+"""
+SSH_OUTPUT_SPILL_THRESHOLD = 16 * 1024 * 1024
+"""
+    Number of bytes read at once from each side of a forwarded port
+    Value: 256 KiB
+"""
+SSH_FORWARD_BUFFER_SIZE = 256 * 1024
+"""
+    Number of bytes read or written at once when streaming a copy to or from a container
+    Value: 1 MiB
+"""
+SSH_COPY_BUFFER_SIZE = 1024 * 1024
+"""
+    Size of the chunks files are downloaded in, and number of bytes of chunks requested at once for each file
+"""
+SSH_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+SSH_DOWNLOAD_WINDOW = 16 * 1024 * 1024
+"""
+    Number of bytes of downloaded files kept in memory across all nodes when no destination path is given.
+    Files beyond this budget are downloaded to temporary files on disk.
+    Value: 256 MiB
+"""
+SSH_DOWNLOAD_MEMORY_BUDGET = 256 * 1024 * 1024
+"""
+    Number of times a download is resumed after its connection drops
+"""
+SSH_DOWNLOAD_RETRIES = 3
+"""
+    Number of seconds the user generated to connect to the nodes of a cluster is reused for
+    Value: 1 hour
+"""
+CLUSTER_CREDENTIALS_TTL = 60 * 60
+"""
+    Directory the users generated to connect to the nodes of clusters are kept in, so every process of the user
+    reuses them
+"""
+CLUSTER_CREDENTIALS_PATH = os.path.join(GLOBAL_CONFIG_PATH, "cache", "cluster_credentials")
+"""
+    Number of seconds cached pool, node and cluster configuration metadata is served from memory for
+"""
+METADATA_CACHE_TTL = 30
+"""
+    Maximum number of nodes whose remote login settings are requested concurrently
+"""
+REMOTE_LOGIN_SETTINGS_CONCURRENCY = 32
+"""
+    Maximum number of tasks added to a job in a single request, the limit of the Batch service
+"""
+TASK_ADD_COLLECTION_SIZE = 100
+"""
+    Number of times a task that failed to be added to a job with a server error is retried
+"""
+TASK_ADD_RETRIES = 3
+"""
+    Maximum number of applications whose files are uploaded concurrently when submitting many applications
+"""
+APPLICATION_UPLOAD_CONCURRENCY = 16
+"""
+    Maximum number of blocking Azure calls the async client runs concurrently
+"""
+ASYNC_CLIENT_MAX_WORKERS = 32
+"""
+    Number of seconds between the polls of a status watcher
+"""
+STATUS_WATCHER_INTERVAL = 10
+"""
+    Path of the file the node agent sku and image reference resolved for each VM image are cached in, and number
+    of seconds they are used for
+    Value: 1 day
+"""
+VM_IMAGE_CACHE_PATH = os.path.join(GLOBAL_CONFIG_PATH, "cache", "vm_images.json")
+VM_IMAGE_CACHE_TTL = 24 * 60 * 60
+"""
+    Name of the container application files are stored in, in blobs named after their SHA-256, and path of the
+    file the SHA-256 of local files are indexed in
+"""
+ARTIFACT_CONTAINER_NAME = "aztk-artifacts"
+ARTIFACT_INDEX_PATH = os.path.join(GLOBAL_CONFIG_PATH, "cache", "artifact_index.json")
+"""
+    Size of the chunks files are read in when hashing them
+    Value: 4 MiB
+"""
+ARTIFACT_HASH_CHUNK_SIZE = 4 * 1024 * 1024
+"""
+    Maximum number of files of an application uploaded concurrently
+"""
+ARTIFACT_UPLOAD_CONCURRENCY = 8
+"""
+    Size of the blocks files are uploaded to blob storage in, size under which a file is uploaded in a single
+    request, and number of blocks of a file uploaded in parallel
+    Value: 8 MiB, 16 MiB
+"""
+BLOB_UPLOAD_BLOCK_SIZE = 8 * 1024 * 1024
+BLOB_UPLOAD_SINGLE_PUT_SIZE = 16 * 1024 * 1024
+BLOB_UPLOAD_CONCURRENCY = 8
+"""
+    Size of the node data zip over which it is spooled to a temporary file instead of memory
+    Value: 4 MiB
+"""
+NODE_DATA_SPOOL_SIZE = 4 * 1024 * 1024
+"""
+    Lifetime of the shared access signatures of uploaded files, lifetime of the signatures of the cluster and
+    task definitions that tasks download at any time in the life of their cluster or job, and time a generated
+    signature is reused for
+    Value: 7 days, 365 days, 1 hour
+"""
+SAS_EXPIRY = datetime.timedelta(days=7)
+DEFINITION_SAS_EXPIRY = datetime.timedelta(days=365)
+SAS_MAX_AGE = datetime.timedelta(hours=1)
+"""
+    Maximum number of requests per second a client sends to each service
+"""
+REQUEST_RATES = {"batch": 50, "blob": 200, "table": 200}
+"""
+    Maximum number of times a throttled or failed request to an Azure service is retried
+"""
+REQUEST_MAX_RETRIES = 5
+"""
+    Number of seconds after a request was first sent past which it is not retried anymore
+"""
+REQUEST_DEADLINE = 5 * 60
+"""
+    Minimum and maximum number of seconds between two retries of a request
+"""
+REQUEST_RETRY_BASE_DELAY = 1
+REQUEST_RETRY_MAX_DELAY = 60
 
 AZTK_SOFTWARE_METADATA_KEY = "_aztk_software"
 
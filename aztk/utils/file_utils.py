@@ -1,7 +1,36 @@
+import json
 import os
+import tempfile
 
 
 def ensure_dir(file_path):
     directory = os.path.dirname(file_path)
     if not os.path.exists(directory):
         os.makedirs(directory)
+
+
+def write_json_atomic(path: str, data, directory_mode: int = 0o777):
+    """Write data as JSON to a file readable by the user only, replacing the file in one step
+
+    The data is written to a temporary file of the same directory first, so concurrent processes never read a
+    partial file.
+
+    Args:
+        path (:obj:`str`): path of the file.
+        data: JSON serializable data.
+        directory_mode (:obj:`int`, optional): mode the directory of the file is created with, if it does not exist.
+            Defaults to 0o777.
+
+    Raises:
+        :obj:`OSError`: if the file could not be written.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=directory_mode, exist_ok=True)
+    fd, temporary_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="UTF-8") as stream:
+            json.dump(data, stream)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
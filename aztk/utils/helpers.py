@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import concurrent.futures
 import datetime
 import hashlib
 import io
@@ -15,6 +16,8 @@ import yaml
 
 import aztk.models
 from aztk import error
+from aztk.utils import blob_upload, constants, sas, waiter
+from aztk.utils.vm_image_cache import VmImageCache
 
 _STANDARD_OUT_FILE_NAME = "stdout.txt"
 _STANDARD_ERROR_FILE_NAME = "stderr.txt"
@@ -38,13 +41,7 @@ def wait_for_tasks_to_complete(job_id, batch_client):
     :type batch_client: `batchserviceclient.BatchServiceClient`
     :param str job_id: The id of the job to monitor.
     """
-    while True:
-        tasks = batch_client.task.list(job_id)
-
-        incomplete_tasks = [task for task in tasks if task.state != batch_models.TaskState.completed]
-        if not incomplete_tasks:
-            return
-        time.sleep(5)
+    waiter.wait_for_tasks(batch_client, job_id)
 
 
 def wait_for_task_to_complete(job_id: str, task_id: str, batch_client):
@@ -55,31 +52,69 @@ def wait_for_task_to_complete(job_id: str, task_id: str, batch_client):
     :param str job_id: The id of the job to monitor.
     :param str job_id: The id of the task to monitor.
     """
-    while True:
-        task = batch_client.task.get(job_id=job_id, task_id=task_id)
-        if task.state != batch_models.TaskState.completed:
-            time.sleep(5)
-        else:
+    waiter.wait_for_task(batch_client, job_id, task_id)
+
+
+def add_task_collection(job_id: str, tasks, batch_client, chunk_size: int = None, retries: int = None):
+    """
+    Adds tasks to a job with task.add_collection, in concurrent chunks of at most chunk_size tasks.
+    Tasks that fail with a server error are retried on their own, a chunk that is too large for a
+    single request is split in two.
+    :param str job_id: The id of the job to add the tasks to.
+    :param list tasks: The `batchserviceclient.models.TaskAddParameter` to add.
+    :param batch_client: The batch client to use.
+    :type batch_client: `batchserviceclient.BatchServiceClient`
+    :param int chunk_size: maximum number of tasks per request, defaults to constants.TASK_ADD_COLLECTION_SIZE
+    :param int retries: number of times a task is retried, defaults to constants.TASK_ADD_RETRIES
+    """
+    chunk_size = chunk_size or constants.TASK_ADD_COLLECTION_SIZE
+    retries = constants.TASK_ADD_RETRIES if retries is None else retries
+    tasks = list(tasks)
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    if not chunks:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as executor:
+        for future in [executor.submit(__add_task_chunk, job_id, chunk, batch_client, retries) for chunk in chunks]:
+            future.result()
+
+
+def __add_task_chunk(job_id, tasks, batch_client, retries):
+    tasks_by_id = {task.id: task for task in tasks}
+    pending = tasks
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(2**(attempt - 1))
+        try:
+            results = batch_client.task.add_collection(job_id, pending).value
+        except batch_models.BatchErrorException as e:
+            if e.response is not None and e.response.status_code == 413 and len(pending) > 1:
+                middle = len(pending) // 2
+                __add_task_chunk(job_id, pending[:middle], batch_client, retries)
+                __add_task_chunk(job_id, pending[middle:], batch_client, retries)
+                return
+            raise
+        failed = []
+        for result in results:
+            if result.status == batch_models.TaskAddStatus.server_error:
+                failed.append(tasks_by_id[result.task_id])
+            elif result.status == batch_models.TaskAddStatus.client_error and result.error.code != "TaskExists":
+                # a task that already exists was added by an earlier attempt
+                raise error.AztkError("Failed to add task {}: {}".format(result.task_id, result.error.message))
+        if not failed:
             return
+        pending = failed
+    raise error.AztkError("Failed to add tasks {} after {} retries".format(", ".join(task.id for task in pending),
+                                                                           retries))
 
 
 def upload_text_to_container(container_name: str, application_name: str, content: str, file_path: str,
                              blob_client=None) -> batch_models.ResourceFile:
     blob_name = file_path
     blob_path = application_name + "/" + blob_name    # + '/' + time_stamp + '/' + blob_name
-    blob_client.create_container(container_name, fail_on_exist=False)
-    blob_client.create_blob_from_text(container_name, blob_path, content)
-
-    sas_token = blob_client.generate_blob_shared_access_signature(
-        container_name,
-        blob_path,
-        permission=blob.BlobPermissions.READ,
-        expiry=datetime.datetime.utcnow() + datetime.timedelta(days=365),
-    )
+    blob_upload.upload_text(blob_client, container_name, blob_path, content)
 
-    sas_url = blob_client.make_blob_url(container_name, blob_path, sas_token=sas_token)
-
-    return batch_models.ResourceFile(file_path=blob_name, blob_source=sas_url)
+    return sas.get_sas_provider(blob_client).get_resource_file(container_name, blob_path, blob_name,
+                                                               constants.DEFINITION_SAS_EXPIRY)
 
 
 def upload_file_to_container(container_name,
@@ -110,20 +145,9 @@ def upload_file_to_container(container_name,
     if not node_path:
         node_path = blob_name
 
-    blob_client.create_container(container_name, fail_on_exist=False)
-
-    blob_client.create_blob_from_path(container_name, blob_path, file_path)
-
-    sas_token = blob_client.generate_blob_shared_access_signature(
-        container_name,
-        blob_path,
-        permission=blob.BlobPermissions.READ,
-        expiry=datetime.datetime.utcnow() + datetime.timedelta(days=7),
-    )
+    blob_upload.upload_file(blob_client, container_name, blob_path, file_path)
 
-    sas_url = blob_client.make_blob_url(container_name, blob_path, sas_token=sas_token)
-
-    return batch_models.ResourceFile(file_path=node_path, blob_source=sas_url)
+    return sas.get_sas_provider(blob_client).get_resource_file(container_name, blob_path, node_path)
 
 
 def create_pool_if_not_exist(pool, batch_client):
@@ -169,18 +193,34 @@ def wait_for_all_nodes_state(pool, node_state, batch_client):
         time.sleep(1)
 
 
-def select_latest_verified_vm_image_with_node_agent_sku(publisher, offer, sku_starts_with, batch_client):
+def select_latest_verified_vm_image_with_node_agent_sku(publisher,
+                                                        offer,
+                                                        sku_starts_with,
+                                                        batch_client,
+                                                        cache=None,
+                                                        refresh=False):
     """
     Select the latest verified image that Azure Batch supports given
     a publisher, offer and sku (starts with filter).
+    The result is cached on disk per batch account, see aztk.utils.vm_image_cache.VmImageCache.
     :param batch_client: The batch client to use.
     :type batch_client: `batchserviceclient.BatchServiceClient`
     :param str publisher: vm image publisher
     :param str offer: vm image offer
     :param str sku_starts_with: vm sku starts with filter
+    :param cache: The cache to use, the default cache if None, or False to always query the service.
+    :type cache: `aztk.utils.vm_image_cache.VmImageCache`
+    :param bool refresh: query the service even if the image is cached, and cache the result
     :rtype: tuple
     :return: (node agent sku id to use, vm image ref to use)
     """
+    cache = VmImageCache() if cache is None else cache
+    account = batch_client.config.base_url
+    if cache and not refresh:
+        cached = cache.get(account, publisher, offer, sku_starts_with)
+        if cached:
+            return cached
+
     # get verified vm image list and node agent sku ids from service
     node_agent_skus = batch_client.account.list_node_agent_skus()
 
@@ -193,6 +233,8 @@ def select_latest_verified_vm_image_with_node_agent_sku(publisher, offer, sku_st
 
     # skus are listed in reverse order, pick first for latest
     sku_to_use, image_ref_to_use = skus_to_use[0]
+    if cache:
+        cache.put(account, publisher, offer, sku_starts_with, sku_to_use.id, image_ref_to_use)
     return (sku_to_use.id, image_ref_to_use)
 
 
@@ -233,9 +275,7 @@ def upload_blob_and_create_sas(container_name, blob_name, file_name, expiry, blo
     :return: A SAS URL to the blob with the specified expiry time.
     :rtype: str
     """
-    blob_client.create_container(container_name, fail_on_exist=False)
-
-    blob_client.create_blob_from_path(container_name, blob_name, file_name)
+    blob_upload.upload_file(blob_client, container_name, blob_name, file_name)
 
     sas_token = create_sas_token(
         container_name,
@@ -354,8 +394,7 @@ def save_cluster_config(cluster_config, blob_client):
     blob_path = "config.yaml"
     content = yaml.dump(cluster_config)
     container_name = cluster_config.cluster_id
-    blob_client.create_container(container_name, fail_on_exist=False)
-    blob_client.create_blob_from_text(container_name, blob_path, content)
+    blob_upload.upload_text(blob_client, container_name, blob_path, content)
 
 
 def read_cluster_config(cluster_id: str, blob_client: blob.BlockBlobService):
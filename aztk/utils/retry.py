@@ -1,30 +1,306 @@
+import collections
+import email.utils
 import functools
+import random
+import threading
 import time
 from enum import Enum
 
+from aztk.utils import constants
+
+# status codes of responses that are worth sending again
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+# status codes of responses the services throttle requests with
+THROTTLED_STATUS_CODES = (429, 503)
+# methods of requests that have the same effect when they are sent again
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
 
 class BackOffPolicy(Enum):
     linear = "linear"
     exponential = "exponential"
+    decorrelated_jitter = "decorrelated_jitter"
+
 
+def retry(retry_count=1,
+          retry_interval=0,
+          backoff_policy=BackOffPolicy.linear,
+          exceptions=(),
+          max_interval=None,
+          deadline=None):
+    """Retry the decorated function when it raises one of exceptions
+
+    If the exception has a response with a Retry-After header, the function is retried after the delay the
+    service asked for instead of the delay of the backoff policy.
+
+    Args:
+        retry_count (:obj:`int`, optional): number of times the function is called at most. Defaults to 1.
+        retry_interval (:obj:`float`, optional): base delay of the backoff policy, in seconds. Defaults to 0.
+        backoff_policy (:obj:`aztk.utils.BackOffPolicy`, optional): how the delay grows between calls.
+            Defaults to BackOffPolicy.linear.
+        exceptions (:obj:`tuple`, optional): exceptions the function is retried on. Defaults to ().
+        max_interval (:obj:`float`, optional): maximum delay between two calls with the decorrelated_jitter policy.
+            Defaults to aztk.utils.constants.REQUEST_RETRY_MAX_DELAY.
+        deadline (:obj:`float`, optional): number of seconds after the first call past which the function is not
+            retried anymore. If None, there is no deadline. Defaults to None.
+    """
 
-def retry(retry_count=1, retry_interval=0, backoff_policy=BackOffPolicy.linear, exceptions=()):
     def decorator(function):
         @functools.wraps(function)
         def wrapper(*args, **kwargs):
+            end = time.monotonic() + deadline if deadline is not None else None
+            delay = retry_interval
             for i in range(retry_count - 1):
                 try:
                     return function(*args, **kwargs)
-                except exceptions:
+                except exceptions as e:
                     if backoff_policy == BackOffPolicy.linear:
-                        time.sleep(i * retry_interval)
+                        delay = i * retry_interval
                     if backoff_policy == BackOffPolicy.exponential:
-                        # TODO: enable logger
-                        # log.debug("{} failed, sleeping for".format(function), 2**(i * retry_interval))
-                        time.sleep(2**(i * retry_interval))
+                        delay = 2**(i * retry_interval)
+                    if backoff_policy == BackOffPolicy.decorrelated_jitter:
+                        delay = decorrelated_jitter(retry_interval, delay, max_interval)
+                    retry_after = get_retry_after(getattr(e, "response", None))
+                    if retry_after is not None:
+                        delay = retry_after
+                    if end is not None and time.monotonic() + delay > end:
+                        raise
+                    time.sleep(delay)
             # do not retry on the last iteration
             return function(*args, **kwargs)
 
         return wrapper
 
     return decorator
+
+
+def decorrelated_jitter(base: float, previous: float, cap: float = None) -> float:
+    """Delay before the next retry, drawn between base and three times the previous delay
+
+    Unlike exponential backoff, concurrent callers that failed at the same time do not retry at the same time.
+    """
+    cap = constants.REQUEST_RETRY_MAX_DELAY if cap is None else cap
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+def unwrap_response(response):
+    """The requests response of a msrest pipeline response, or the response itself"""
+    response = getattr(response, "http_response", response)
+    return getattr(response, "internal_response", response)
+
+
+def get_retry_after(response):
+    """Number of seconds a response asks to wait for before sending the request again, or None"""
+    headers = getattr(unwrap_response(response), "headers", None)
+    if not headers:
+        return None
+    # requests headers are case insensitive, storage headers are lower case
+    headers = {key.lower(): value for key, value in headers.items()}
+    milliseconds = headers.get("retry-after-ms") or headers.get("x-ms-retry-after-ms")
+    if milliseconds is not None:
+        try:
+            return max(float(milliseconds) / 1000, 0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    # the header is either a number of seconds or an HTTP date
+    date = email.utils.parsedate_tz(value)
+    return max(email.utils.mktime_tz(date) - time.time(), 0) if date else None
+
+
+def get_status_code(response):
+    """Status code of a requests, msrest pipeline or storage response, or None"""
+    response = unwrap_response(response)
+    status = getattr(response, "status_code", None)
+    return getattr(response, "status", None) if status is None else status
+
+
+def is_retryable(response, method: str = None) -> bool:
+    """Whether the request a response answers is worth sending again
+
+    A request that is not idempotent may have been carried out by a failed response, so it is only sent again when
+    it was throttled with a Retry-After header, which means it was not carried out.
+
+    Args:
+        response: the response to the request.
+        method (:obj:`str`, optional): HTTP method of the request. If None, the request is treated as idempotent.
+    """
+    status = get_status_code(response)
+    if method is None or method.upper() in IDEMPOTENT_METHODS:
+        return status in RETRYABLE_STATUS_CODES
+    return status in THROTTLED_STATUS_CODES and get_retry_after(response) is not None
+
+
+class TokenBucket:
+    """Lets through at most `rate` requests per second on average, and bursts of up to `capacity` requests
+
+    Args:
+        rate (:obj:`float`): number of tokens added per second. If None, requests are never delayed.
+        capacity (:obj:`float`, optional): maximum number of tokens. Defaults to rate.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available"""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every request for the given number of seconds, when the service throttles"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RequestCounters:
+    """Number of requests sent to a service, and of those that were throttled, retried or given up on"""
+
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.retried = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self):
+        return dict(requests=self.requests, throttled=self.throttled, retried=self.retried, failed=self.failed)
+
+
+class RetryState:
+    """Retries of one request: number of attempts, previous delay and the time past which it is not retried"""
+
+    def __init__(self, deadline: float, base_delay: float):
+        self.attempts = 0
+        self.delay = base_delay
+        self.deadline = time.monotonic() + deadline
+
+
+class RequestGovernor:
+    """Rate limits and retries the requests a client sends to the Azure services
+
+    Every service has a token bucket shared by all the threads of the client, so a fan out across many clusters
+    does not send more than `rates[service]` requests per second. Retryable responses are retried with decorrelated
+    jitter, or after the delay of their Retry-After header, but requests that are not idempotent are only retried when
+    they were throttled. A throttled response holds every request to its service for that delay, so concurrent
+    callers do not retry all at once. A request is not retried past `deadline` seconds after it was first sent.
+
+    Args:
+        rates (:obj:`dict`, optional): maximum number of requests per second, by service name.
+            Defaults to aztk.utils.constants.REQUEST_RATES.
+        max_retries (:obj:`int`, optional): maximum number of times a request is retried.
+            Defaults to aztk.utils.constants.REQUEST_MAX_RETRIES.
+        deadline (:obj:`float`, optional): number of seconds after which a request is not retried anymore.
+            Defaults to aztk.utils.constants.REQUEST_DEADLINE.
+    """
+
+    def __init__(self, rates: dict = None, max_retries: int = None, deadline: float = None):
+        self.rates = dict(constants.REQUEST_RATES, **(rates or {}))
+        self.max_retries = constants.REQUEST_MAX_RETRIES if max_retries is None else max_retries
+        self.deadline = constants.REQUEST_DEADLINE if deadline is None else deadline
+        self.base_delay = constants.REQUEST_RETRY_BASE_DELAY
+        self.max_delay = constants.REQUEST_RETRY_MAX_DELAY
+        self._buckets = {}
+        self._counters = collections.defaultdict(RequestCounters)
+        self._lock = threading.Lock()
+
+    def bucket(self, service: str) -> TokenBucket:
+        with self._lock:
+            if service not in self._buckets:
+                self._buckets[service] = TokenBucket(self.rates.get(service))
+            return self._buckets[service]
+
+    def counters(self, service: str) -> RequestCounters:
+        with self._lock:
+            return self._counters[service]
+
+    def get_counters(self):
+        """Counters of every service, as a dict of service name to dict of counter name to value"""
+        with self._lock:
+            return {service: counters.to_dict() for service, counters in self._counters.items()}
+
+    def acquire(self, service: str):
+        """Wait for the rate limit of the service to let a request through"""
+        self.bucket(service).acquire()
+        self.counters(service).increment("requests")
+
+    def new_retry_state(self) -> RetryState:
+        return RetryState(self.deadline, self.base_delay)
+
+    def next_delay(self, service: str, response, state: RetryState):
+        """Number of seconds to wait for before sending a request again, or None if it must not be retried
+
+        Args:
+            service (:obj:`str`): name of the service the request was sent to.
+            response: the response to the request, or None if no response was received.
+            state (:obj:`aztk.utils.retry.RetryState`): retries of the request so far.
+        """
+        counters = self.counters(service)
+        status = get_status_code(response)
+        retry_after = get_retry_after(response)
+        if status in THROTTLED_STATUS_CODES:
+            counters.increment("throttled")
+            if retry_after is not None:
+                self.bucket(service).pause(retry_after)
+        state.delay = retry_after if retry_after is not None else decorrelated_jitter(
+            self.base_delay, state.delay, self.max_delay)
+        state.attempts += 1
+        if state.attempts > self.max_retries or time.monotonic() + state.delay > state.deadline:
+            counters.increment("failed")
+            return None
+        counters.increment("retried")
+        return state.delay
+
+    def send(self, service: str, send, method: str = None):
+        """Call send, a function that sends a request and returns its response, retrying retryable responses
+
+        Requests whose method is not idempotent are only retried when they were throttled, see is_retryable.
+        The last response is returned when the request must not be retried anymore.
+
+        Args:
+            service (:obj:`str`): name of the service the request is sent to.
+            send (:obj:`Callable`): sends the request and returns its response.
+            method (:obj:`str`, optional): HTTP method of the request. If None, the request is treated as
+                idempotent.
+        """
+        state = self.new_retry_state()
+        while True:
+            self.acquire(service)
+            response = send()
+            if not is_retryable(response, method):
+                return response
+            delay = self.next_delay(service, response, state)
+            if delay is None:
+                return response
+            # release the connection of the streamed response before sending again
+            raw_response = unwrap_response(response)
+            if hasattr(raw_response, "close"):
+                raw_response.close()
+            time.sleep(delay)
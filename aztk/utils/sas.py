@@ -0,0 +1,99 @@
+import datetime
+import threading
+import weakref
+
+import azure.batch.models as batch_models
+from azure.storage.blob import BlobPermissions, ContainerPermissions
+
+from aztk.utils import constants
+
+# blob client -> its SAS provider
+_providers = weakref.WeakKeyDictionary()
+_providers_lock = threading.Lock()
+
+
+class SasProvider:
+    """Generates, and caches, the shared access signatures of the blobs of a storage account
+
+    Tokens are cached per blob, or per container for container scoped tokens, permission and expiry. A cached token
+    is only reused for `max_age` after it was generated, so every token handed out stays valid for at least its
+    expiry minus `max_age`. By default, each resource file gets a read token of its own blob only.
+
+    Args:
+        blob_client (:obj:`azure.storage.blob.BlockBlobService`): client of the storage account.
+        expiry (:obj:`datetime.timedelta`, optional): lifetime of the generated tokens, when not given per token.
+            Defaults to aztk.utils.constants.SAS_EXPIRY.
+        max_age (:obj:`datetime.timedelta`, optional): time a generated token is reused for.
+            Defaults to aztk.utils.constants.SAS_MAX_AGE.
+        container_scope (:obj:`bool`, optional): If True, resource files use a read token of their whole container,
+            else a token of their blob only. A container token grants read access to every blob of the container,
+            so only opt in if the containers resource files are uploaded to hold no secrets. Defaults to False.
+    """
+
+    def __init__(self,
+                 blob_client,
+                 expiry: datetime.timedelta = None,
+                 max_age: datetime.timedelta = None,
+                 container_scope: bool = False):
+        self.blob_client = blob_client
+        self.expiry = expiry or constants.SAS_EXPIRY
+        self.max_age = max_age or constants.SAS_MAX_AGE
+        self.container_scope = container_scope
+        # (container, blob or None, permission, expiry) -> (token, generation time)
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get_container_sas(self,
+                          container_name: str,
+                          permission=ContainerPermissions.READ,
+                          expiry: datetime.timedelta = None) -> str:
+        """Get a token granting permission on every blob of a container"""
+        expiry = expiry or self.expiry
+        return self._get((container_name, None, str(permission), expiry),
+                         lambda now: self.blob_client.generate_container_shared_access_signature(
+                             container_name, permission=permission, expiry=now + expiry))
+
+    def get_blob_sas(self,
+                     container_name: str,
+                     blob_name: str,
+                     permission=BlobPermissions.READ,
+                     expiry: datetime.timedelta = None) -> str:
+        """Get a token granting permission on a single blob"""
+        expiry = expiry or self.expiry
+        return self._get((container_name, blob_name, str(permission), expiry),
+                         lambda now: self.blob_client.generate_blob_shared_access_signature(
+                             container_name, blob_name, permission=permission, expiry=now + expiry))
+
+    def get_blob_url(self, container_name: str, blob_name: str, expiry: datetime.timedelta = None) -> str:
+        """Get a read only URL of a blob"""
+        if self.container_scope:
+            sas_token = self.get_container_sas(container_name, expiry=expiry)
+        else:
+            sas_token = self.get_blob_sas(container_name, blob_name, expiry=expiry)
+        return self.blob_client.make_blob_url(container_name, blob_name, sas_token=sas_token)
+
+    def get_resource_file(self, container_name: str, blob_name: str, file_path: str,
+                          expiry: datetime.timedelta = None) -> batch_models.ResourceFile:
+        """Get a resource file that downloads a blob to file_path on the node"""
+        return batch_models.ResourceFile(
+            file_path=file_path, blob_source=self.get_blob_url(container_name, blob_name, expiry))
+
+    def _get(self, key, generate):
+        now = datetime.datetime.utcnow()
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached and now - cached[1] < self.max_age:
+            return cached[0]
+        token = generate(now)
+        with self._lock:
+            self._tokens[key] = (token, now)
+        return token
+
+
+def get_sas_provider(blob_client) -> SasProvider:
+    """Get the SAS provider shared by every user of a blob client"""
+    with _providers_lock:
+        provider = _providers.get(blob_client)
+        if provider is None:
+            provider = _providers[blob_client] = SasProvider(blob_client)
+        return provider
@@ -2,71 +2,271 @@
     SSH utils
 """
 import asyncio
+import collections
+import contextlib
+import functools
+import hashlib
 import io
 import logging
 import os
-import select
+import posixpath
+import queue
+import selectors
+import shlex
+import shutil
 import socket
-import socketserver as SocketServer
+import tarfile
+import tempfile
 import threading
+import time
+import uuid
 from concurrent.futures import ThreadPoolExecutor
 
+from Cryptodome.PublicKey import RSA
+
 from aztk.error import AztkError
-from aztk.models import NodeOutput
+from aztk.models import NodeOutput, SSHLog
+from aztk.utils import constants
+
 
+class _Pipe:
+    """One direction of a forwarded connection"""
 
-class ForwardServer(SocketServer.ThreadingTCPServer):
-    daemon_threads = True
-    allow_reuse_address = True
+    def __init__(self, source, destination, buffer_size):
+        self.source = source
+        self.destination = destination
+        self.buffer_size = buffer_size
+        # sockets read into a preallocated buffer, paramiko channels only return new bytes objects
+        self.buffer = bytearray(buffer_size) if hasattr(source, "recv_into") else None
+        self.pending = None
+        self.eof = False
+        self.paused = False
+        self.connection = None
 
+    @property
+    def done(self):
+        return self.eof and not self.pending
 
-# pylint: disable=no-member
-class Handler(SocketServer.BaseRequestHandler):
-    def handle(self):
+    def read(self):
         try:
-            channel = self.ssh_transport.open_channel("direct-tcpip",
-                                                      (self.chain_host, self.chain_port), self.request.getpeername())
+            if self.buffer is not None:
+                size = self.source.recv_into(self.buffer)
+                data = memoryview(self.buffer)[:size]
+            else:
+                data = memoryview(self.source.recv(self.buffer_size))
+        except (BlockingIOError, socket.timeout):
+            return
+        if data:
+            self.pending = data
+        else:
+            self.eof = True
+        self.flush()
+
+    def flush(self):
+        while self.pending:
+            try:
+                sent = self.destination.send(self.pending)
+            except (BlockingIOError, socket.timeout):
+                return
+            if sent == 0:
+                raise ConnectionError("Forwarded connection closed")
+            self.pending = self.pending[sent:]
+        self.pending = None
+        if self.eof:
+            if hasattr(self.destination, "shutdown_write"):
+                self.destination.shutdown_write()
+            else:
+                self.destination.shutdown(socket.SHUT_WR)
+
+
+class PortForwarder:
+    """Forward local ports to remote hosts through a single SSH transport
+
+    All tunnels and all of their connections are served by one selector thread. Data is read in large blocks and
+    sent with memoryviews, and a side of a connection is not read again until what was read from it has been
+    written to the other side.
+
+    Args:
+        transport (:obj:`paramiko.Transport`): the transport to open the forwarded channels on.
+        buffer_size (:obj:`int`, optional): maximum number of bytes read at once from each side of a connection.
+            Defaults to aztk.utils.constants.SSH_FORWARD_BUFFER_SIZE.
+        poll_interval (:obj:`float`, optional): seconds between retries of writes to a full SSH window.
+            Defaults to 0.005.
+    """
+
+    def __init__(self, transport, buffer_size=None, poll_interval=0.005):
+        self.transport = transport
+        self.buffer_size = buffer_size or constants.SSH_FORWARD_BUFFER_SIZE
+        self.poll_interval = poll_interval
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ, None)
+        self._listeners = []
+        self._connections = set()
+        self._closed = False
+        self._thread = None
+
+    def add_forward(self, local_port, remote_host, remote_port, bind_address=""):
+        """Listen on local_port and forward every connection to remote_host:remote_port
+
+        Returns:
+            :obj:`int`: the local port that is listened on, useful when local_port is 0
+        """
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((bind_address, local_port))
+        listener.listen(128)
+        listener.setblocking(False)
+        with self._lock:
+            self._listeners.append(listener)
+            self._selector.register(listener, selectors.EVENT_READ, (remote_host, remote_port))
+        self._wakeup()
+        return listener.getsockname()[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def close(self):
+        self._closed = True
+        self._wakeup()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def _serve(self):
+        try:
+            while not self._closed:
+                blocked = any(pipe.pending for connection in self._connections for pipe in connection)
+                events = self._selector.select(self.poll_interval if blocked else None)
+                for key, _ in events:
+                    if key.data is None:
+                        self._wakeup_reader.recv(4096)
+                    elif isinstance(key.data, _Pipe):
+                        self._step(key.data, key.data.read)
+                    else:
+                        self._accept(key.fileobj, *key.data)
+                for connection in list(self._connections):
+                    for pipe in connection:
+                        if pipe.pending:
+                            self._step(pipe, pipe.flush)
+        finally:
+            for connection in list(self._connections):
+                self._close_connection(connection)
+            for listener in self._listeners:
+                listener.close()
+            self._selector.close()
+            self._wakeup_reader.close()
+            self._wakeup_writer.close()
+
+    def _accept(self, listener, remote_host, remote_port):
+        try:
+            sock, peer = listener.accept()
+        except BlockingIOError:
+            return
+        try:
+            channel = self.transport.open_channel("direct-tcpip", (remote_host, remote_port), peer)
         except Exception as e:
-            logging.debug("Incoming request to %s:%d failed: %s", self.chain_host, self.chain_port, repr(e))
+            logging.debug("Incoming request to %s:%d failed: %s", remote_host, remote_port, repr(e))
+            sock.close()
             return
         if channel is None:
-            logging.debug("Incoming request to %s:%d was rejected by the SSH server.", self.chain_host, self.chain_port)
+            logging.debug("Incoming request to %s:%d was rejected by the SSH server.", remote_host, remote_port)
+            sock.close()
             return
+        logging.debug("Connected!  Tunnel open %r -> %r", peer, (remote_host, remote_port))
 
-        logging.debug(
-            "Connected!  Tunnel open %r -> %r -> %r",
-            self.request.getpeername(),
-            channel.getpeername(),
-            (self.chain_host, self.chain_port),
-        )
-        while True:
-            r, _, _ = select.select([self.request, channel], [], [])
-            if self.request in r:
-                data = self.request.recv(1024)
-                if not data:
-                    break
-                channel.send(data)
-            if channel in r:
-                data = channel.recv(1024)
-                if not data:
-                    break
-                self.request.send(data)
-
-        peername = self.request.getpeername()
-        channel.close()
-        self.request.close()
-        logging.debug("Tunnel closed from %r", peername)
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        channel.setblocking(False)
+        connection = (_Pipe(sock, channel, self.buffer_size), _Pipe(channel, sock, self.buffer_size))
+        self._connections.add(connection)
+        for pipe in connection:
+            pipe.connection = connection
+            self._selector.register(pipe.source, selectors.EVENT_READ, pipe)
+
+    def _step(self, pipe, operation):
+        connection = pipe.connection
+        if connection not in self._connections:
+            return
+        try:
+            operation()
+        except OSError as e:
+            logging.debug("Tunnel closed: %s", repr(e))
+            self._close_connection(connection)
+            return
+        # stop reading a side until its data has been written, or for good once it reached the end
+        should_pause = bool(pipe.pending) or pipe.eof
+        if should_pause != pipe.paused:
+            if should_pause:
+                self._selector.unregister(pipe.source)
+            elif not pipe.eof:
+                self._selector.register(pipe.source, selectors.EVENT_READ, pipe)
+            pipe.paused = should_pause
+        if all(pipe.done for pipe in connection):
+            self._close_connection(connection)
+
+    def _close_connection(self, connection):
+        if connection not in self._connections:
+            return
+        self._connections.remove(connection)
+        for pipe in connection:
+            if not pipe.paused:
+                self._selector.unregister(pipe.source)
+            pipe.source.close()
 
 
 def forward_tunnel(local_port, remote_host, remote_port, transport):
-    class SubHandler(Handler):
-        chain_host = remote_host
-        chain_port = remote_port
-        ssh_transport = transport
+    forwarder = PortForwarder(transport)
+    forwarder.add_forward(local_port, remote_host, remote_port)
+    return forwarder.start()
 
-    thread = threading.Thread(target=ForwardServer(("", local_port), SubHandler).serve_forever, daemon=True)
-    thread.start()
-    return thread
+
+@functools.lru_cache(maxsize=32)
+def _load_private_key(pkey):
+    import paramiko
+
+    return paramiko.RSAKey.from_private_key(file_obj=io.StringIO(pkey))
+
+
+# Deadline, as a time.time() timestamp, of the node call running on the current thread, set by NodeExecutor
+_call_deadline = threading.local()
+
+
+def _call_timeout(timeout=None):
+    """Timeout of a blocking operation of the current node call
+
+    Returns timeout, capped to the time left before the deadline NodeExecutor set for the call running on this
+    thread, so calls that outlive their node timeout fail and free their worker. Raises socket.timeout if the
+    deadline has passed.
+    """
+    deadline = getattr(_call_deadline, "value", None)
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise socket.timeout("node call exceeded its deadline")
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _open_session(client, timeout=None):
+    channel = client.get_transport().open_session()
+    channel.settimeout(_call_timeout(timeout))
+    return channel
+
+
+def _open_sftp(client):
+    sftp_client = client.open_sftp()
+    sftp_client.get_channel().settimeout(_call_timeout())
+    return sftp_client
 
 
 def connect(hostname, port=22, username=None, password=None, pkey=None, timeout=None):
@@ -76,13 +276,13 @@ def connect(hostname, port=22, username=None, password=None, pkey=None, timeout=
     client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
     if pkey:
-        ssh_key = paramiko.RSAKey.from_private_key(file_obj=io.StringIO(pkey))
+        ssh_key = _load_private_key(pkey)
     else:
         ssh_key = None
 
-    timeout = timeout or 20
-    logging.debug("Connecting to %s@%s:%d, timeout=%d", username, hostname, port, timeout)
     try:
+        timeout = _call_timeout(timeout or 20)
+        logging.debug("Connecting to %s@%s:%d, timeout=%d", username, hostname, port, timeout)
         client.connect(hostname, port=port, username=username, password=password, pkey=ssh_key, timeout=timeout)
     except socket.timeout:
         raise AztkError("Connection timed out to: {}".format(hostname))
@@ -90,20 +290,298 @@ def connect(hostname, port=22, username=None, password=None, pkey=None, timeout=
     return client
 
 
+def _is_alive(client):
+    transport = client.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+    try:
+        transport.send_ignore()
+    except Exception:    # SSHException, EOFError or socket errors on a dead transport
+        return False
+    return True
+
+
+class _PooledConnection:
+    def __init__(self, client):
+        self.client = client
+        self.in_use = 0
+        self.last_used = time.time()
+
+
+class ConnectionPool:
+    """Pool of open SSH connections shared by all operations of a client
+
+    Connections are keyed by (hostname, port, username, credential fingerprint), so successive
+    operations on the same node with the same credentials reuse one SSH transport instead of
+    doing a new handshake. Every operation opens its own channel on the shared transport.
+
+    Args:
+        max_idle_time (:obj:`int`, optional): number of seconds an unused connection is kept open.
+            Defaults to 300.
+    """
+
+    def __init__(self, max_idle_time: int = 300):
+        self.max_idle_time = max_idle_time
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(hostname, port, username, password, pkey):
+        credential = pkey or password or ""
+        fingerprint = hashlib.sha256(credential.encode("utf-8")).hexdigest()
+        return (hostname, int(port), username, fingerprint)
+
+    def acquire(self, hostname, port=22, username=None, password=None, pkey=None, timeout=None):
+        """Get an open connection to the host, connecting only if no healthy connection is pooled"""
+        self.evict_idle()
+        key = self._key(hostname, port, username, password, pkey)
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is not None:
+                entry.in_use += 1
+
+        if entry is not None:
+            if _is_alive(entry.client):
+                return entry.client
+            with self._lock:
+                entry.in_use -= 1
+                if self._connections.get(key) is entry:
+                    del self._connections[key]
+            entry.client.close()
+
+        client = connect(hostname=hostname, port=port, username=username, password=password, pkey=pkey, timeout=timeout)
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is None:
+                entry = self._connections[key] = _PooledConnection(client)
+                entry.in_use += 1
+                return client
+            # another thread connected to the same host in the meantime
+            entry.in_use += 1
+        client.close()
+        return entry.client
+
+    def release(self, client):
+        """Return a connection obtained with :meth:`acquire` to the pool"""
+        with self._lock:
+            for entry in self._connections.values():
+                if entry.client is client:
+                    entry.in_use -= 1
+                    entry.last_used = time.time()
+                    return
+        # the connection was evicted while in use
+        client.close()
+
+    @contextlib.contextmanager
+    def connection(self, hostname, port=22, username=None, password=None, pkey=None, timeout=None):
+        client = self.acquire(hostname, port, username, password, pkey, timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def evict_idle(self):
+        """Close connections that have not been used for more than max_idle_time seconds"""
+        now = time.time()
+        self._evict(lambda key, entry: not entry.in_use and now - entry.last_used > self.max_idle_time)
+
+    def evict_user(self, username: str):
+        """Close all connections authenticated as the given user, e.g. after the user was deleted"""
+        self._evict(lambda key, entry: key[2] == username)
+
+    def close(self):
+        """Close all pooled connections"""
+        self._evict(lambda key, entry: True)
+
+    def _evict(self, predicate):
+        with self._lock:
+            evicted = [(key, entry) for key, entry in self._connections.items() if predicate(key, entry)]
+            for key, _ in evicted:
+                del self._connections[key]
+        for _, entry in evicted:
+            if not entry.in_use:
+                entry.client.close()
+
+    def __len__(self):
+        return len(self._connections)
+
+
+class NodeExecutor:
+    """Bounded executor used to fan an operation out to every node of a cluster
+
+    All fan-outs of a client share a single thread pool. At most `max_in_flight` node operations run at
+    the same time, and a node that does not answer within `node_timeout` seconds of its operation starting
+    gets a NodeOutput with a timeout error, so the results of the other nodes are still returned. The SSH
+    operations of a timed out node fail at the same deadline, so they do not keep holding a worker. Each NodeOutput records the
+    time the node took in its `latency` attribute. Set `max_in_flight` before the executor is first used.
+
+    Args:
+        max_in_flight (:obj:`int`, optional): maximum number of nodes operated on concurrently. Defaults to 32.
+        node_timeout (:obj:`int`, optional): number of seconds to wait for a single node before giving up on it.
+            If None, wait indefinitely. Defaults to None.
+    """
+
+    def __init__(self, max_in_flight: int = 32, node_timeout: int = None):
+        self.max_in_flight = max_in_flight
+        self.node_timeout = node_timeout
+        self._executor = None
+        self._lock = threading.Lock()
+
+    async def map(self, nodes, make_call):
+        """Run `make_call(node, node_rls)()` for every (node, remote login settings) pair in nodes
+
+        Returns:
+            :obj:`List[aztk.models.NodeOutput]`: the output of every node, in the order of nodes
+        """
+        self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        return await asyncio.gather(
+            *[self._run(semaphore, node.id, make_call(node, node_rls)) for node, node_rls in nodes])
+
+    async def _run(self, semaphore, node_id, call):
+        loop = asyncio.get_event_loop()
+        timing = {}
+        started = asyncio.Event()
+
+        def timed_call():
+            timing["start"] = time.time()
+            loop.call_soon_threadsafe(started.set)
+            try:
+                return self._call_with_deadline(call, timing["start"])
+            finally:
+                timing["end"] = time.time()
+
+        async with semaphore:
+            queued = time.time()
+            future = loop.run_in_executor(self._executor, timed_call)
+            # the node timeout only runs from when the call starts, not while it waits for a worker
+            start_waiter = asyncio.ensure_future(started.wait())
+            await asyncio.wait([future, start_waiter], return_when=asyncio.FIRST_COMPLETED)
+            start_waiter.cancel()
+            try:
+                output = await asyncio.wait_for(future, self.node_timeout)
+            except asyncio.TimeoutError:
+                message = "Node {} did not finish within {} seconds".format(node_id, self.node_timeout)
+                output = NodeOutput(node_id, None, AztkError(message))
+        output.latency = timing.get("end", time.time()) - timing.get("start", queued)
+        return output
+
+    def _call_with_deadline(self, call, start):
+        """Run call with the deadline of its node timeout set, so its blocking SSH operations time out with it"""
+        _call_deadline.value = None if self.node_timeout is None else start + self.node_timeout
+        try:
+            return call()
+        finally:
+            _call_deadline.value = None
+
+    def imap(self, nodes, make_call):
+        """Run `make_call(node, node_rls, emit)()` for every node and yield each NodeOutput as soon as it is ready
+
+        Objects a call passes to `emit` are yielded as they are produced. Outputs are yielded in completion
+        order, and nodes that exceed `node_timeout` are yielded with a timeout error.
+        """
+        executor = self._get_executor()
+        events = queue.Queue()
+        started = {}
+        pending = set()
+
+        def timed_call(node_id, call):
+            started[node_id] = time.time()
+            try:
+                output = self._call_with_deadline(call, started[node_id])
+            except Exception as e:
+                output = NodeOutput(node_id, None, e)
+            output.latency = time.time() - started[node_id]
+            events.put((node_id, True, output))
+
+        for node, node_rls in nodes:
+            emit = functools.partial(lambda node_id, item: events.put((node_id, False, item)), node.id)
+            pending.add(node.id)
+            executor.submit(timed_call, node.id, make_call(node, node_rls, emit))
+
+        while pending:
+            try:
+                node_id, done, item = events.get(timeout=self._poll_interval(started, pending))
+            except queue.Empty:
+                yield from self._expire(started, pending)
+                continue
+            if node_id not in pending:
+                # the node already timed out
+                continue
+            if done:
+                pending.remove(node_id)
+            yield item
+
+    def _poll_interval(self, started, pending):
+        if self.node_timeout is None:
+            return None
+        deadlines = [started[node_id] + self.node_timeout for node_id in pending if node_id in started]
+        if not deadlines:
+            return self.node_timeout
+        return max(min(deadlines) - time.time(), 0.01)
+
+    def _expire(self, started, pending):
+        now = time.time()
+        for node_id in [node_id for node_id in pending if node_id in started]:
+            if now - started[node_id] >= self.node_timeout:
+                pending.remove(node_id)
+                message = "Node {} did not finish within {} seconds".format(node_id, self.node_timeout)
+                yield NodeOutput(node_id, None, AztkError(message), latency=now - started[node_id])
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+            return self._executor
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+async def _map_nodes(node_executor, nodes, make_call):
+    if node_executor is not None:
+        return await node_executor.map(nodes, make_call)
+    node_executor = NodeExecutor(max_in_flight=max(len(nodes), 1))
+    try:
+        return await node_executor.map(nodes, make_call)
+    finally:
+        node_executor.shutdown(wait=False)
+
+
+@contextlib.contextmanager
+def _open_connection(connection_pool, hostname, port, username, password=None, pkey=None, timeout=None):
+    if connection_pool is None:
+        client = connect(hostname=hostname, port=port, username=username, password=password, pkey=pkey, timeout=timeout)
+        try:
+            yield client
+        finally:
+            client.close()
+    else:
+        with connection_pool.connection(hostname, port, username, password, pkey, timeout) as client:
+            yield client
+
+
 def forward_ports(client, port_forward_list):
-    threads = []
+    """Forward every port in port_forward_list over the transport of client
+
+    Returns:
+        :obj:`PortForwarder`: the running forwarder serving all of the ports, or None if there is nothing to forward
+    """
     if not port_forward_list:
-        return threads
+        return None
 
+    forwarder = PortForwarder(client.get_transport())
     for port_forwarding_specification in port_forward_list:
-        threads.append(
-            forward_tunnel(
-                port_forwarding_specification.remote_port,
-                "127.0.0.1",
-                port_forwarding_specification.local_port,
-                client.get_transport(),
-            ))
-    return threads
+        forwarder.add_forward(
+            port_forwarding_specification.remote_port,
+            "127.0.0.1",
+            port_forwarding_specification.local_port,
+        )
+    forwarder.start()
+    return forwarder
 
 
 def node_exec_command(node_id,
@@ -115,12 +593,12 @@ def node_exec_command(node_id,
                       password=None,
                       container_name=None,
                       timeout=None,
-                      block=True):
-    try:
-        client = connect(
-            hostname=hostname, port=port, username=username, password=password, pkey=ssh_key, timeout=timeout)
-    except AztkError as e:
-        return NodeOutput(node_id, None, e)
+                      block=True,
+                      connection_pool=None,
+                      on_line=None,
+                      max_output_size=None,
+                      spill_threshold=None,
+                      spill_output=False):
     if container_name:
         if not block:
             cmd = "sudo docker exec 2>&1 -td {0} /bin/bash -c 'set -e -o pipefail; {1};'".format(
@@ -130,12 +608,164 @@ def node_exec_command(node_id,
     else:
         cmd = "/bin/bash 2>&1 -c 'set -e -o pipefail; {0};'".format(command)
 
-    _, stdout, _ = client.exec_command(cmd, timeout=timeout)
-    return_code = stdout.channel.recv_exit_status()
+    try:
+        with _open_connection(connection_pool, hostname, port, username, password, ssh_key, timeout) as client:
+            channel = _open_session(client, timeout)
+            channel.set_combine_stderr(True)
+            channel.exec_command(cmd)
+            capture = OutputCapture(max_size=max_output_size, spill_threshold=spill_threshold)
+            try:
+                _drain_channel(channel, capture, on_line)
+                channel.recv_exit_status()
+            finally:
+                channel.close()
+            output = capture.result(spill=spill_output)
+            if isinstance(output, str):
+                return NodeOutput(node_id, output, None)
+            return NodeOutput(node_id, None, None, output_file=output)
+    except (AztkError, socket.timeout) as e:
+        return NodeOutput(node_id, None, e)
+
+
+def node_exec_script(node_id,
+                     script,
+                     username,
+                     hostname,
+                     port,
+                     ssh_key=None,
+                     password=None,
+                     container_name=None,
+                     timeout=None,
+                     connection_pool=None,
+                     max_output_size=None):
+    """Run a bash script on a node, sending it on the standard input of bash
+
+    Unlike a command, the script is not limited by the maximum length of a command line.
+    """
+    if container_name:
+        cmd = "sudo docker exec -i {0} /bin/bash -s".format(container_name)
+    else:
+        cmd = "/bin/bash -s"
+
+    try:
+        with _open_connection(connection_pool, hostname, port, username, password, ssh_key, timeout) as client:
+            channel = _open_session(client, timeout)
+            try:
+                channel.set_combine_stderr(True)
+                channel.exec_command(cmd)
+                channel.sendall(script.encode("utf-8"))
+                channel.shutdown_write()
+                capture = OutputCapture(max_size=max_output_size)
+                _drain_channel(channel, capture)
+                exit_status = channel.recv_exit_status()
+            finally:
+                channel.close()
+            output = capture.result()
+            if exit_status != 0:
+                return NodeOutput(node_id, output, AztkError("Script exited with status {}".format(exit_status)))
+            return NodeOutput(node_id, output, None)
+    except (AztkError, socket.timeout) as e:
+        return NodeOutput(node_id, None, e)
+
+
+def _drain_channel(channel, capture, on_line=None, chunk_size=32768):
+    """Read the channel until the remote command closes it
+
+    Reading concurrently with the command, rather than after waiting for its exit status, keeps the SSH
+    window open so commands that write more than a window of output cannot stall.
+    """
+    partial_line = b""
+    while True:
+        _call_timeout()
+        data = channel.recv(chunk_size)
+        if not data:
+            break
+        capture.write(data)
+        if on_line:
+            partial_line += data
+            *lines, partial_line = partial_line.split(b"\n")
+            for line in lines:
+                on_line(line.decode("utf-8", "replace"))
+            if len(partial_line) > chunk_size:
+                on_line(partial_line.decode("utf-8", "replace"))
+                partial_line = b""
+    if on_line and partial_line:
+        on_line(partial_line.decode("utf-8", "replace"))
+
+
+class OutputCapture:
+    """Bounded buffer for the output of a remote command
+
+    Output is kept in memory until it grows past `spill_threshold` bytes, after which it is spilled to a
+    temporary file on disk. If `max_size` is set, only the first and the last `max_size / 2` bytes are kept and
+    the middle of the output is replaced by a truncation marker.
+
+    Args:
+        max_size (:obj:`int`, optional): maximum number of bytes of output to keep. If None, all output is kept.
+            Defaults to None.
+        spill_threshold (:obj:`int`, optional): number of bytes above which output is spilled to disk.
+            Defaults to aztk.utils.constants.SSH_OUTPUT_SPILL_THRESHOLD.
+    """
 
-    output = stdout.read().decode("utf-8")
-    client.close()
-    return NodeOutput(node_id, output, None)
+    def __init__(self, max_size: int = None, spill_threshold: int = None):
+        self.max_size = max_size
+        self.spill_threshold = spill_threshold or constants.SSH_OUTPUT_SPILL_THRESHOLD
+        self.size = 0
+        self.truncated = 0
+        self._head = tempfile.SpooledTemporaryFile(max_size=self.spill_threshold)
+        self._head_size = 0
+        self._head_limit = None if max_size is None else max_size - max_size // 2
+        self._tail = collections.deque()
+        self._tail_size = 0
+        self._tail_limit = None if max_size is None else max_size // 2
+
+    def write(self, data: bytes):
+        self.size += len(data)
+        if self._head_limit is not None:
+            room = self._head_limit - self._head_size
+            if len(data) > room:
+                self._write_tail(data[max(room, 0):])
+                data = data[:max(room, 0)]
+        self._head.write(data)
+        self._head_size += len(data)
+
+    def _write_tail(self, data):
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size > self._tail_limit:
+            excess = self._tail_size - self._tail_limit
+            oldest = self._tail[0]
+            if len(oldest) <= excess:
+                self._tail.popleft()
+                dropped = len(oldest)
+            else:
+                self._tail[0] = oldest[excess:]
+                dropped = excess
+            self._tail_size -= dropped
+            self.truncated += dropped
+
+    def result(self, spill: bool = False):
+        """Get the captured output
+
+        Args:
+            spill (:obj:`bool`, optional): If True, output larger than spill_threshold bytes is returned as the
+                temporary file holding it instead of being read back in memory. Defaults to False.
+
+        Returns:
+            :obj:`str`, or if spill is True and the output is larger than spill_threshold bytes, a
+            :obj:`tempfile.SpooledTemporaryFile` holding the output, positioned at its start.
+        """
+        if self.truncated:
+            self._head.write("\n[... {} bytes truncated ...]\n".format(self.truncated).encode("utf-8"))
+        while self._tail:
+            self._head.write(self._tail.popleft())
+        length = self._head.tell()
+        self._head.seek(0)
+        if not spill or length <= self.spill_threshold:
+            output = self._head.read().decode("utf-8", "replace")
+            self._head.close()
+            return output
+        return self._head
 
 
 async def clus_exec_command(command,
@@ -145,10 +775,15 @@ async def clus_exec_command(command,
                             ssh_key=None,
                             password=None,
                             container_name=None,
-                            timeout=None):
-    return await asyncio.gather(*[
-        asyncio.get_event_loop().run_in_executor(
-            ThreadPoolExecutor(),
+                            timeout=None,
+                            connection_pool=None,
+                            node_executor=None,
+                            max_output_size=None,
+                            spill_output=False):
+    return await _map_nodes(
+        node_executor,
+        nodes,
+        lambda node, node_rls: functools.partial(
             node_exec_command,
             node.id,
             command,
@@ -159,8 +794,83 @@ async def clus_exec_command(command,
             password,
             container_name,
             timeout,
-        ) for node, node_rls in nodes
-    ])
+            connection_pool=connection_pool,
+            max_output_size=max_output_size,
+            spill_output=spill_output,
+        ),
+    )
+
+
+def clus_exec_command_stream(command,
+                             username,
+                             nodes,
+                             ssh_key=None,
+                             password=None,
+                             container_name=None,
+                             timeout=None,
+                             connection_pool=None,
+                             node_executor=None,
+                             lines=False,
+                             max_output_size=None,
+                             spill_output=False):
+    """Run a command on every node and yield the output of each node as soon as it finishes
+
+    If lines is True, every line of output is also yielded as an :obj:`aztk.models.SSHLog` as soon as the
+    node writes it.
+    """
+
+    def make_call(node, node_rls, emit):
+        on_line = (lambda line: emit(SSHLog(line, node.id))) if lines else None
+        return functools.partial(
+            node_exec_command,
+            node.id,
+            command,
+            username,
+            node_rls.ip_address,
+            node_rls.port,
+            ssh_key,
+            password,
+            container_name,
+            timeout,
+            connection_pool=connection_pool,
+            on_line=on_line,
+            max_output_size=max_output_size,
+            spill_output=spill_output,
+        )
+
+    if node_executor is not None:
+        yield from node_executor.imap(nodes, make_call)
+        return
+    node_executor = NodeExecutor(max_in_flight=max(len(nodes), 1))
+    try:
+        yield from node_executor.imap(nodes, make_call)
+    finally:
+        node_executor.shutdown(wait=False)
+
+
+class DownloadBudget:
+    """Number of bytes of downloaded files that may be held in memory, shared by the downloads of one operation
+
+    A file that fits in what is left of the budget is downloaded to memory, any other file is downloaded to a
+    temporary file on disk.
+
+    Args:
+        max_bytes (:obj:`int`, optional): size of the budget.
+            Defaults to aztk.utils.constants.SSH_DOWNLOAD_MEMORY_BUDGET.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.remaining = constants.SSH_DOWNLOAD_MEMORY_BUDGET if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+
+    def temporary_file(self, size: int):
+        with self._lock:
+            in_memory = 0 < size <= self.remaining
+            if in_memory:
+                self.remaining -= size
+        if in_memory:
+            return tempfile.SpooledTemporaryFile(max_size=size)
+        return tempfile.TemporaryFile()
 
 
 def copy_from_node(
@@ -174,33 +884,126 @@ def copy_from_node(
         password=None,
         container_name=None,
         timeout=None,
+        connection_pool=None,
+        memory_budget=None,
 ):
     try:
-        client = connect(
-            hostname=hostname, port=port, username=username, password=password, pkey=ssh_key, timeout=timeout)
+        with contextlib.ExitStack() as stack:
+
+            def reconnect():
+                return stack.enter_context(
+                    _open_connection(connection_pool, hostname, port, username, password, ssh_key, timeout))
+
+            return _copy_from_node(reconnect(), node_id, source_path, destination_path, container_name, memory_budget,
+                                   reconnect)
     except AztkError as e:
         return NodeOutput(node_id, False, e)
-    sftp_client = client.open_sftp()
-    try:
+
+
+def _copy_from_node(client,
+                    node_id,
+                    source_path,
+                    destination_path,
+                    container_name=None,
+                    memory_budget=None,
+                    reconnect=None):
+    memory_budget = memory_budget or DownloadBudget()
+    opened = []
+
+    def open_destination(size):
         if destination_path:
-            destination_path = os.path.join(
-                os.path.dirname(destination_path), node_id, os.path.basename(destination_path))
-            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
-            with open(destination_path, "wb") as f:
-                sftp_client.getfo(source_path, f)
-                return NodeOutput(node_id, f, None)
+            path = os.path.join(os.path.dirname(destination_path), node_id, os.path.basename(destination_path))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, "wb")
         else:
-            import tempfile
+            f = memory_budget.temporary_file(size)
+        opened.append(f)
+        return f
 
-            # create 2mb temporary file
-            f = tempfile.SpooledTemporaryFile(2 * 1024**3)
-            sftp_client.getfo(source_path, f)
-            return NodeOutput(node_id, f, None)
-    except OSError as e:
+    try:
+        if container_name:
+            _get_from_container(client, source_path, open_destination, container_name)
+        else:
+            _download(client, source_path, open_destination, reconnect)
+        f = opened[0]
+        if destination_path:
+            f.close()
+        else:
+            f.seek(0)
+        return NodeOutput(node_id, f, None)
+    except (OSError, AztkError) as e:
+        for f in opened:
+            f.close()
         return NodeOutput(node_id, None, e)
+
+
+def _download(client, source_path, open_destination, reconnect=None):
+    """Download a file over SFTP in pipelined chunks, resuming where it stopped if the connection drops
+
+    At most SSH_DOWNLOAD_WINDOW bytes are requested at once, so memory use does not grow with the size of the
+    file even if the destination is slower than the network.
+    """
+    import paramiko
+
+    chunk_size = constants.SSH_DOWNLOAD_CHUNK_SIZE
+    sftp_client = _open_sftp(client)
+    try:
+        size = sftp_client.stat(source_path).st_size
+        f = open_destination(size)
+        written = 0
+        attempts = 0
+        while True:
+            try:
+                with sftp_client.open(source_path, "rb") as remote_file:
+                    while written < size:
+                        _call_timeout()
+                        end = min(size, written + constants.SSH_DOWNLOAD_WINDOW)
+                        chunks = [(offset, min(chunk_size, end - offset)) for offset in range(written, end, chunk_size)]
+                        for data in remote_file.readv(chunks):
+                            f.write(data)
+                            written += len(data)
+                return
+            except (paramiko.SSHException, EOFError, ConnectionError, socket.timeout) as e:
+                attempts += 1
+                if reconnect is None or attempts > constants.SSH_DOWNLOAD_RETRIES:
+                    raise AztkError("Failed to download {}: {}".format(source_path, repr(e)))
+                logging.debug("Download of %s interrupted at byte %d, resuming: %s", source_path, written, repr(e))
+                with contextlib.suppress(Exception):
+                    sftp_client.close()
+                sftp_client = _open_sftp(reconnect())
     finally:
         sftp_client.close()
-        client.close()
+
+
+def _get_from_container(client, source_path, open_destination, container_name):
+    """Stream a file out of a container as a tar archive, without a copy on the host"""
+    command = "sudo docker exec {0} tar -c -C {1} {2}".format(container_name,
+                                                              shlex.quote(posixpath.dirname(source_path) or "/"),
+                                                              shlex.quote(posixpath.basename(source_path)))
+    channel = _open_session(client)
+    try:
+        channel.exec_command(command)
+        stdout = channel.makefile("rb", constants.SSH_COPY_BUFFER_SIZE)
+        tar_error = None
+        try:
+            with tarfile.open(fileobj=stdout, mode="r|") as tar:
+                member = tar.next()
+                if member is None or not member.isfile():
+                    raise tarfile.TarError("{} is not a file".format(source_path))
+                shutil.copyfileobj(
+                    tar.extractfile(member), open_destination(member.size), constants.SSH_COPY_BUFFER_SIZE)
+        except tarfile.TarError as e:
+            tar_error = e
+        # read to the end so tar can exit
+        while stdout.read(constants.SSH_COPY_BUFFER_SIZE):
+            pass
+        stderr = channel.makefile_stderr("rb").read().decode("utf-8", "replace")
+        if channel.recv_exit_status() != 0:
+            raise AztkError("Failed to copy {} from container {}: {}".format(source_path, container_name, stderr))
+        if tar_error:
+            raise AztkError("Failed to copy {} from container {}: {}".format(source_path, container_name, tar_error))
+    finally:
+        channel.close()
 
 
 def node_copy(
@@ -214,36 +1017,148 @@ def node_copy(
         password=None,
         container_name=None,
         timeout=None,
+        connection_pool=None,
+        manifest=None,
 ):
     try:
-        client = connect(
-            hostname=hostname, port=port, username=username, password=password, pkey=ssh_key, timeout=timeout)
+        with _open_connection(connection_pool, hostname, port, username, password, ssh_key, timeout) as client:
+            return _node_copy(client, node_id, source_path, destination_path, container_name, manifest, timeout)
     except AztkError as e:
         return NodeOutput(node_id, None, e)
-    sftp_client = client.open_sftp()
+
+
+def _node_copy(client, node_id, source_path, destination_path, container_name=None, manifest=None, timeout=None):
     try:
-        if container_name:
-            # put the file in /tmp on the host
-            tmp_file = "/tmp/" + os.path.basename(source_path)
-            sftp_client.put(source_path, tmp_file)
-            # move to correct destination on container
-            docker_command = "sudo docker cp {0} {1}:{2}".format(tmp_file, container_name, destination_path)
-            _, stdout, _ = client.exec_command(docker_command, get_pty=True)
-            output = stdout.read().decode("utf-8")
-            # clean up
-            sftp_client.remove(tmp_file)
+        if os.path.isdir(source_path):
+            output = _sync_directory(client, source_path, destination_path, container_name, manifest, timeout)
+            return NodeOutput(node_id, output, None)
+        elif container_name:
+            output = _put_into_container(client, source_path, destination_path, container_name)
             return NodeOutput(node_id, output, None)
         else:
-            output = sftp_client.put(source_path, destination_path).__str__()
+            sftp_client = _open_sftp(client)
+            try:
+                output = sftp_client.put(source_path, destination_path).__str__()
+            finally:
+                sftp_client.close()
             return NodeOutput(node_id, output, None)
-    except (IOError, PermissionError) as e:
+    except (IOError, PermissionError, AztkError) as e:
         return NodeOutput(node_id, None, e)
-    finally:
-        sftp_client.close()
-        client.close()
     # TODO: progress bar
 
 
+def _put_into_container(client, source_path, destination_path, container_name):
+    """Stream a file into a container as a tar archive, without staging it on the host
+
+    Like docker cp, the file is copied inside destination_path if it is an existing directory.
+    """
+    # the archive holds the file under its own name, renamed on extraction unless the destination is a directory
+    name = posixpath.basename(destination_path)
+    rename = "s|.*|{}|".format(name.replace("\\", "\\\\").replace("|", "\\|").replace("&", "\\&"))
+    script = ("if [ -d {0} ]; then exec tar -x --no-same-owner -C {0}; "
+              "else exec tar -x --no-same-owner -C {1} --transform {2}; fi").format(
+                  shlex.quote(destination_path), shlex.quote(posixpath.dirname(destination_path) or "/"),
+                  shlex.quote(rename))
+    command = "sudo docker exec -i {0} sh -c {1}".format(container_name, shlex.quote(script))
+    try:
+        return _put_tar(client, command, lambda tar: tar.add(source_path, arcname=os.path.basename(source_path)))
+    except AztkError as e:
+        raise AztkError("Failed to copy {} to container {}: {}".format(source_path, container_name, e))
+
+
+def _put_tar(client, command, add_members, compression=""):
+    """Run command on the node and stream the tar archive built by add_members to its standard input"""
+    channel = _open_session(client)
+    try:
+        channel.set_combine_stderr(True)
+        channel.exec_command(command)
+        stdin = channel.makefile("wb", constants.SSH_COPY_BUFFER_SIZE)
+        write_error = None
+        try:
+            with tarfile.open(fileobj=stdin, mode="w|" + compression, bufsize=constants.SSH_COPY_BUFFER_SIZE) as tar:
+                add_members(tar)
+            stdin.flush()
+        except OSError as e:
+            # the remote tar may have exited early, its output explains why
+            write_error = e
+        with contextlib.suppress(OSError):
+            channel.shutdown_write()
+        capture = OutputCapture(max_size=64 * 1024)
+        _drain_channel(channel, capture)
+        output = capture.result()
+        if channel.recv_exit_status() != 0:
+            raise AztkError(output)
+        if write_error:
+            raise write_error
+        return output
+    finally:
+        channel.close()
+
+
+def _in_container(command, container_name):
+    if container_name:
+        return "sudo docker exec -i {0} /bin/sh -c {1}".format(container_name, shlex.quote(command))
+    return "/bin/sh -c {0}".format(shlex.quote(command))
+
+
+def local_manifest(source_dir):
+    """Get the size and SHA-256 of every file under source_dir
+
+    Returns:
+        :obj:`dict`: maps the path of each file, relative to source_dir and with / separators, to (size, sha256)
+    """
+    manifest = {}
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(constants.SSH_COPY_BUFFER_SIZE), b""):
+                    sha256.update(chunk)
+            manifest[os.path.relpath(path, source_dir).replace(os.sep, "/")] = (os.path.getsize(path),
+                                                                                sha256.hexdigest())
+    return manifest
+
+
+# Line between the sizes and the hashes of the files in the output of the remote manifest command
+_MANIFEST_SEPARATOR = "--aztk-manifest-hashes--"
+
+
+def _remote_manifest(client, destination_dir, container_name=None, timeout=None):
+    command = ("cd {0} 2>/dev/null || exit 0; find . -type f -printf '%s %P\\n'; echo {1}; "
+               "find . -type f -exec sha256sum {{}} +").format(shlex.quote(destination_dir), _MANIFEST_SEPARATOR)
+    output = _exec_checked(client, _in_container(command, container_name), timeout, max_output_size=None)
+    sizes, _, hashes = output.partition(_MANIFEST_SEPARATOR)
+    manifest = {}
+    for line in sizes.splitlines():
+        size, _, path = line.partition(" ")
+        if not size.isdigit() or not path:
+            continue
+        manifest[path] = [int(size), None]
+    for line in hashes.splitlines():
+        sha256, _, path = line.partition("  ./")
+        if path in manifest:
+            manifest[path][1] = sha256
+    return {path: tuple(entry) for path, entry in manifest.items()}
+
+
+def _sync_directory(client, source_dir, destination_dir, container_name=None, manifest=None, timeout=None):
+    """Copy the files of source_dir that are missing or differ on the node, as one compressed tar stream"""
+    if manifest is None:
+        manifest = local_manifest(source_dir)
+    remote_manifest = _remote_manifest(client, destination_dir, container_name, timeout)
+    changed = sorted(path for path, entry in manifest.items() if remote_manifest.get(path) != entry)
+    if changed:
+        command = "mkdir -p {0} && tar -xz --no-same-owner -C {0}".format(shlex.quote(destination_dir))
+
+        def add_members(tar):
+            for path in changed:
+                tar.add(os.path.join(source_dir, *path.split("/")), arcname=path, recursive=False)
+
+        _put_tar(client, _in_container(command, container_name), add_members, compression="gz")
+    return "{} of {} files copied".format(len(changed), len(manifest))
+
+
 async def clus_copy(
         username,
         nodes,
@@ -254,10 +1169,20 @@ async def clus_copy(
         container_name=None,
         get=False,
         timeout=None,
+        connection_pool=None,
+        node_executor=None,
 ):
-    return await asyncio.gather(*[
-        asyncio.get_event_loop().run_in_executor(
-            ThreadPoolExecutor(),
+    if get:
+        kwargs = {"memory_budget": DownloadBudget()}
+    elif os.path.isdir(source_path):
+        # hash the local files once rather than for every node
+        kwargs = {"manifest": local_manifest(source_path)}
+    else:
+        kwargs = {}
+    return await _map_nodes(
+        node_executor,
+        nodes,
+        lambda node, node_rls: functools.partial(
             copy_from_node if get else node_copy,
             node.id,
             source_path,
@@ -269,23 +1194,181 @@ async def clus_copy(
             password,
             container_name,
             timeout,
-        ) for node, node_rls in nodes
-    ])
+            connection_pool=connection_pool,
+            **kwargs
+        ),
+    )
+
+
+def _exec_checked(client, command, timeout=None, max_output_size=64 * 1024):
+    """Run command on the host of client and raise an AztkError if it exits with a non-zero status"""
+    channel = _open_session(client, timeout)
+    channel.set_combine_stderr(True)
+    channel.exec_command(command)
+    capture = OutputCapture(max_size=max_output_size)
+    try:
+        _drain_channel(channel, capture)
+        status = channel.recv_exit_status()
+    finally:
+        channel.close()
+    output = capture.result()
+    if status != 0:
+        raise AztkError("Command '{}' exited with status {}: {}".format(command, status, output))
+    return output
+
+
+def _run_on_node(node_id, username, hostname, port, ssh_key, password, timeout, connection_pool, action):
+    try:
+        with _open_connection(connection_pool, hostname, port, username, password, ssh_key, timeout) as client:
+            return NodeOutput(node_id, action(client), None)
+    except (AztkError, OSError, socket.timeout) as e:
+        return NodeOutput(node_id, None, e)
+
+
+async def clus_broadcast_copy(
+        username,
+        nodes,
+        source_path,
+        destination_path,
+        ssh_key=None,
+        password=None,
+        container_name=None,
+        timeout=None,
+        connection_pool=None,
+        node_executor=None,
+):
+    """Copy a local file to every node while uploading it from the client only once
+
+    The file is uploaded to the first node in nodes. It is then sent node to node over the internal
+    network of the cluster with scp, along a binomial tree: every node that holds the file sends it to one that
+    does not, so the number of nodes holding it doubles each round. Finally, every node moves the file to
+    destination_path, inside container_name if it is set.
+
+    The nodes authenticate to each other with a key pair generated for this copy only. Its private key is staged,
+    readable by the user only, next to the file on the nodes that hold it, and its public key is authorized for
+    the user on the nodes that receive it. Both are removed from every node when the copy ends, even if it fails.
+
+    Returns:
+        :obj:`List[aztk.models.NodeOutput]`: the output of the copy on each node, in the order of nodes
+    """
+    if not ssh_key and not password:
+        raise AztkError("Broadcast copy requires an SSH key or a password to connect to the nodes.")
+    if os.path.isdir(source_path):
+        raise AztkError("Broadcast copy only supports files, {} is a directory.".format(source_path))
+    broadcast_id = "aztk-broadcast-{}".format(uuid.uuid4().hex)
+    staging_dir = "/tmp/{}".format(broadcast_id)
+    staged_file = posixpath.join(staging_dir, os.path.basename(source_path))
+    key_file = posixpath.join(staging_dir, "id_rsa")
+    broadcast_key = RSA.generate(2048)
+    authorized_key = "{} {}".format(broadcast_key.publickey().exportKey("OpenSSH").decode("utf-8"), broadcast_id)
+    ssh_options = "-i {} -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o BatchMode=yes".format(
+        shlex.quote(key_file))
+
+    def on_node(node, node_rls, action):
+        return functools.partial(_run_on_node, node.id, username, node_rls.ip_address, node_rls.port, ssh_key, password,
+                                 timeout, connection_pool, action)
+
+    def seed(client):
+        _exec_checked(client, "mkdir -p {0} && chmod 700 {0}".format(shlex.quote(staging_dir)), timeout)
+        sftp_client = _open_sftp(client)
+        try:
+            sftp_client.put(source_path, staged_file)
+            with sftp_client.open(key_file, "w") as f:
+                f.write(broadcast_key.exportKey().decode("utf-8"))
+            sftp_client.chmod(key_file, 0o600)
+        finally:
+            sftp_client.close()
+
+    authorize_command = ("mkdir -p ~/.ssh && chmod 700 ~/.ssh && echo {} >> ~/.ssh/authorized_keys && "
+                         "chmod 600 ~/.ssh/authorized_keys").format(shlex.quote(authorized_key))
+
+    def send_to(receiver):
+        target = "{}@{}".format(username, receiver.ip_address)
+        command = ("ssh {options} {target} 'mkdir -p {dir} && chmod 700 {dir}' && "
+                   "scp -q -p {options} {key} {file} {target}:{dir}/").format(
+                       options=ssh_options,
+                       target=target,
+                       dir=shlex.quote(staging_dir),
+                       key=shlex.quote(key_file),
+                       file=shlex.quote(staged_file))
+        return lambda client: _exec_checked(client, command, timeout)
+
+    cleanup_command = "rm -rf {0}; touch ~/.ssh/authorized_keys && sed -i '/ {1}$/d' ~/.ssh/authorized_keys".format(
+        shlex.quote(staging_dir), broadcast_id)
+    if container_name:
+        install_command = "sudo docker cp {0} {1}:{2}".format(
+            shlex.quote(staged_file), container_name, shlex.quote(destination_path))
+    else:
+        install_command = "cp {0} {1}".format(shlex.quote(staged_file), shlex.quote(destination_path))
+    install_command = "{0}; status=$?; {1}; exit $status".format(install_command, cleanup_command)
+
+    def prepare(node, node_rls):
+        if node.id == nodes[0][0].id:
+            return on_node(node, node_rls, seed)
+        return on_node(node, node_rls, lambda client: _exec_checked(client, authorize_command, timeout))
+
+    failed = {}
+    cleaned_up = False
+    try:
+        outputs = await _map_nodes(node_executor, nodes, prepare)
+        if outputs[0].error:
+            failed = {node.id: NodeOutput(node.id, None, outputs[0].error) for node, _ in nodes}
+        else:
+            failed = {output.id: output for output in outputs if output.error}
+        holders = [node for node in nodes[:1] if node[0].id not in failed]
+        pending = [node for node in nodes[1:] if node[0].id not in failed]
+
+        while holders and pending:
+            pairs = list(zip(holders, pending))
+            pending = pending[len(pairs):]
+            receivers = {sender.id: receiver for (sender, _), (receiver, _) in pairs}
+            outputs = await _map_nodes(
+                node_executor,
+                [sender for sender, _ in pairs],
+                lambda node, node_rls: on_node(node, node_rls, send_to(receivers[node.id])),
+            )
+            for (_, receiver), output in zip(pairs, outputs):
+                if output.error:
+                    failed[receiver[0].id] = NodeOutput(receiver[0].id, None, output.error)
+                else:
+                    holders.append(receiver)
+
+        outputs = await _map_nodes(
+            node_executor,
+            nodes,
+            lambda node, node_rls: on_node(
+                node, node_rls, lambda client: _exec_checked(
+                    client, cleanup_command if node.id in failed else install_command, timeout)),
+        )
+        cleaned_up = True
+        return [failed.get(output.id, output) for output in outputs]
+    finally:
+        if not cleaned_up:
+            # the copy did not finish, make sure no node keeps the key
+            with contextlib.suppress(Exception):
+                await _map_nodes(
+                    node_executor,
+                    nodes,
+                    lambda node, node_rls: on_node(
+                        node, node_rls, lambda client: _exec_checked(client, cleanup_command, timeout)),
+                )
 
 
 def node_ssh(username, hostname, port, ssh_key=None, password=None, port_forward_list=None, timeout=None):
     try:
         client = connect(
             hostname=hostname, port=port, username=username, password=password, pkey=ssh_key, timeout=timeout)
-        forward_ports(client=client, port_forward_list=port_forward_list)
+        forwarder = forward_ports(client=client, port_forward_list=port_forward_list)
     except AztkError as e:
         raise e
 
     try:
-        import time
-
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         # catch and ignore so stacktrace isn't printed
         pass
+    finally:
+        if forwarder:
+            forwarder.close()
+        client.close()
@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import azure.batch.models as batch_models
+
+from aztk.utils import constants, file_utils
+
+
+class VmImageCache:
+    """On disk cache of the node agent sku and image reference resolved for a VM image
+
+    Resolving a VM image lists every node agent sku of the Batch account, so the result is kept on disk for `ttl`
+    seconds, per account, publisher, offer and sku, and shared by every process of the user.
+
+    Args:
+        path (:obj:`str`, optional): path of the cache file. Defaults to aztk.utils.constants.VM_IMAGE_CACHE_PATH.
+        ttl (:obj:`int`, optional): number of seconds a resolved image is used for.
+            Defaults to aztk.utils.constants.VM_IMAGE_CACHE_TTL.
+    """
+
+    def __init__(self, path: str = None, ttl: int = None):
+        self.path = path or constants.VM_IMAGE_CACHE_PATH
+        self.ttl = constants.VM_IMAGE_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+
+    def get(self, account: str, publisher: str, offer: str, sku: str):
+        """Get the cached (node agent sku id, image reference) of a VM image, or None if it is missing or expired"""
+        entry = self._read().get(self._key(account, publisher, offer, sku))
+        if not entry or time.time() - entry["resolved_at"] >= self.ttl:
+            return None
+        return entry["node_agent_sku_id"], batch_models.ImageReference(**entry["image_reference"])
+
+    def put(self, account: str, publisher: str, offer: str, sku: str, node_agent_sku_id: str,
+            image_reference: batch_models.ImageReference):
+        with self._lock:
+            entries = self._read()
+            entries[self._key(account, publisher, offer, sku)] = dict(
+                node_agent_sku_id=node_agent_sku_id,
+                image_reference=dict(
+                    publisher=image_reference.publisher,
+                    offer=image_reference.offer,
+                    sku=image_reference.sku,
+                    version=image_reference.version,
+                ),
+                resolved_at=time.time(),
+            )
+            self._write(entries)
+
+    def clear(self):
+        """Drop every cached image, they are resolved again on their next use"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    @staticmethod
+    def _key(account, publisher, offer, sku):
+        return "|".join([account, publisher.lower(), offer.lower(), sku])
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="UTF-8") as stream:
+                return json.load(stream)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        try:
+            file_utils.write_json_atomic(self.path, entries)
+        except OSError as e:
+            logging.debug("Failed to write the VM image cache %s: %r", self.path, e)
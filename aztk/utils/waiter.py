@@ -0,0 +1,187 @@
+import asyncio
+import random
+import time
+
+import azure.batch.models as batch_models
+
+from aztk.error import WaitCancelledError, WaitTimeoutError
+from aztk.utils import constants
+
+_UNSET = object()
+
+
+class Waiter:
+    """Polls until a condition is met, backing off while nothing changes
+
+    The delay between polls starts at `initial_delay` and is multiplied by `multiplier` after every poll that
+    observes the same state as the previous one, up to `max_delay`. It goes back to `initial_delay` as soon as
+    the observed state changes. Each delay is randomized by up to `jitter` of its value, so clients waiting on
+    the same service do not poll it in lockstep.
+
+    Args:
+        initial_delay (:obj:`float`, optional): number of seconds to sleep after a poll that observed a change.
+            Defaults to aztk.utils.constants.WAITER_INITIAL_DELAY.
+        max_delay (:obj:`float`, optional): maximum number of seconds to sleep between polls.
+            Defaults to aztk.utils.constants.WAITER_MAX_DELAY.
+        multiplier (:obj:`float`, optional): factor the delay grows by while nothing changes. Defaults to 1.5.
+        jitter (:obj:`float`, optional): fraction of the delay it is randomized by. Defaults to 0.2.
+        timeout (:obj:`float`, optional): number of seconds to wait before raising
+            :obj:`aztk.error.WaitTimeoutError`. If None, wait indefinitely. Defaults to None.
+        cancel_event (:obj:`threading.Event`, optional): event that, once set, makes the wait raise
+            :obj:`aztk.error.WaitCancelledError`. Defaults to None.
+    """
+
+    def __init__(self,
+                 initial_delay: float = None,
+                 max_delay: float = None,
+                 multiplier: float = 1.5,
+                 jitter: float = 0.2,
+                 timeout: float = None,
+                 cancel_event=None):
+        self.initial_delay = constants.WAITER_INITIAL_DELAY if initial_delay is None else initial_delay
+        self.max_delay = constants.WAITER_MAX_DELAY if max_delay is None else max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.timeout = timeout
+        self.cancel_event = cancel_event
+
+    def wait(self, poll, description: str = "condition"):
+        """Call poll until it reports it is done
+
+        Args:
+            poll (:obj:`Callable`): returns a (done: :obj:`bool`, state) tuple. state is compared to the state of
+                the previous poll to find out whether anything changed.
+            description (:obj:`str`, optional): what is waited for, used in error messages.
+
+        Returns:
+            the state returned by the last poll
+        """
+        schedule = _Schedule(self, description)
+        while True:
+            self._check_cancelled(description)
+            done, state = poll()
+            if done:
+                return state
+            self._sleep(schedule.next_sleep(state))
+
+    async def wait_async(self, poll, description: str = "condition"):
+        """Await poll until it reports it is done, sleeping without blocking the event loop
+
+        Args:
+            poll (:obj:`Callable`): returns an awaitable of a (done: :obj:`bool`, state) tuple.
+            description (:obj:`str`, optional): what is waited for, used in error messages.
+
+        Returns:
+            the state returned by the last poll
+        """
+        schedule = _Schedule(self, description)
+        while True:
+            self._check_cancelled(description)
+            done, state = await poll()
+            if done:
+                return state
+            await asyncio.sleep(schedule.next_sleep(state))
+
+    def _sleep(self, seconds):
+        if self.cancel_event is None:
+            time.sleep(seconds)
+        elif self.cancel_event.wait(seconds):
+            self._check_cancelled()
+
+    def _check_cancelled(self, description: str = "condition"):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise WaitCancelledError("Cancelled while waiting for {}".format(description))
+
+
+class _Schedule:
+    def __init__(self, waiter, description):
+        self.waiter = waiter
+        self.description = description
+        self.deadline = None if waiter.timeout is None else time.time() + waiter.timeout
+        self.delay = waiter.initial_delay
+        self.previous = _UNSET
+
+    def next_sleep(self, state):
+        waiter = self.waiter
+        if self.previous is not _UNSET and state == self.previous:
+            self.delay = min(self.delay * waiter.multiplier, waiter.max_delay)
+        else:
+            self.delay = waiter.initial_delay
+        self.previous = state
+
+        sleep = self.delay * random.uniform(1 - waiter.jitter, 1 + waiter.jitter)
+        if self.deadline is not None:
+            remaining = self.deadline - time.time()
+            if remaining <= 0:
+                raise WaitTimeoutError("Timed out after {} seconds waiting for {}".format(
+                    waiter.timeout, self.description))
+            sleep = min(sleep, remaining)
+        return sleep
+
+
+def _state_filter(states):
+    return " and ".join("state ne '{}'".format(state.value) for state in states)
+
+
+def wait_for_tasks(batch_client, job_id: str, task_ids=None, states=None, waiter: Waiter = None):
+    """Wait until tasks of a job are in one of the given states
+
+    However many tasks are watched, each poll is a single task list call that only returns the id and state of
+    the tasks that are not done yet. Watched tasks must already have been added to the job.
+
+    Args:
+        batch_client (:obj:`azure.batch.batch_service_client.BatchServiceClient`): the batch client to use.
+        job_id (:obj:`str`): the id of the job the tasks are in.
+        task_ids (:obj:`List[str]`, optional): the ids of the tasks to wait for. If None, wait for every task
+            in the job. Defaults to None.
+        states (:obj:`List[azure.batch.models.TaskState]`, optional): the states the tasks are waited into.
+            Defaults to [azure.batch.models.TaskState.completed].
+        waiter (:obj:`aztk.utils.waiter.Waiter`, optional): the waiter to poll with. Defaults to a new Waiter.
+    """
+    (waiter or Waiter()).wait(_tasks_poll(batch_client, job_id, task_ids, states), "tasks of job {}".format(job_id))
+
+
+async def wait_for_tasks_async(batch_client,
+                               job_id: str,
+                               task_ids=None,
+                               states=None,
+                               waiter: Waiter = None,
+                               executor=None):
+    """Same as wait_for_tasks, without blocking the event loop
+
+    The list calls are run on executor, or the default executor of the event loop if None.
+    """
+    poll = _tasks_poll(batch_client, job_id, task_ids, states)
+    loop = asyncio.get_event_loop()
+    await (waiter or Waiter()).wait_async(lambda: loop.run_in_executor(executor, poll),
+                                          "tasks of job {}".format(job_id))
+
+
+def _tasks_poll(batch_client, job_id, task_ids, states):
+    watched = None if task_ids is None else set(task_ids)
+    options = batch_models.TaskListOptions(
+        filter=_state_filter(states or [batch_models.TaskState.completed]), select="id,state")
+
+    def poll():
+        pending = frozenset(
+            task.id
+            for task in batch_client.task.list(job_id, task_list_options=options)
+            if watched is None or task.id in watched)
+        return not pending, pending
+
+    return poll
+
+
+def wait_for_task(batch_client, job_id: str, task_id: str, waiter: Waiter = None):
+    """Wait until a task is completed, reading only its state on each poll
+
+    Returns:
+        :obj:`azure.batch.models.TaskState`: the state of the task
+    """
+    options = batch_models.TaskGetOptions(select="state")
+
+    def poll():
+        state = batch_client.task.get(job_id, task_id, task_get_options=options).state
+        return state == batch_models.TaskState.completed, state
+
+    return (waiter or Waiter()).wait(poll, "task {} of job {}".format(task_id, job_id))
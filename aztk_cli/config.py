@@ -165,6 +165,48 @@ def _convert_to_path(path: str):
     return None
 
 
+def _convert_to_applications(applications):
+    return [
+        aztk.spark.models.ApplicationConfiguration(
+            name=application.get("name"),
+            application=application.get("application"),
+            application_args=application.get("application_args"),
+            main_class=application.get("main_class"),
+            jars=application.get("jars"),
+            py_files=application.get("py_files"),
+            files=application.get("files"),
+            driver_java_options=application.get("driver_java_options"),
+            driver_library_path=application.get("driver_library_path"),
+            driver_class_path=application.get("driver_class_path"),
+            driver_memory=application.get("driver_memory"),
+            executor_memory=application.get("executor_memory"),
+            driver_cores=application.get("driver_cores"),
+            executor_cores=application.get("executor_cores"),
+            max_retry_count=application.get("max_retry_count"),
+        ) for application in applications
+    ]
+
+
+def load_applications(path: str):
+    """
+        Reads the applications of a file in the format of the applications section of job.yaml
+    """
+    with open(path, "r", encoding="UTF-8") as stream:
+        try:
+            config = yaml.load(stream)
+        except yaml.YAMLError as err:
+            raise aztk.error.AztkError("Error in {0}:\n {1}".format(path, err))
+
+    applications = _convert_to_applications((config or {}).get("applications") or [])
+    for entry in applications:
+        if entry.name is None:
+            raise aztk.error.AztkError("Application specified with no name. Please verify your configuration in "
+                                       "{}".format(path))
+        if entry.application is None:
+            raise aztk.error.AztkError("No path to application specified for {} in {}".format(entry.name, path))
+    return applications
+
+
 class JobConfig:
     def __init__(self):
         self.id = None
@@ -204,25 +246,7 @@ class JobConfig:
 
         applications = config.get("applications")
         if applications:
-            self.applications = []
-            for application in applications:
-                self.applications.append(
-                    aztk.spark.models.ApplicationConfiguration(
-                        name=application.get("name"),
-                        application=application.get("application"),
-                        application_args=application.get("application_args"),
-                        main_class=application.get("main_class"),
-                        jars=application.get("jars"),
-                        py_files=application.get("py_files"),
-                        files=application.get("files"),
-                        driver_java_options=application.get("driver_java_options"),
-                        driver_library_path=application.get("driver_library_path"),
-                        driver_class_path=application.get("driver_class_path"),
-                        driver_memory=application.get("driver_memory"),
-                        executor_memory=application.get("executor_memory"),
-                        driver_cores=application.get("driver_cores"),
-                        executor_cores=application.get("executor_cores"),
-                    ))
+            self.applications = _convert_to_applications(applications)
 
         spark_configuration = config.get("spark_configuration")
         if spark_configuration:
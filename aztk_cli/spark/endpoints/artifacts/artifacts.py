@@ -0,0 +1,27 @@
+import argparse
+import typing
+
+from . import prune
+
+
+class ArtifactsAction:
+    prune = "prune"
+
+
+def setup_parser(parser: argparse.ArgumentParser):
+    subparsers = parser.add_subparsers(title="Actions", dest="artifacts_action", metavar="<action>")
+    subparsers.required = True
+
+    prune_parser = subparsers.add_parser(
+        ArtifactsAction.prune, help="Delete the application files no cluster or job used recently")
+
+    prune.setup_parser(prune_parser)
+
+
+def execute(args: typing.NamedTuple):
+    actions = {}
+
+    actions[ArtifactsAction.prune] = prune.execute
+
+    func = actions[args.artifacts_action]
+    func(args)
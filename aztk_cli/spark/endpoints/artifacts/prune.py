@@ -0,0 +1,27 @@
+import argparse
+import datetime
+import typing
+
+import aztk.spark
+from aztk_cli import config, log
+
+
+def setup_parser(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--older-than",
+        dest="older_than",
+        type=int,
+        required=False,
+        help="Number of days after which an unused application file is deleted. "
+        "Defaults to the number of days the files uploaded for applications stay readable.",
+    )
+
+
+def execute(args: typing.NamedTuple):
+    spark_client = aztk.spark.Client(config.load_aztk_secrets())
+    older_than = datetime.timedelta(days=args.older_than) if args.older_than else None
+
+    deleted = spark_client.artifact_store.prune(older_than)
+    for blob_name in deleted:
+        log.print("Deleted {0}".format(blob_name))
+    log.info("Deleted %d unused application files", len(deleted))
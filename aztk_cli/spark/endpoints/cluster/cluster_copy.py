@@ -9,7 +9,12 @@ from aztk_cli import config, utils
 def setup_parser(parser: argparse.ArgumentParser):
     parser.add_argument("--id", dest="cluster_id", required=True, help="The unique id of your spark cluster")
 
-    parser.add_argument("--source-path", required=True, help="the local file you wish to copy to the cluster")
+    parser.add_argument(
+        "--source-path",
+        required=True,
+        help="the local file or directory you wish to copy to the cluster. "
+        "Only the files of a directory that are missing or differ on a node are copied.",
+    )
 
     parser.add_argument(
         "--dest-path",
@@ -22,14 +27,25 @@ def setup_parser(parser: argparse.ArgumentParser):
         action="store_true",
         help="Connect using the local IP of the master node. Only use if using a VPN.",
     )
-    parser.set_defaults(internal=False)
+    parser.add_argument(
+        "--broadcast",
+        action="store_true",
+        help="Upload the file to the master node only and copy it from node to node inside the cluster. "
+        "Use this for large files on large clusters.",
+    )
+    parser.set_defaults(internal=False, broadcast=False)
 
 
 def execute(args: typing.NamedTuple):
     spark_client = aztk.spark.Client(config.load_aztk_secrets())
     with utils.Spinner():
         copy_output = spark_client.cluster.copy(
-            id=args.cluster_id, source_path=args.source_path, destination_path=args.dest_path, internal=args.internal)
+            id=args.cluster_id,
+            source_path=args.source_path,
+            destination_path=args.dest_path,
+            internal=args.internal,
+            broadcast=args.broadcast,
+        )
     for node_output in copy_output:
         utils.log_node_copy_output(node_output)
     sys.exit(0 if not any([node_output.error for node_output in copy_output]) else 1)
@@ -21,17 +21,28 @@ def setup_parser(parser: argparse.ArgumentParser):
         help="Connect using the local IP of the master node. Only use if using a VPN")
     parser.add_argument(
         "--host", action="store_true", help="Run the command on the host instead of the Spark Docker container")
-    parser.set_defaults(internal=False, host=False)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the output of each node as soon as that node finishes instead of waiting for the whole cluster")
+    parser.set_defaults(internal=False, host=False, stream=False)
 
 
 def execute(args: typing.NamedTuple):
     spark_client = aztk.spark.Client(config.load_aztk_secrets())
+    if args.stream and not args.node_id:
+        for node_output in spark_client.cluster.run_stream(
+                args.cluster_id, args.command, args.host, args.internal, spill_output=True):
+            utils.log_node_run_output(node_output)
+        return
     with utils.Spinner():
         if args.node_id:
             results = [
-                spark_client.cluster.node_run(args.cluster_id, args.node_id, args.command, args.host, args.internal)
+                spark_client.cluster.node_run(
+                    args.cluster_id, args.node_id, args.command, args.host, args.internal, spill_output=True)
             ]
         else:
-            results = spark_client.cluster.run(args.cluster_id, args.command, args.host, args.internal)
+            results = spark_client.cluster.run(
+                args.cluster_id, args.command, args.host, args.internal, spill_output=True)
     for node_output in results:
         utils.log_node_run_output(node_output)
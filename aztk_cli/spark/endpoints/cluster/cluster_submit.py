@@ -10,7 +10,16 @@ from aztk_cli import config, log, utils
 def setup_parser(parser: argparse.ArgumentParser):
     parser.add_argument("--id", dest="cluster_id", required=True, help="The unique id of your spark cluster")
 
-    parser.add_argument("--name", required=True, help="a name for your application")
+    parser.add_argument("--name", help="a name for your application")
+
+    parser.add_argument(
+        "--applications-file",
+        dest="applications_files",
+        action="append",
+        help="Path to a file listing applications to submit, in the format of the applications section of \
+                              job.yaml. Can be given multiple times. All applications are submitted at once \
+                              instead of --name and app.",
+    )
 
     parser.add_argument("--wait", dest="wait", action="store_true", help="Wait for app to complete")
     parser.add_argument("--no-wait", dest="wait", action="store_false", help="Do not wait for app to complete")
@@ -89,6 +98,7 @@ def setup_parser(parser: argparse.ArgumentParser):
 
     parser.add_argument(
         "app",
+        nargs="?",
         help="App jar OR python file to execute. A path to a local "
         "file is expected, unless used in conjunction with "
         "the --remote flag. When the --remote flag is set, a "
@@ -103,7 +113,13 @@ def execute(args: typing.NamedTuple):
     if not args.wait and args.output:
         raise aztk.error.AztkError("--output flag requires --wait flag")
 
+    if args.applications_files:
+        return execute_many(args)
+    if args.name is None or args.app is None:
+        raise aztk.error.AztkError("--name and app are required unless --applications-file is given")
+
     spark_client = aztk.spark.Client(config.load_aztk_secrets())
+    spark_client.artifact_store.progress_callback = utils.UploadProgressLogger()
     jars = []
     py_files = []
     files = []
@@ -158,6 +174,41 @@ def execute(args: typing.NamedTuple):
         sys.exit(exit_code)
 
 
+def execute_many(args: typing.NamedTuple):
+    if args.name is not None or args.app is not None:
+        raise aztk.error.AztkError("--name and app cannot be used with --applications-file")
+    if args.output:
+        raise aztk.error.AztkError("--output flag cannot be used with --applications-file")
+
+    applications = [application for path in args.applications_files for application in config.load_applications(path)]
+    if not applications:
+        raise aztk.error.AztkError("No applications found in {}".format(", ".join(args.applications_files)))
+
+    spark_client = aztk.spark.Client(config.load_aztk_secrets())
+    spark_client.artifact_store.progress_callback = utils.UploadProgressLogger()
+
+    log.info("-------------------------------------------")
+    log.info("Spark cluster id:        %s", args.cluster_id)
+    log.info("Spark apps:              %s", ", ".join(application.name for application in applications))
+    log.info("Wait for app completion: %s", args.wait)
+    log.info("-------------------------------------------")
+
+    spark_client.cluster.submit_many(
+        id=args.cluster_id, applications=applications, remote=args.remote, internal=args.internal, wait=False)
+
+    if args.wait:
+        with utils.Spinner():
+            spark_client.cluster.wait(
+                id=args.cluster_id, application_name=[application.name for application in applications])
+        exit_codes = {
+            application.name: spark_client.cluster.get_application_log(
+                id=args.cluster_id, application_name=application.name).exit_code for application in applications
+        }
+        for name, exit_code in exit_codes.items():
+            log.info("%s exited with code %s", name, exit_code)
+        sys.exit(next((exit_code for exit_code in exit_codes.values() if exit_code), 0))
+
+
 def log_application(args, jars, py_files, files):
     log.info("-------------------------------------------")
     log.info("Spark cluster id:        %s", args.cluster_id)
@@ -2,7 +2,7 @@ import argparse
 import typing
 
 import aztk.spark
-from aztk_cli import config
+from aztk_cli import config, utils
 from aztk_cli.config import JobConfig
 
 
@@ -24,6 +24,7 @@ def setup_parser(parser: argparse.ArgumentParser):
 
 def execute(args: typing.NamedTuple):
     spark_client = aztk.spark.Client(config.load_aztk_secrets())
+    spark_client.artifact_store.progress_callback = utils.UploadProgressLogger()
     job_conf = JobConfig()
 
     job_conf.merge(args.job_id, args.job_conf)
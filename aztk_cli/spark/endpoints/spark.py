@@ -2,6 +2,7 @@ import argparse
 import typing
 
 from . import init
+from .artifacts import artifacts
 from .cluster import cluster
 from .job import job
 
@@ -12,14 +13,16 @@ def setup_parser(parser: argparse.ArgumentParser):
 
     cluster_parser = subparsers.add_parser("cluster", help="Commands to manage a cluster")
     job_parser = subparsers.add_parser("job", help="Commands to manage a Job")
+    artifacts_parser = subparsers.add_parser("artifacts", help="Commands to manage the stored application files")
     init_parser = subparsers.add_parser("init", help="Initialize your environment")
 
     cluster.setup_parser(cluster_parser)
     job.setup_parser(job_parser)
+    artifacts.setup_parser(artifacts_parser)
     init.setup_parser(init_parser)
 
 
 def execute(args: typing.NamedTuple):
-    actions = dict(cluster=cluster.execute, job=job.execute, init=init.execute)
+    actions = dict(cluster=cluster.execute, job=job.execute, artifacts=artifacts.execute, init=init.execute)
     func = actions[args.action]
     func(args)
@@ -71,12 +71,17 @@ def print_cluster(client, cluster: models.Cluster, internal: bool = False):
 
     if not cluster.nodes:
         return
-    for node in cluster.nodes:
-        remote_login_settings = client.cluster.get_remote_login_settings(cluster.id, node.id)
-        if internal:
+    nodes = list(cluster.nodes)
+    remote_login_settings = None
+    if not internal:
+        remote_login_settings = client.cluster.get_remote_login_settings_for_cluster(
+            cluster.id,
+            [node.id for node in nodes])
+    for node in nodes:
+        if remote_login_settings is None:
             ip = node.ip_address
         else:
-            ip = "{}:{}".format(remote_login_settings.ip_address, remote_login_settings.port)
+            ip = "{}:{}".format(remote_login_settings[node.id].ip_address, remote_login_settings[node.id].port)
         log.info(
             print_format.format(
                 node.id,
@@ -396,6 +401,28 @@ class Spinner:
         time.sleep(self.delay)
 
 
+class UploadProgressLogger:
+    """Logs the progress and throughput of file uploads, every `step` percent of each file"""
+
+    def __init__(self, step=25):
+        self.step = step
+        self._logged = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, progress):
+        # uploads are told apart by their blob, files with the same name may be uploaded at the same time
+        key = (progress.container_name, progress.blob_name)
+        name = progress.file_path or progress.blob_name
+        percent = int(100 * progress.current / progress.total) if progress.total else 100
+        with self._lock:
+            last = self._logged.get(key)
+            if last is not None and percent < min(last + self.step, 100):
+                return
+            self._logged[key] = percent
+        log.info("Uploading %s: %3d%% of %.1f MB (%.1f MB/s)", name, percent, (progress.total or 0) / 1024**2,
+                 progress.bytes_per_second / 1024**2)
+
+
 def utc_to_local(utc_dt):
     return utc_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None).strftime("%H:%M%p %d/%m/%y")
 
@@ -446,10 +473,17 @@ def log_node_copy_output(node_output):
 
 
 def log_node_run_output(node_output):
-    log.info("-" * (len(node_output.id) + 4))
-    log.info("| %s |", node_output.id)
-    log.info("-" * (len(node_output.id) + 4))
+    header = node_output.id
+    if node_output.latency is not None:
+        header = "{} ({:.2f}s)".format(node_output.id, node_output.latency)
+    log.info("-" * (len(header) + 4))
+    log.info("| %s |", header)
+    log.info("-" * (len(header) + 4))
     if node_output.error:
         log.error("%s\n", node_output.error)
+    elif node_output.output_file is not None:
+        # output too large to be kept in memory was spilled to a temporary file
+        for line in node_output.output_file:
+            log.print(line.decode("utf-8", "replace").rstrip("\n"))
     else:
         log.print(node_output.output)
@@ -0,0 +1,108 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import azure.batch.models as batch_models
+import pytest
+from msrest import Serializer
+
+from aztk import models
+from aztk.client.cluster.helpers.list import list_clusters
+from aztk.spark.client.job.helpers.get import _get_job
+from aztk.utils import constants
+from tests.client.test_list_filters import FakeBatchClient, FakePoolOperations, make_job_operations
+
+pytestmark = pytest.mark.skipif(not os.environ.get("AZTK_BENCHMARK"), reason="set AZTK_BENCHMARK=1 to run benchmarks")
+
+serializer = Serializer({name: model for name, model in vars(batch_models).items() if isinstance(model, type)})
+
+
+class MeasuredPoolOperations(FakePoolOperations):
+    """Pool operations that count the bytes of JSON the service would send, honoring $select"""
+
+    def __init__(self, pool_count):
+        super().__init__(pool_count)
+        self.bytes = 0
+        for pool in self.pools:
+            # the start task of a cluster pool is the bulk of its properties
+            pool.start_task = batch_models.StartTask(
+                command_line="/bin/bash -c '{}'".format("x" * 2000),
+                resource_files=[
+                    batch_models.ResourceFile(
+                        blob_source="https://account.blob.core.windows.net/{}/file-{}?sas".format(pool.id, i),
+                        file_path="file-{}".format(i)) for i in range(3)
+                ],
+                environment_settings=[
+                    batch_models.EnvironmentSetting(name="SETTING_{}".format(i), value="v" * 40) for i in range(15)
+                ])
+        self.bodies = {pool.id: serializer.body(pool, "CloudPool") for pool in self.pools}
+
+    def list(self, pool_list_options=None):
+        select = pool_list_options.select.split(",") if pool_list_options and pool_list_options.select else None
+        for pool in super().list(pool_list_options):
+            body = self.bodies[pool.id]
+            if select:
+                body = {key: value for key, value in body.items() if key in select}
+            self.bytes += len(json.dumps(body))
+            yield pool
+
+
+def list_clusters_without_select(cluster_client, software_metadata_key):
+    """list_clusters before $select was sent to the service"""
+    pools = cluster_client.batch_client.pool.list()
+    software_metadata = (constants.AZTK_SOFTWARE_METADATA_KEY, software_metadata_key)
+    cluster_metadata = (constants.AZTK_MODE_METADATA_KEY, constants.AZTK_CLUSTER_MODE_METADATA)
+
+    aztk_clusters = []
+    for pool in [pool for pool in pools if pool.metadata]:
+        pool_metadata = [(metadata.name, metadata.value) for metadata in pool.metadata]
+        if all([metadata in pool_metadata for metadata in [software_metadata, cluster_metadata]]):
+            aztk_clusters.append(models.Cluster(pool))
+    return aztk_clusters
+
+
+def get_job_by_walking_pools(core_job_operations, job_id):
+    """_get_job before it read the pool of the recent job directly: every pool is listed until the job's is found"""
+    recent_run_job = core_job_operations.get_recent_job(job_id)
+    pool_prefix = recent_run_job.pool_info.auto_pool_specification.auto_pool_id_prefix
+    for cloud_pool in core_job_operations.batch_client.pool.list():
+        if pool_prefix in cloud_pool.id:
+            return None, None, cloud_pool, None
+    return None, None, None, None
+
+
+def test_benchmark_list_clusters():
+    pool_operations = MeasuredPoolOperations(10000)
+    results = {}
+    for name, list_function in [("without $select", list_clusters_without_select), ("with $select", list_clusters)]:
+        batch_client = FakeBatchClient(0)
+        batch_client.pool = pool_operations
+        pool_operations.bytes = 0
+        start = time.perf_counter()
+        clusters = list_function(SimpleNamespace(batch_client=batch_client), "spark")
+        results[name] = (len(clusters), batch_client.pool.bytes)
+        print("list clusters {}: {} clusters out of 10000 pools, {:.1f} MiB listed in {:.2f}s".format(
+            name, len(clusters), batch_client.pool.bytes / 1024**2,
+            time.perf_counter() - start))
+
+    assert results["with $select"][0] == results["without $select"][0]
+    assert results["with $select"][1] < results["without $select"][1]
+
+
+def test_benchmark_get_job():
+    recent_job = SimpleNamespace(
+        execution_info=SimpleNamespace(pool_id="pool-9999"),
+        pool_info=SimpleNamespace(auto_pool_specification=SimpleNamespace(auto_pool_id_prefix="pool-9999")))
+    pages = {}
+    for name, get_function in [("walking pools", get_job_by_walking_pools), ("direct", _get_job)]:
+        batch_client = FakeBatchClient(10000)
+        start = time.perf_counter()
+        _, _, pool, _ = get_function(make_job_operations(batch_client, recent_job), "job")
+        pages[name] = batch_client.pool.pages
+        print("get job {}: {} pages of pools, {} gets in {:.3f}s".format(name, batch_client.pool.pages,
+                                                                         len(batch_client.pool.gets),
+                                                                         time.perf_counter() - start))
+        assert pool.id == "pool-9999"
+
+    assert pages["direct"] < pages["walking pools"]
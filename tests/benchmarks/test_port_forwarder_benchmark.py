@@ -0,0 +1,93 @@
+import hashlib
+import os
+import select
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from aztk.utils import ssh
+from tests.utils.test_ssh import LoopbackTransport, echo_server    # pylint: disable=unused-import
+
+pytestmark = pytest.mark.skipif(not os.environ.get("AZTK_BENCHMARK"), reason="set AZTK_BENCHMARK=1 to run benchmarks")
+
+PAYLOAD_SIZE = 64 * 1024 * 1024
+
+
+class ThreadPerConnectionForwarder(socketserver.ThreadingTCPServer):
+    """Port forwarding before the selector based PortForwarder: a thread per connection, relaying 1 KiB reads"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ThreadPerConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        channel = self.server.transport.open_channel("direct-tcpip", self.server.destination,
+                                                     self.request.getpeername())
+        while True:
+            r, _, _ = select.select([self.request, channel], [], [])
+            if self.request in r:
+                data = self.request.recv(1024)
+                if not data:
+                    break
+                channel.send(data)
+            if channel in r:
+                data = channel.recv(1024)
+                if not data:
+                    break
+                self.request.send(data)
+        channel.close()
+        self.request.close()
+
+
+def forward_with_threads(echo_server):
+    server = ThreadPerConnectionForwarder(("127.0.0.1", 0), ThreadPerConnectionHandler)
+    server.transport = LoopbackTransport()
+    server.destination = ("127.0.0.1", echo_server)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+def forward_with_selector(echo_server):
+    forwarder = ssh.PortForwarder(LoopbackTransport())
+    port = forwarder.add_forward(0, "127.0.0.1", echo_server, bind_address="127.0.0.1")
+    forwarder.start()
+    return port, forwarder.close
+
+
+def echo_through(port, payload):
+    """Send payload through the forwarded port and read its echo, without half closing the connection, which the
+    thread per connection forwarder does not support"""
+    received = hashlib.sha256()
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        sender = threading.Thread(target=client.sendall, args=(payload,))
+        sender.start()
+        remaining = len(payload)
+        while remaining:
+            data = client.recv(min(remaining, 1024 * 1024))
+            if not data:
+                break
+            received.update(data)
+            remaining -= len(data)
+        sender.join()
+    return received.hexdigest()
+
+
+def test_benchmark_port_forwarder_throughput(echo_server):
+    payload = os.urandom(PAYLOAD_SIZE)
+    rates = {}
+    for name, forward in [("thread per connection", forward_with_threads), ("selector", forward_with_selector)]:
+        port, close = forward(echo_server)
+        start = time.perf_counter()
+        digest = echo_through(port, payload)
+        elapsed = time.perf_counter() - start
+        close()
+        assert digest == hashlib.sha256(payload).hexdigest()
+        rates[name] = PAYLOAD_SIZE / 1024**2 / elapsed
+        print("{}: forwarded {} MiB each way in {:.2f}s ({:.0f} MiB/s)".format(name, PAYLOAD_SIZE // 1024**2, elapsed,
+                                                                               rates[name]))
+
+    assert rates["selector"] > rates["thread per connection"]
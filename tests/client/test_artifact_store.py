@@ -0,0 +1,97 @@
+from aztk.client.base.helpers.artifact_store import ArtifactStore, FileHashIndex
+from tests.fakes import FakeBlobClient
+
+
+def test_files_with_the_same_content_are_stored_once(tmpdir):
+    blob_client = FakeBlobClient()
+    store = ArtifactStore(blob_client, index=FileHashIndex(str(tmpdir.join("index.json"))))
+    tmpdir.join("a.jar").write("jar")
+    tmpdir.join("copy.jar").write("jar")
+
+    first = store.upload(str(tmpdir.join("a.jar")))
+    second = store.upload(str(tmpdir.join("copy.jar")))
+
+    assert len(blob_client.uploads) == 1
+    assert first.blob_source == second.blob_source
+    assert "/aztk-artifacts/sha256/" in first.blob_source
+    assert (first.file_path, second.file_path) == ("a.jar", "copy.jar")
+
+
+def test_resubmitting_unchanged_files_uploads_nothing(tmpdir):
+    blob_client = FakeBlobClient()
+    index_path = str(tmpdir.join("index.json"))
+    tmpdir.join("app.py").write("print(1)")
+
+    ArtifactStore(blob_client, index=FileHashIndex(index_path)).upload(str(tmpdir.join("app.py")))
+    # a new client reuses the blob already stored by the previous one
+    ArtifactStore(blob_client, index=FileHashIndex(index_path)).upload(str(tmpdir.join("app.py")))
+
+    assert len(blob_client.uploads) == 1
+
+
+def test_changed_files_are_hashed_and_stored_again(tmpdir):
+    blob_client = FakeBlobClient()
+    store = ArtifactStore(blob_client, index=FileHashIndex(str(tmpdir.join("index.json"))))
+    app = tmpdir.join("app.py")
+    app.write("print(1)")
+    first = store.upload(str(app))
+
+    app.write("print(22)")
+    second = store.upload(str(app))
+
+    assert len(blob_client.uploads) == 2
+    assert first.blob_source != second.blob_source
+
+
+def test_unchanged_files_are_not_hashed_again(tmpdir, monkeypatch):
+    index = FileHashIndex(str(tmpdir.join("index.json")))
+    tmpdir.join("app.py").write("print(1)")
+    sha256 = index.get_sha256(str(tmpdir.join("app.py")))
+
+    monkeypatch.setattr(FileHashIndex, "_hash", staticmethod(lambda file_path: "rehashed"))
+
+    assert FileHashIndex(index.path).get_sha256(str(tmpdir.join("app.py"))) == sha256
+
+
+def test_prune_deletes_files_unused_since_their_links_expired(tmpdir):
+    blob_client = FakeBlobClient()
+    store = ArtifactStore(blob_client, index=FileHashIndex(str(tmpdir.join("index.json"))))
+    tmpdir.join("old.py").write("print(1)")
+    tmpdir.join("reused.py").write("print(2)")
+    old, reused = ("sha256/" + store.index.get_sha256(str(tmpdir.join(name))) for name in ("old.py", "reused.py"))
+    store.upload(str(tmpdir.join("old.py")))
+    store.upload(str(tmpdir.join("reused.py")))
+    blob_client.put("aztk-artifacts", "node-scripts/0.1/bundle.zip")
+    for blob_name in (old, reused, "node-scripts/0.1/bundle.zip"):
+        blob_client.age("aztk-artifacts", blob_name, 30)
+    # reusing a stored file marks it as used
+    ArtifactStore(
+        blob_client, index=FileHashIndex(str(tmpdir.join("index.json")))).upload(str(tmpdir.join("reused.py")))
+
+    assert store.prune() == [old]
+    assert ("aztk-artifacts", reused) in blob_client.blobs
+    assert ("aztk-artifacts", "node-scripts/0.1/bundle.zip") in blob_client.blobs
+
+    # a pruned file is uploaded again
+    store.upload(str(tmpdir.join("old.py")))
+    assert len(blob_client.uploads) == 3
+
+
+def test_prune_keeps_files_reused_while_pruning(tmpdir):
+    blob_client = FakeBlobClient()
+    store = ArtifactStore(blob_client, index=FileHashIndex(str(tmpdir.join("index.json"))))
+    tmpdir.join("app.py").write("print(1)")
+    blob_name = "sha256/" + store.index.get_sha256(str(tmpdir.join("app.py")))
+    store.upload(str(tmpdir.join("app.py")))
+    blob_client.age("aztk-artifacts", blob_name, 30)
+    list_blobs = blob_client.list_blobs
+
+    def list_then_reuse(container_name):
+        blobs = list_blobs(container_name)
+        blob_client.set_blob_metadata("aztk-artifacts", blob_name)
+        return blobs
+
+    blob_client.list_blobs = list_then_reuse
+
+    assert store.prune() == []
+    assert ("aztk-artifacts", blob_name) in blob_client.blobs
@@ -0,0 +1,137 @@
+import os
+import stat
+import time
+
+import pytest
+
+from aztk.client.base.helpers.cluster_credentials import ClusterCredentialManager
+from aztk.error import AztkError
+
+
+class FakeNode:
+    def __init__(self, id, last_boot_time="boot-1"):
+        self.id = id
+        self.last_boot_time = last_boot_time
+
+
+class FakeConnectionPool:
+    def __init__(self):
+        self.evicted = []
+
+    def evict_user(self, username):
+        self.evicted.append(username)
+
+
+class FakeOperations:
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+        self.failing_nodes = set()
+        self.ssh_connection_pool = FakeConnectionPool()
+
+    def create_user_on_node(self, id, node_id, username, ssh_key=None, password=None, expiry_time=None):
+        if node_id in self.failing_nodes:
+            raise ValueError("node is not ready")
+        self.created.append((node_id, username))
+
+    def delete_user_on_node(self, id, node_id, username):
+        self.deleted.append((node_id, username))
+
+
+def test_credentials_are_reused_across_operations(tmpdir):
+    manager = ClusterCredentialManager(path=str(tmpdir))
+    operations = FakeOperations()
+    nodes = [FakeNode("node1"), FakeNode("node2")]
+
+    first = manager.get(operations, "cluster", nodes)
+    second = manager.get(operations, "cluster", nodes)
+
+    assert first == second
+    assert sorted(node_id for node_id, _ in operations.created) == ["node1", "node2"]
+    assert operations.deleted == []
+
+
+def test_credentials_are_created_on_new_and_rebooted_nodes_only(tmpdir):
+    manager = ClusterCredentialManager(path=str(tmpdir))
+    operations = FakeOperations()
+    manager.get(operations, "cluster", [FakeNode("node1"), FakeNode("node2")])
+    operations.created.clear()
+
+    manager.get(operations, "cluster", [FakeNode("node1"), FakeNode("node2", "boot-2"), FakeNode("node3")])
+
+    assert sorted(node_id for node_id, _ in operations.created) == ["node2", "node3"]
+
+
+def test_expired_credentials_are_replaced_and_deleted(tmpdir):
+    manager = ClusterCredentialManager(ttl=0.1, path=str(tmpdir))
+    operations = FakeOperations()
+    nodes = [FakeNode("node1")]
+    username, _ = manager.get(operations, "cluster", nodes)
+    time.sleep(0.15)
+
+    new_username, _ = manager.get(operations, "cluster", nodes)
+
+    assert new_username != username
+    assert operations.deleted == [("node1", username)]
+    assert operations.ssh_connection_pool.evicted == [username]
+
+
+def test_node_credentials_do_not_forget_other_nodes(tmpdir):
+    manager = ClusterCredentialManager(path=str(tmpdir))
+    operations = FakeOperations()
+    nodes = [FakeNode("node1"), FakeNode("node2")]
+    manager.get(operations, "cluster", nodes)
+
+    manager.get(operations, "cluster", nodes[:1], prune=False)
+    manager.get(operations, "cluster", nodes)
+
+    assert len(operations.created) == 2
+
+
+def test_credentials_are_reused_across_processes(tmpdir):
+    operations = FakeOperations()
+    nodes = [FakeNode("node1"), FakeNode("node2")]
+    username, ssh_key = ClusterCredentialManager(path=str(tmpdir)).get(operations, "cluster", nodes)
+
+    # a new manager stands for another CLI command
+    other_username, other_ssh_key = ClusterCredentialManager(path=str(tmpdir)).get(operations, "cluster", nodes)
+
+    assert (other_username, other_ssh_key.exportKey()) == (username, ssh_key.exportKey())
+    assert len(operations.created) == 2
+    for file_name in os.listdir(str(tmpdir)):
+        assert stat.S_IMODE(os.stat(str(tmpdir.join(file_name))).st_mode) == 0o600
+
+
+def test_credentials_are_per_account(tmpdir):
+    operations = FakeOperations()
+    nodes = [FakeNode("node1")]
+    first, _ = ClusterCredentialManager(path=str(tmpdir), account="a").get(operations, "cluster", nodes)
+    second, _ = ClusterCredentialManager(path=str(tmpdir), account="b").get(operations, "cluster", nodes)
+
+    assert first != second
+
+
+def test_invalidated_credentials_are_forgotten_on_disk(tmpdir):
+    operations = FakeOperations()
+    nodes = [FakeNode("node1")]
+    username, _ = ClusterCredentialManager(path=str(tmpdir)).get(operations, "cluster", nodes)
+
+    ClusterCredentialManager(path=str(tmpdir)).invalidate(operations, "cluster")
+    new_username, _ = ClusterCredentialManager(path=str(tmpdir)).get(operations, "cluster", nodes)
+
+    assert operations.deleted == [("node1", username)]
+    assert new_username != username
+
+
+def test_user_creation_failures_are_raised_and_retried(tmpdir):
+    manager = ClusterCredentialManager(path=str(tmpdir))
+    operations = FakeOperations()
+    operations.failing_nodes.add("node2")
+    nodes = [FakeNode("node1"), FakeNode("node2")]
+
+    with pytest.raises(AztkError, match="node2: node is not ready"):
+        manager.get(operations, "cluster", nodes)
+    operations.failing_nodes.clear()
+    manager.get(operations, "cluster", nodes)
+
+    assert sorted(node_id for node_id, _ in operations.created) == ["node1", "node2"]
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import azure.batch.models as batch_models
+
+from aztk.client.cluster.helpers.list import CLUSTER_POOL_SELECT, list_clusters
+from aztk.spark.client.job.helpers.get import _get_job
+from aztk.utils import constants
+
+PAGE_SIZE = 1000
+
+
+def make_pool(index, aztk_cluster):
+    metadata = [
+        batch_models.MetadataItem(name=constants.AZTK_SOFTWARE_METADATA_KEY, value="spark"),
+        batch_models.MetadataItem(name=constants.AZTK_MODE_METADATA_KEY, value=constants.AZTK_CLUSTER_MODE_METADATA),
+    ] if aztk_cluster else None
+    return batch_models.CloudPool(
+        id="pool-{}".format(index),
+        state=batch_models.PoolState.active,
+        allocation_state=batch_models.AllocationState.steady,
+        vm_size="standard_f2",
+        current_dedicated_nodes=1,
+        current_low_priority_nodes=0,
+        target_dedicated_nodes=1,
+        target_low_priority_nodes=0,
+        metadata=metadata,
+    )
+
+
+class FakePoolOperations:
+    """Pool operations of a synthetic account that pages its results like the service"""
+
+    def __init__(self, pool_count):
+        self.pools = [make_pool(i, aztk_cluster=i % 100 == 0) for i in range(pool_count)]
+        self.list_options = []
+        self.pages = 0
+        self.gets = []
+
+    def list(self, pool_list_options=None):
+        self.list_options.append(pool_list_options)
+        pools = self.pools
+        if pool_list_options and pool_list_options.filter:
+            prefix = pool_list_options.filter.split("'")[1]
+            pools = [pool for pool in pools if pool.id.startswith(prefix)]
+        for start in range(0, len(pools), PAGE_SIZE):
+            self.pages += 1
+            yield from pools[start:start + PAGE_SIZE]
+
+    def get(self, pool_id):
+        self.gets.append(pool_id)
+        return next(pool for pool in self.pools if pool.id == pool_id)
+
+
+class FakeBatchClient:
+    def __init__(self, pool_count):
+        self.pool = FakePoolOperations(pool_count)
+        self.job_schedule = SimpleNamespace(get=lambda job_id: SimpleNamespace(id=job_id))
+        self.compute_node = SimpleNamespace(list=lambda pool_id: [])
+
+
+def test_list_clusters_selects_only_cluster_properties():
+    batch_client = FakeBatchClient(10000)
+
+    clusters = list_clusters(SimpleNamespace(batch_client=batch_client), "spark")
+
+    assert len(clusters) == 100
+    assert batch_client.pool.list_options[0].select == CLUSTER_POOL_SELECT
+
+
+def make_job_operations(batch_client, recent_job):
+    return SimpleNamespace(
+        batch_client=batch_client, list_tasks=lambda id: [], get_recent_job=lambda job_id: recent_job)
+
+
+def test_get_job_reads_the_pool_of_the_recent_job_directly():
+    batch_client = FakeBatchClient(10000)
+    recent_job = SimpleNamespace(execution_info=SimpleNamespace(pool_id="pool-9999"))
+
+    _, _, pool, _ = _get_job(make_job_operations(batch_client, recent_job), "job")
+
+    assert pool.id == "pool-9999"
+    assert batch_client.pool.gets == ["pool-9999"]
+    assert batch_client.pool.pages == 0
+
+
+def test_get_job_filters_pools_by_prefix_without_execution_info():
+    batch_client = FakeBatchClient(10000)
+    recent_job = SimpleNamespace(
+        execution_info=None,
+        pool_info=SimpleNamespace(auto_pool_specification=SimpleNamespace(auto_pool_id_prefix="pool-9999")))
+
+    _, _, pool, _ = _get_job(make_job_operations(batch_client, recent_job), "job")
+
+    assert pool.id == "pool-9999"
+    assert batch_client.pool.list_options[0].filter == "startswith(id, 'pool-9999')"
+    assert batch_client.pool.pages == 1
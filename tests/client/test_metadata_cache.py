@@ -0,0 +1,62 @@
+from aztk.client.base.helpers.metadata_cache import MetadataCache
+
+
+class Fetcher:
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.calls = []
+        self.version = 0
+
+    def __call__(self, etag):
+        self.calls.append(etag)
+        if etag is not None and etag == self.etag:
+            return None
+        self.version += 1
+        return "value-{}".format(self.version), self.etag
+
+
+def test_cached_reads_are_served_from_memory_within_ttl():
+    cache = MetadataCache(ttl=60)
+    fetch = Fetcher()
+
+    assert cache.get(("pool", "cluster"), fetch) == "value-1"
+    assert cache.get(("pool", "cluster"), fetch) == "value-1"
+    assert fetch.calls == [None]
+
+
+def test_fresh_reads_revalidate_with_etag():
+    cache = MetadataCache(ttl=60)
+    fetch = Fetcher(etag="etag-1")
+
+    assert cache.get(("pool", "cluster"), fetch) == "value-1"
+    assert cache.get(("pool", "cluster"), fetch, cached=False) == "value-1"
+    assert fetch.calls == [None, "etag-1"]
+
+    fetch.etag = "etag-2"
+    assert cache.get(("pool", "cluster"), fetch, cached=False) == "value-2"
+
+
+def test_expired_entries_are_fetched_again():
+    cache = MetadataCache(ttl=0)
+    fetch = Fetcher()
+
+    cache.get(("nodes", "cluster"), fetch)
+    cache.get(("nodes", "cluster"), fetch)
+    assert fetch.calls == [None, None]
+
+
+def test_invalidate_drops_only_entries_of_the_cluster():
+    cache = MetadataCache(ttl=60)
+    fetch = Fetcher()
+    other = Fetcher()
+
+    cache.get(("pool", "cluster"), fetch)
+    cache.get(("node", "cluster", "node1"), fetch)
+    cache.get(("pool", "other"), other)
+    cache.invalidate("cluster")
+
+    cache.get(("pool", "cluster"), fetch)
+    cache.get(("node", "cluster", "node1"), fetch)
+    cache.get(("pool", "other"), other)
+    assert len(fetch.calls) == 4
+    assert len(other.calls) == 1
@@ -0,0 +1,36 @@
+import io
+import zipfile
+
+from aztk.internal.cluster_data import ClusterData
+from aztk.internal.cluster_data import node_data
+from aztk.internal.cluster_data.node_data import NodeScriptsBundle
+from tests.fakes import FakeBlobClient
+
+
+def test_bundle_is_reproducible(tmpdir):
+    tmpdir.join("setup_host.sh").write("echo setup\r\n")
+    tmpdir.mkdir("install").join("install.py").write("print('install')")
+    tmpdir.join("install", "install.pyc").write("compiled")
+
+    bundle = NodeScriptsBundle.build(str(tmpdir))
+    tmpdir.join("setup_host.sh").setmtime(0)
+
+    assert NodeScriptsBundle.build(str(tmpdir)).sha256 == bundle.sha256
+    with zipfile.ZipFile(io.BytesIO(bundle.data)) as zipf:
+        assert zipf.namelist() == ["aztk/setup_host.sh", "aztk/install/install.py"]
+        assert zipf.read("aztk/setup_host.sh") == b"echo setup\n"
+
+
+def test_bundle_is_uploaded_once_per_client(monkeypatch):
+    bundle = NodeScriptsBundle(b"bundle")
+    monkeypatch.setattr(node_data, "get_node_scripts_bundle", lambda: bundle)
+    monkeypatch.setattr("aztk.internal.cluster_data.cluster_data.get_node_scripts_bundle", lambda: bundle)
+    blob_client = FakeBlobClient()
+
+    first = ClusterData(blob_client, "cluster-1").upload_node_scripts()
+    blob_client.set_blob_metadata = lambda container_name, blob_name, metadata=None: 1 / 0
+    second = ClusterData(blob_client, "cluster-2").upload_node_scripts()
+
+    assert [blob.content for blob in blob_client.blobs.values()] == [b"bundle"]
+    assert first.container == second.container
+    assert first.blob == second.blob == bundle.blob_name
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from aztk.client.base.helpers.get_remote_login_settings import get_remote_login_settings_for_cluster
+from aztk.client.base.helpers.metadata_cache import MetadataCache
+
+
+class FakeRemoteLoginSettings:
+    def __init__(self, node_id):
+        self.remote_login_ip_address = "10.0.0.1"
+        self.remote_login_port = 50000 + int(node_id.split("-")[1])
+
+
+class FakeComputeNodeOperations:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_remote_login_settings(self, pool_id, node_id):
+        with self._lock:
+            self.calls.append(node_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return FakeRemoteLoginSettings(node_id)
+
+
+class FakeBatchClient:
+    def __init__(self):
+        self.compute_node = FakeComputeNodeOperations()
+
+
+class FakeOperations:
+    def __init__(self):
+        self.batch_client = FakeBatchClient()
+        self.metadata_cache = MetadataCache()
+
+
+def test_nodes_are_resolved_concurrently_within_bound():
+    operations = FakeOperations()
+    node_ids = ["node-{}".format(i) for i in range(20)]
+
+    settings = get_remote_login_settings_for_cluster(operations, "cluster", node_ids, max_workers=5)
+
+    assert list(settings) == node_ids
+    assert settings["node-7"].port == "50007"
+    assert 1 < operations.batch_client.compute_node.max_in_flight <= 5
+
+
+def test_settings_are_cached_per_node():
+    operations = FakeOperations()
+
+    get_remote_login_settings_for_cluster(operations, "cluster", ["node-1", "node-2"])
+    get_remote_login_settings_for_cluster(operations, "cluster", ["node-1", "node-2", "node-3"])
+
+    assert sorted(operations.batch_client.compute_node.calls) == ["node-1", "node-2", "node-3"]
+
+
+def test_settings_are_dropped_when_cluster_is_invalidated():
+    operations = FakeOperations()
+
+    get_remote_login_settings_for_cluster(operations, "cluster", ["node-1"])
+    operations.metadata_cache.invalidate("cluster")
+    get_remote_login_settings_for_cluster(operations, "cluster", ["node-1"])
+
+    assert operations.batch_client.compute_node.calls == ["node-1", "node-1"]
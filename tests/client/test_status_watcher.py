@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import azure.batch.models as batch_models
+
+from aztk.client.base.helpers.metadata_cache import MetadataCache
+from aztk.client.status_watcher import StatusWatcher
+from aztk.models import SchedulingTarget
+
+
+class FakeBatchClient:
+    def __init__(self):
+        self.pools = {}
+        self.tasks = {}
+        self.requests = []
+        self.pool = SimpleNamespace(list=self.list_pools)
+        self.task = SimpleNamespace(list=self.list_tasks)
+
+    def list_pools(self, pool_list_options=None):
+        self.requests.append(("pool.list", pool_list_options.filter))
+        return [
+            SimpleNamespace(id=id, state=batch_models.PoolState.active, allocation_state=state)
+            for id, state in self.pools.items() if "'{}'".format(id) in pool_list_options.filter
+        ]
+
+    def list_tasks(self, job_id, task_list_options=None):
+        self.requests.append(("task.list", job_id))
+        return [SimpleNamespace(id=id, state=state) for id, state in self.tasks.get(job_id, {}).items()]
+
+
+class FakeOperations:
+    def __init__(self):
+        self.batch_client = FakeBatchClient()
+        self.metadata_cache = MetadataCache()
+
+    def get_cluster_data(self, id):
+        configuration = SimpleNamespace(scheduling_target=SchedulingTarget.Any)
+        return SimpleNamespace(read_cluster_config_if_modified=lambda etag: (configuration, None))
+
+
+def test_subscriptions_are_merged_into_one_request_per_list():
+    operations = FakeOperations()
+    operations.batch_client.pools = {"a": batch_models.AllocationState.steady, "b": batch_models.AllocationState.steady}
+    operations.batch_client.tasks = {"a": {"app-{}".format(i): batch_models.TaskState.running for i in range(10)}}
+    watcher = StatusWatcher(operations)
+
+    for _ in range(5):
+        watcher.watch_cluster("a")
+        watcher.watch_cluster("b")
+    for i in range(10):
+        watcher.watch_application("a", "app-{}".format(i))
+    watcher.poll()
+
+    assert len(operations.batch_client.requests) == 2
+
+
+def test_events_are_delivered_on_state_change_only():
+    operations = FakeOperations()
+    operations.batch_client.tasks = {"a": {"app": batch_models.TaskState.running}}
+    watcher = StatusWatcher(operations)
+    events = []
+    watcher.watch_application("a", "app", callback=events.append)
+    iterated = watcher.watch_application("a")
+
+    watcher.poll()
+    watcher.poll()
+    operations.batch_client.tasks["a"]["app"] = batch_models.TaskState.completed
+    watcher.poll()
+    operations.batch_client.tasks["a"] = {}
+    watcher.poll()
+
+    assert [(event.previous_state, event.state) for event in events] == [(None, "running"), ("running", "completed"),
+                                                                           ("completed", None)]
+    assert len(list(iterated.events(timeout=0))) == 3
+    iterated.cancel()
+    assert list(iterated.events(timeout=0)) == []
+
+
+def test_cancelled_subscriptions_stop_polling():
+    operations = FakeOperations()
+    watcher = StatusWatcher(operations)
+
+    watcher.watch_cluster("a").cancel()
+    watcher.poll()
+
+    assert operations.batch_client.requests == []
+
+
+def test_new_subscribers_receive_known_states():
+    operations = FakeOperations()
+    operations.batch_client.pools = {"a": batch_models.AllocationState.resizing}
+    watcher = StatusWatcher(operations)
+    watcher.watch_cluster("a")
+    watcher.poll()
+
+    events = []
+    watcher.watch_cluster("a", callback=events.append)
+
+    assert [event.state for event in events] == ["resizing"]
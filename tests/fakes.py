@@ -0,0 +1,115 @@
+import collections
+import datetime
+import threading
+from types import SimpleNamespace
+
+import azure.common
+
+Blob = collections.namedtuple("Blob", ["content", "last_modified"])
+Upload = collections.namedtuple("Upload",
+                                ["container", "blob", "content", "count", "max_connections", "validate_content"])
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class FakeBlobClient:
+    """
+    In-memory stand-in for azure.storage.blob.BlockBlobService.
+
+    Uploads to a container that was not created fail like they do against storage,
+    `uploads` records every upload and `generated` every shared access signature
+    as (container, blob, lifetime rounded to days).
+    """
+
+    def __init__(self):
+        self.containers = set()
+        self.create_container_calls = 0
+        self.blobs = {}
+        self.uploads = []
+        self.generated = []
+        self._lock = threading.Lock()
+
+    def create_container(self, container_name, fail_on_exist=False):
+        with self._lock:
+            self.create_container_calls += 1
+            self.containers.add(container_name)
+
+    def put(self, container_name, blob_name, content=b"", last_modified=None):
+        self.blobs[(container_name, blob_name)] = Blob(content, last_modified or now())
+
+    def age(self, container_name, blob_name, days):
+        key = (container_name, blob_name)
+        self.blobs[key] = self.blobs[key]._replace(
+            last_modified=self.blobs[key].last_modified - datetime.timedelta(days=days))
+
+    def _upload(self, container_name, blob_name, content, count=None, max_connections=2, validate_content=False):
+        with self._lock:
+            if container_name not in self.containers:
+                raise azure.common.AzureMissingResourceHttpError("ContainerNotFound", 404)
+            self.uploads.append(Upload(container_name, blob_name, content, count, max_connections, validate_content))
+            self.put(container_name, blob_name, content)
+
+    def create_blob_from_path(self, container_name, blob_name, file_path, max_connections=2, **kwargs):
+        self._upload(
+            container_name,
+            blob_name,
+            file_path,
+            max_connections=max_connections,
+            validate_content=kwargs.get("validate_content", False))
+        progress_callback = kwargs.get("progress_callback")
+        if progress_callback:
+            for current in (0, 50, 100):
+                progress_callback(current, 100)
+
+    def create_blob_from_stream(self, container_name, blob_name, stream, count=None, max_connections=2, **kwargs):
+        # storage reads part of the stream before it finds out that the container is missing
+        data = stream.read(1)
+        if container_name not in self.containers:
+            raise azure.common.AzureMissingResourceHttpError("ContainerNotFound", 404)
+        self._upload(container_name, blob_name, data + stream.read(), count=count, max_connections=max_connections)
+
+    def create_blob_from_bytes(self, container_name, blob_name, blob, **kwargs):
+        self._upload(container_name, blob_name, blob)
+
+    def create_blob_from_text(self, container_name, blob_name, text, **kwargs):
+        self._upload(container_name, blob_name, text)
+
+    def set_blob_metadata(self, container_name, blob_name, metadata=None):
+        with self._lock:
+            if (container_name, blob_name) not in self.blobs:
+                raise azure.common.AzureMissingResourceHttpError("Not found", 404)
+            self.put(container_name, blob_name, self.blobs[(container_name, blob_name)].content)
+
+    def list_blobs(self, container_name):
+        return [
+            SimpleNamespace(name=blob_name, properties=SimpleNamespace(last_modified=blob.last_modified))
+            for (container, blob_name), blob in self.blobs.items()
+            if container == container_name
+        ]
+
+    def delete_blob(self, container_name, blob_name, if_unmodified_since=None):
+        blob = self.blobs.get((container_name, blob_name))
+        if blob is None:
+            raise azure.common.AzureMissingResourceHttpError("Not found", 404)
+        if if_unmodified_since and blob.last_modified > if_unmodified_since:
+            raise azure.common.AzureHttpError("Precondition failed", 412)
+        del self.blobs[(container_name, blob_name)]
+
+    def generate_container_shared_access_signature(self, container_name, permission=None, expiry=None):
+        with self._lock:
+            self.generated.append((container_name, None, self._lifetime(expiry)))
+            return "container-sas-{}".format(len(self.generated))
+
+    def generate_blob_shared_access_signature(self, container_name, blob_name, permission=None, expiry=None):
+        with self._lock:
+            self.generated.append((container_name, blob_name, self._lifetime(expiry)))
+            return "blob-sas-{}".format(len(self.generated))
+
+    @staticmethod
+    def _lifetime(expiry):
+        return datetime.timedelta(days=round((expiry - datetime.datetime.utcnow()) / datetime.timedelta(days=1)))
+
+    def make_blob_url(self, container_name, blob_name, sas_token=None):
+        return "https://account/{}/{}?{}".format(container_name, blob_name, sas_token)
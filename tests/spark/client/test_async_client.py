@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import azure.batch.models as batch_models
+
+from aztk.spark.client.cluster import AsyncClusterOperations
+
+
+class FakeClusterOperations:
+    def __init__(self, batch_client=None):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._core_cluster_operations = SimpleNamespace(batch_client=batch_client)
+
+    def get(self, id, cached=False):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.1)
+        with self._lock:
+            self.in_flight -= 1
+        return id
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_calls_run_concurrently_without_blocking_the_loop():
+    operations = FakeClusterOperations()
+    cluster = AsyncClusterOperations(operations, ThreadPoolExecutor(max_workers=8))
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(time.time())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        results = await asyncio.gather(*[cluster.get("cluster-{}".format(i)) for i in range(8)], tick())
+        return results[:8]
+
+    start = time.time()
+    results = run(main())
+
+    assert results == ["cluster-{}".format(i) for i in range(8)]
+    assert operations.max_in_flight == 8
+    assert time.time() - start < 0.5
+    assert len(ticks) == 5
+
+
+class FakeTaskOperations:
+    def __init__(self, ticks):
+        self.ticks = iter(ticks)
+
+    def list(self, job_id, task_list_options=None):
+        return [SimpleNamespace(id=id, state=batch_models.TaskState.running) for id in next(self.ticks)]
+
+
+def test_wait_polls_all_applications_with_one_list_call():
+    batch_client = SimpleNamespace(task=FakeTaskOperations([["app-1", "app-2"], ["app-2"], []]))
+    cluster = AsyncClusterOperations(FakeClusterOperations(batch_client), ThreadPoolExecutor(max_workers=2))
+
+    run(asyncio.wait_for(cluster.wait("cluster", ["app-1", "app-2"]), 10))
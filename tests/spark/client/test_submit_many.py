@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from aztk.client.base.helpers.artifact_store import ArtifactStore, FileHashIndex
+from aztk import models as base_models
+from aztk.error import AztkError
+from aztk.spark import models
+from aztk.spark.client.base import SparkBaseOperations
+from aztk.spark.client.base.helpers.generate_application_task import generate_application_tasks
+from aztk.spark.client.cluster.helpers import submit
+from tests.fakes import FakeBlobClient
+
+
+def make_applications(tmpdir, count):
+    shared_jar = tmpdir.join("shared.jar")
+    shared_jar.write("jar")
+    applications = []
+    for i in range(count):
+        app = tmpdir.join("app{}.py".format(i))
+        app.write("print({})".format(i))
+        applications.append(
+            models.ApplicationConfiguration(name="app-{}".format(i), application=str(app), jars=[str(shared_jar)]))
+    return applications
+
+
+def test_shared_files_are_uploaded_once(tmpdir):
+    blob_client = FakeBlobClient()
+    core_operations = SimpleNamespace(
+        blob_client=blob_client,
+        artifact_store=ArtifactStore(blob_client, index=FileHashIndex(str(tmpdir.join("index.json")))))
+
+    tasks = generate_application_tasks(SparkBaseOperations(), core_operations, "cluster", make_applications(tmpdir, 20))
+
+    assert [task.id for task in tasks] == ["app-{}".format(i) for i in range(20)]
+    assert len([upload for upload in blob_client.uploads if upload.container == "aztk-artifacts"]) == 21
+    assert all(len(task.resource_files) == 3 for task in tasks)
+
+
+def test_submit_applications_rejects_duplicate_names(tmpdir):
+    applications = make_applications(tmpdir, 2)
+    applications[1].name = applications[0].name
+
+    with pytest.raises(AztkError):
+        submit.submit_applications(None, None, "cluster", applications)
+
+
+def test_scheduled_applications_are_added_in_bulk_and_started_in_one_session(tmpdir, monkeypatch):
+    added = []
+    scripts = []
+    batch_client = SimpleNamespace(task=SimpleNamespace(
+        add=lambda *args, **kwargs: 1 / 0,
+        add_collection=lambda job_id, tasks: added.append(tasks) or SimpleNamespace(
+            value=[SimpleNamespace(task_id=task.id, status="success") for task in tasks])))
+    core_operations = SimpleNamespace(
+        blob_client=FakeBlobClient(),
+        batch_client=batch_client,
+        ssh_connection_pool=None,
+        get_remote_login_settings=
+        lambda cluster_id, node_id: base_models.RemoteLogin(ip_address="10.0.0.4", port="50000"),
+        get_cluster_credentials=lambda cluster_id, nodes, prune: ("aztk-user", SshKey()))
+    spark_operations = SimpleNamespace(get=lambda cluster_id, cached: SimpleNamespace(master_node_id="master"))
+    monkeypatch.setattr(
+        submit.metadata_cache, "get_node", lambda core, cluster_id, node_id: SimpleNamespace(id=node_id))
+
+    def node_exec_script(node_id, script, *args, **kwargs):
+        scripts.append((node_id, script))
+        return SimpleNamespace(error=None)
+
+    monkeypatch.setattr(submit.ssh_lib, "node_exec_script", node_exec_script)
+    tasks = [SimpleNamespace(id="app-{}".format(i)) for i in range(250)]
+
+    submit.schedule_many_with_target(core_operations, spark_operations, "cluster", models.SchedulingTarget.Master,
+                                     tasks, False)
+
+    assert sorted(task.id for chunk in added for task in chunk) == sorted(task.id for task in tasks)
+    assert [node_id for node_id, _ in scripts] == ["master"]
+    assert scripts[0][1].count("submit.py") == 250
+
+
+class SshKey:
+    def exportKey(self):
+        return b"key"
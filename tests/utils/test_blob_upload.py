@@ -0,0 +1,69 @@
+import io
+
+import pytest
+
+from aztk.utils import blob_upload
+from tests.fakes import FakeBlobClient
+
+
+def test_container_is_created_once_per_client(tmpdir):
+    blob_client = FakeBlobClient()
+    tmpdir.join("file").write("content")
+
+    for i in range(3):
+        blob_upload.upload_file(blob_client, "container", "blob-{}".format(i), str(tmpdir.join("file")))
+
+    assert blob_client.create_container_calls == 1
+    assert blob_client.uploads[0][1:] == ("blob-0", str(tmpdir.join("file")), None, 8, True)
+
+
+def test_deleted_container_is_created_again(tmpdir):
+    blob_client = FakeBlobClient()
+    tmpdir.join("file").write("content")
+    blob_upload.upload_file(blob_client, "container", "blob", str(tmpdir.join("file")))
+
+    blob_client.containers.clear()
+    blob_upload.upload_file(blob_client, "container", "blob", str(tmpdir.join("file")))
+
+    assert blob_client.create_container_calls == 2
+    assert len(blob_client.uploads) == 2
+
+
+def test_progress_is_reported(tmpdir):
+    blob_client = FakeBlobClient()
+    reports = []
+
+    blob_upload.upload_file(
+        blob_client,
+        "container",
+        "blob",
+        "file",
+        progress_callback=
+        lambda progress: reports.append((progress.file_path, progress.current, progress.total, progress.done)))
+
+    assert reports == [("file", 0, 100, False), ("file", 50, 100, False), ("file", 100, 100, True)]
+
+
+def test_failed_container_creation_is_not_remembered():
+    blob_client = FakeBlobClient()
+    blob_client.create_container = lambda container_name, fail_on_exist=False: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        blob_upload.ensure_container(blob_client, "container")
+    blob_client.create_container = FakeBlobClient.create_container.__get__(blob_client)
+    blob_upload.ensure_container(blob_client, "container")
+
+    assert blob_client.containers == {"container"}
+
+
+def test_stream_is_rewound_when_container_is_created_again():
+    blob_client = FakeBlobClient()
+    blob_upload.upload_stream(blob_client, "container", "blob", io.BytesIO(b"content"), 7)
+
+    blob_client.containers.clear()
+    stream = io.BytesIO(b"--content")
+    stream.seek(2)
+    blob_upload.upload_stream(blob_client, "container", "blob", stream, 7)
+
+    assert [upload.content for upload in blob_client.uploads] == [b"content", b"content"]
+    assert [upload.count for upload in blob_client.uploads] == [7, 7]
@@ -0,0 +1,31 @@
+import json
+import os
+import stat
+
+import pytest
+
+from aztk.utils import file_utils
+
+
+def test_write_json_atomic_replaces_the_file_readable_by_the_user_only(tmpdir):
+    path = str(tmpdir.join("cache", "entries.json"))
+
+    file_utils.write_json_atomic(path, {"a": 1})
+    file_utils.write_json_atomic(path, {"b": 2})
+
+    with open(path, "r", encoding="UTF-8") as stream:
+        assert json.load(stream) == {"b": 2}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(str(tmpdir.join("cache"))) == ["entries.json"]
+
+
+def test_write_json_atomic_keeps_the_previous_file_when_writing_fails(tmpdir):
+    path = str(tmpdir.join("entries.json"))
+    file_utils.write_json_atomic(path, {"a": 1})
+
+    with pytest.raises(TypeError):
+        file_utils.write_json_atomic(path, {"a": object()})
+
+    with open(path, "r", encoding="UTF-8") as stream:
+        assert json.load(stream) == {"a": 1}
+    assert os.listdir(str(tmpdir)) == ["entries.json"]
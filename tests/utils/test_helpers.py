@@ -1,3 +1,7 @@
+import azure.batch.models as batch_models
+import pytest
+
+from aztk.error import AztkError
 from aztk.utils import helpers
 
 
@@ -6,3 +10,80 @@ def test_bool_env():
     assert helpers.bool_env(False) == "false"
     assert helpers.bool_env(None) == "false"
     assert helpers.bool_env("some") == "false"
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeBatchErrorException(batch_models.BatchErrorException):
+    def __init__(self, status_code):
+        Exception.__init__(self)
+        self.response = FakeResponse(status_code)
+
+
+class FakeTaskOperations:
+    def __init__(self, server_errors=None, max_request_size=None):
+        self.server_errors = dict(server_errors or {})
+        self.max_request_size = max_request_size
+        self.requests = []
+        self.added = []
+
+    def add_collection(self, job_id, tasks):
+        self.requests.append([task.id for task in tasks])
+        if self.max_request_size and len(tasks) > self.max_request_size:
+            raise FakeBatchErrorException(413)
+        results = []
+        for task in tasks:
+            if self.server_errors.get(task.id):
+                self.server_errors[task.id] -= 1
+                results.append(batch_models.TaskAddResult(status=batch_models.TaskAddStatus.server_error, task_id=task.id))
+            else:
+                self.added.append(task.id)
+                results.append(batch_models.TaskAddResult(status=batch_models.TaskAddStatus.success, task_id=task.id))
+        return batch_models.TaskAddCollectionResult(value=results)
+
+
+class FakeBatchClient:
+    def __init__(self, task_operations):
+        self.task = task_operations
+
+
+def make_tasks(count):
+    return [batch_models.TaskAddParameter(id="app-{}".format(i), command_line="true") for i in range(count)]
+
+
+def test_add_task_collection_adds_tasks_in_chunks():
+    batch_client = FakeBatchClient(FakeTaskOperations())
+
+    helpers.add_task_collection("job", make_tasks(250), batch_client)
+
+    assert sorted(len(request) for request in batch_client.task.requests) == [50, 100, 100]
+    assert len(batch_client.task.added) == 250
+
+
+def test_add_task_collection_retries_failed_tasks_only(monkeypatch):
+    monkeypatch.setattr(helpers.time, "sleep", lambda seconds: None)
+    batch_client = FakeBatchClient(FakeTaskOperations(server_errors={"app-3": 2}))
+
+    helpers.add_task_collection("job", make_tasks(10), batch_client)
+
+    assert batch_client.task.requests[1:] == [["app-3"], ["app-3"]]
+    assert sorted(batch_client.task.added) == sorted(task.id for task in make_tasks(10))
+
+
+def test_add_task_collection_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr(helpers.time, "sleep", lambda seconds: None)
+    batch_client = FakeBatchClient(FakeTaskOperations(server_errors={"app-3": 10}))
+
+    with pytest.raises(AztkError):
+        helpers.add_task_collection("job", make_tasks(10), batch_client, retries=2)
+
+
+def test_add_task_collection_splits_requests_that_are_too_large():
+    batch_client = FakeBatchClient(FakeTaskOperations(max_request_size=30))
+
+    helpers.add_task_collection("job", make_tasks(100), batch_client)
+
+    assert len(batch_client.task.added) == 100
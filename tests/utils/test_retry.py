@@ -1,8 +1,13 @@
 import time
+from email.utils import formatdate
 
 import pytest
+from msrest.pipeline import HTTPSender, Pipeline, Response
+from msrest.universal_http import ClientRequest
 
 from aztk.utils import BackOffPolicy, retry
+from aztk.utils.azure_api import GovernedBatchPolicy
+from aztk.utils.retry import RequestGovernor, TokenBucket, decorrelated_jitter, get_retry_after
 
 
 def test_retry_function_raises_allowed_exception():
@@ -79,3 +84,161 @@ def test_retry_function_backoff_policy_exponential():
     end = time.time()
     print(end - start)
     assert int(end - start) == 7    # 2**0 + 2**1 + 2**3
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class RetryAfterError(Exception):
+    def __init__(self, retry_after):
+        super().__init__()
+        self.response = FakeResponse(503, {"Retry-After": str(retry_after)})
+
+
+def test_retry_function_respects_retry_after():
+    calls = []
+
+    @retry(retry_count=2, retry_interval=10, exceptions=(RetryAfterError))
+    def my_func():
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise RetryAfterError(0)
+
+    my_func()
+    assert len(calls) == 2
+    assert calls[1] - calls[0] < 1
+
+
+def test_retry_function_deadline():
+    calls = []
+    with pytest.raises(ValueError):
+
+        @retry(retry_count=5, retry_interval=10, exceptions=(ValueError), deadline=1)
+        def my_func():
+            calls.append(0)
+            raise ValueError
+
+        my_func()
+
+    # the first retry of the linear policy is immediate, the second one would end past the deadline
+    assert len(calls) == 2
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    delay = 1
+    for _ in range(100):
+        delay = decorrelated_jitter(1, delay, 20)
+        assert 1 <= delay <= 20
+
+
+def test_get_retry_after():
+    assert get_retry_after(FakeResponse(429, {"retry-after": "3"})) == 3
+    assert get_retry_after(FakeResponse(429, {"x-ms-retry-after-ms": "500"})) == 0.5
+    assert 0 < get_retry_after(FakeResponse(429, {"Retry-After": formatdate(time.time() + 60, usegmt=True)})) <= 60
+    assert get_retry_after(FakeResponse(429)) is None
+    assert get_retry_after(None) is None
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_governor_retries_throttled_responses_and_counts_them():
+    governor = RequestGovernor(rates={"batch": None})
+    responses = [FakeResponse(429, {"Retry-After": "0"}), FakeResponse(503, {"Retry-After": "0"}), FakeResponse(200)]
+
+    response = governor.send("batch", lambda: responses.pop(0))
+
+    assert response.status_code == 200
+    assert governor.get_counters()["batch"] == dict(requests=3, throttled=2, retried=2, failed=0)
+
+
+def test_governor_returns_last_response_after_max_retries():
+    governor = RequestGovernor(rates={"batch": None}, max_retries=1)
+    sent = []
+
+    def send():
+        sent.append(FakeResponse(500, {"Retry-After": "0"}))
+        return sent[-1]
+
+    response = governor.send("batch", send, "GET")
+
+    assert response.status_code == 500
+    assert len(sent) == 2
+    assert sent[0].closed
+    assert governor.get_counters()["batch"]["failed"] == 1
+
+
+def test_governor_does_not_retry_past_deadline():
+    governor = RequestGovernor(rates={"batch": None}, deadline=1)
+    sent = []
+
+    def send():
+        sent.append(FakeResponse(503, {"Retry-After": "10"}))
+        return sent[-1]
+
+    assert governor.send("batch", send).status_code == 503
+    assert len(sent) == 1
+
+
+def test_governor_sends_non_idempotent_requests_once_on_failure():
+    governor = RequestGovernor(rates={"batch": None})
+    sent = []
+
+    def send():
+        sent.append(FakeResponse(500, {"Retry-After": "0"}))
+        return sent[-1]
+
+    assert governor.send("batch", send, "POST").status_code == 500
+    assert len(sent) == 1
+
+
+def test_governor_retries_throttled_non_idempotent_requests():
+    governor = RequestGovernor(rates={"batch": None})
+    responses = [FakeResponse(503, {"Retry-After": "0"}), FakeResponse(503), FakeResponse(201)]
+
+    # a 503 without Retry-After may come from a request that was carried out
+    assert governor.send("batch", lambda: responses.pop(0), "POST").status_code == 503
+    assert governor.get_counters()["batch"]["requests"] == 2
+
+
+class FakeHTTPResponse:
+    def __init__(self, status_code):
+        self.internal_response = FakeResponse(status_code)
+
+
+class FakeSender(HTTPSender):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.sent = []
+
+    def __exit__(self, *exc_details):
+        pass
+
+    def send(self, request, **kwargs):
+        self.sent.append(request.http_request.method)
+        return Response(request, FakeHTTPResponse(self.status_code))
+
+
+@pytest.mark.parametrize("method, sent", [("POST", 1), ("GET", 2)])
+def test_batch_pipeline_sends_post_answered_with_500_once(method, sent):
+    sender = FakeSender(500)
+    governor = RequestGovernor(rates={"batch": None}, max_retries=1)
+    governor.base_delay = governor.max_delay = 0
+    pipeline = Pipeline([GovernedBatchPolicy(governor)], sender)
+
+    response = pipeline.run(ClientRequest(method, "https://account.batch.azure.com/jobs/job/tasks"))
+
+    assert response.http_response.internal_response.status_code == 500
+    assert sender.sent == [method] * sent
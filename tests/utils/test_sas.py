@@ -0,0 +1,60 @@
+import datetime
+import time
+
+from aztk.utils import sas
+from tests.fakes import FakeBlobClient
+
+
+def test_resource_files_get_a_token_of_their_blob_by_default():
+    blob_client = FakeBlobClient()
+    provider = sas.SasProvider(blob_client)
+
+    resource_file = provider.get_resource_file("cluster", "app/app.py", "app.py")
+
+    assert blob_client.generated == [("cluster", "app/app.py", sas.constants.SAS_EXPIRY)]
+    assert resource_file.blob_source == "https://account/cluster/app/app.py?blob-sas-1"
+
+
+def test_resource_files_of_a_container_share_one_token_when_opted_in():
+    blob_client = FakeBlobClient()
+    provider = sas.SasProvider(blob_client, container_scope=True)
+
+    resource_files = [provider.get_resource_file("cluster", "app-{}/app.py".format(i), "app.py") for i in range(100)]
+    provider.get_resource_file("other", "app.py", "app.py")
+
+    assert [generated[:2] for generated in blob_client.generated] == [("cluster", None), ("other", None)]
+    assert resource_files[42].blob_source == "https://account/cluster/app-42/app.py?container-sas-1"
+
+
+def test_blob_scoped_tokens_are_cached_per_blob_and_expiry():
+    blob_client = FakeBlobClient()
+    provider = sas.SasProvider(blob_client)
+
+    provider.get_blob_url("cluster", "a")
+    provider.get_blob_url("cluster", "a")
+    provider.get_blob_url("cluster", "b")
+    provider.get_blob_url("cluster", "a", datetime.timedelta(days=365))
+
+    assert blob_client.generated == [
+        ("cluster", "a", datetime.timedelta(days=7)),
+        ("cluster", "b", datetime.timedelta(days=7)),
+        ("cluster", "a", datetime.timedelta(days=365)),
+    ]
+
+
+def test_tokens_are_generated_again_once_older_than_max_age():
+    blob_client = FakeBlobClient()
+    provider = sas.SasProvider(blob_client, max_age=datetime.timedelta(microseconds=1))
+
+    provider.get_blob_sas("cluster", "a")
+    time.sleep(0.01)
+    provider.get_blob_sas("cluster", "a")
+
+    assert len(blob_client.generated) == 2
+
+
+def test_providers_are_shared_per_blob_client():
+    blob_client = FakeBlobClient()
+
+    assert sas.get_sas_provider(blob_client) is sas.get_sas_provider(blob_client)
+    assert sas.get_sas_provider(blob_client) is not sas.get_sas_provider(FakeBlobClient())
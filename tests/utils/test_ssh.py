@@ -0,0 +1,709 @@
+import asyncio
+import hashlib
+import os
+import socket
+import subprocess
+import threading
+import time
+
+import pytest
+
+from aztk.utils import ssh
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def send_ignore(self):
+        if not self.active:
+            raise EOFError()
+
+
+class FakeClient:
+    def __init__(self, hostname, port, username):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def fake_connect(hostname, port=22, username=None, password=None, pkey=None, timeout=None):
+        client = FakeClient(hostname, port, username)
+        opened.append(client)
+        return client
+
+    monkeypatch.setattr(ssh, "connect", fake_connect)
+    return opened
+
+
+def test_connection_pool_reuses_connection(connections):
+    pool = ssh.ConnectionPool()
+    with pool.connection("10.0.0.4", 50000, "user", pkey="key") as client:
+        pass
+    with pool.connection("10.0.0.4", "50000", "user", pkey="key") as same_client:
+        pass
+
+    assert client is same_client
+    assert len(connections) == 1
+    assert not client.closed
+
+
+def test_connection_pool_keys_on_credentials(connections):
+    pool = ssh.ConnectionPool()
+    with pool.connection("10.0.0.4", 22, "user", pkey="key"):
+        pass
+    with pool.connection("10.0.0.4", 22, "user", pkey="other-key"):
+        pass
+    with pool.connection("10.0.0.4", 22, "other-user", pkey="key"):
+        pass
+    with pool.connection("10.0.0.5", 22, "user", pkey="key"):
+        pass
+
+    assert len(connections) == 4
+    assert len(pool) == 4
+
+
+def test_connection_pool_replaces_dead_connection(connections):
+    pool = ssh.ConnectionPool()
+    with pool.connection("10.0.0.4", 22, "user", pkey="key") as client:
+        pass
+    client.transport.active = False
+
+    with pool.connection("10.0.0.4", 22, "user", pkey="key") as new_client:
+        pass
+
+    assert new_client is not client
+    assert client.closed
+    assert len(pool) == 1
+
+
+def test_connection_pool_evicts_idle_connections(connections):
+    pool = ssh.ConnectionPool(max_idle_time=0)
+    with pool.connection("10.0.0.4", 22, "user", pkey="key") as client:
+        time.sleep(0.01)
+        pool.evict_idle()
+        assert not client.closed
+    time.sleep(0.01)
+    pool.evict_idle()
+
+    assert client.closed
+    assert len(pool) == 0
+
+
+def test_connection_pool_evict_user(connections):
+    pool = ssh.ConnectionPool()
+    with pool.connection("10.0.0.4", 22, "user", pkey="key") as client:
+        pass
+    with pool.connection("10.0.0.4", 22, "other-user", pkey="key") as other_client:
+        pass
+
+    pool.evict_user("user")
+
+    assert client.closed
+    assert not other_client.closed
+    assert len(pool) == 1
+
+
+def test_connection_pool_closes_connection_evicted_while_in_use(connections):
+    pool = ssh.ConnectionPool()
+    with pool.connection("10.0.0.4", 22, "user", pkey="key") as client:
+        pool.close()
+        assert not client.closed
+
+    assert client.closed
+
+
+class FakeNode:
+    def __init__(self, id):
+        self.id = id
+
+
+def _run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def test_node_executor_returns_partial_results_on_timeout():
+    executor = ssh.NodeExecutor(max_in_flight=4, node_timeout=0.2)
+    nodes = [(FakeNode("fast"), None), (FakeNode("slow"), None)]
+
+    def make_call(node, node_rls):
+        def call():
+            if node.id == "slow":
+                time.sleep(1)
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    outputs = _run(executor.map(nodes, make_call))
+    executor.shutdown(wait=False)
+
+    assert [output.id for output in outputs] == ["fast", "slow"]
+    assert outputs[0].output == "done" and outputs[0].error is None
+    assert outputs[1].error is not None
+    assert outputs[0].latency < outputs[1].latency
+    assert outputs[1].latency >= 0.2
+
+
+def test_node_executor_times_nodes_from_when_they_start():
+    executor = ssh.NodeExecutor(max_in_flight=1, node_timeout=0.2)
+    nodes = [(FakeNode("hung"), None), (FakeNode("queued"), None)]
+
+    def make_call(node, node_rls):
+        def call():
+            # the hung node ignores its deadline and keeps the only worker after it timed out
+            time.sleep(0.5 if node.id == "hung" else 0)
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    outputs = _run(executor.map(nodes, make_call))
+    executor.shutdown()
+
+    assert outputs[0].error is not None
+    assert outputs[1].output == "done" and outputs[1].error is None
+
+
+def test_node_executor_deadline_frees_worker_of_hung_node():
+    executor = ssh.NodeExecutor(max_in_flight=1, node_timeout=0.2)
+    nodes = [(FakeNode("hung"), None), (FakeNode("fast"), None)]
+
+    def make_call(node, node_rls):
+        def call():
+            try:
+                while node.id == "hung":
+                    # stands for a blocking SSH operation, whose timeout is capped by the deadline
+                    time.sleep(min(ssh._call_timeout(), 0.01))
+            except socket.timeout as e:
+                return ssh.NodeOutput(node.id, None, e)
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    outputs = _run(executor.map(nodes, make_call))
+    executor.shutdown()
+
+    assert outputs[0].error is not None
+    assert outputs[1].output == "done" and outputs[1].error is None
+    assert ssh._call_timeout(5) == 5
+
+
+def test_node_executor_bounds_in_flight_calls():
+    executor = ssh.NodeExecutor(max_in_flight=2)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def make_call(node, node_rls):
+        def call():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    outputs = _run(executor.map([(FakeNode(str(i)), None) for i in range(8)], make_call))
+    executor.shutdown()
+
+    assert len(outputs) == 8
+    assert state["peak"] == 2
+
+
+def test_node_executor_imap_yields_in_completion_order():
+    executor = ssh.NodeExecutor(max_in_flight=4)
+    nodes = [(FakeNode("slow"), None), (FakeNode("fast"), None)]
+
+    def make_call(node, node_rls, emit):
+        def call():
+            emit(ssh.SSHLog("started", node.id))
+            time.sleep(0.3 if node.id == "slow" else 0)
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    results = list(executor.imap(nodes, make_call))
+    executor.shutdown()
+
+    outputs = [result for result in results if isinstance(result, ssh.NodeOutput)]
+    logs = [result for result in results if isinstance(result, ssh.SSHLog)]
+    assert [output.id for output in outputs] == ["fast", "slow"]
+    assert sorted(log.node_id for log in logs) == ["fast", "slow"]
+    assert results.index(logs[0]) < results.index(outputs[0])
+
+
+def test_node_executor_imap_times_out_hung_node():
+    executor = ssh.NodeExecutor(max_in_flight=4, node_timeout=0.2)
+    nodes = [(FakeNode("hung"), None), (FakeNode("fast"), None)]
+
+    def make_call(node, node_rls, emit):
+        def call():
+            time.sleep(1 if node.id == "hung" else 0)
+            return ssh.NodeOutput(node.id, "done", None)
+
+        return call
+
+    start = time.time()
+    outputs = list(executor.imap(nodes, make_call))
+    executor.shutdown(wait=False)
+
+    assert time.time() - start < 0.9
+    assert [output.id for output in outputs] == ["fast", "hung"]
+    assert outputs[1].error is not None
+
+
+def test_output_capture_keeps_small_output_in_memory():
+    capture = ssh.OutputCapture()
+    capture.write(b"hello ")
+    capture.write(b"world")
+
+    assert capture.result() == "hello world"
+
+
+def test_output_capture_spills_large_output_to_disk_when_asked():
+    capture = ssh.OutputCapture(spill_threshold=16)
+    for _ in range(8):
+        capture.write(b"0123456789")
+
+    output = capture.result(spill=True)
+    assert not isinstance(output, str)
+    assert output.read() == b"0123456789" * 8
+
+
+def test_output_capture_returns_large_output_as_str_by_default():
+    capture = ssh.OutputCapture(spill_threshold=16)
+    for _ in range(8):
+        capture.write(b"0123456789")
+
+    assert capture.result() == "0123456789" * 8
+
+
+def test_output_capture_truncates_middle_of_output():
+    capture = ssh.OutputCapture(max_size=20)
+    capture.write(b"a" * 10)
+    for _ in range(10):
+        capture.write(b"b" * 10)
+    capture.write(b"c" * 10)
+
+    output = capture.result()
+    assert capture.size == 120
+    assert capture.truncated == 100
+    assert output.startswith("a" * 10)
+    assert output.endswith("c" * 10)
+    assert "100 bytes truncated" in output
+
+
+class FakeChannel:
+    def __init__(self, data, chunk_size):
+        self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    def recv(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_drain_channel_splits_lines_across_chunks():
+    lines = []
+    capture = ssh.OutputCapture()
+    ssh._drain_channel(FakeChannel(b"first line\nsecond\nlast", chunk_size=4), capture, lines.append)
+
+    assert lines == ["first line", "second", "last"]
+    assert capture.result() == "first line\nsecond\nlast"
+
+
+class LoopbackTransport:
+    """Stand-in for an SSH transport whose channels are plain TCP connections to the destination"""
+
+    def __init__(self):
+        self.opened = 0
+
+    def open_channel(self, kind, dest_addr, src_addr):
+        self.opened += 1
+        return socket.create_connection(dest_addr)
+
+
+@pytest.fixture
+def echo_server():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+
+    def echo(connection):
+        with connection:
+            while True:
+                data = connection.recv(1024 * 1024)
+                if not data:
+                    break
+                connection.sendall(data)
+
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=echo, args=(connection,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+def _echo_through(port, payload):
+    received = hashlib.sha256()
+    with socket.create_connection(("127.0.0.1", port)) as client:
+
+        def send():
+            client.sendall(payload)
+            client.shutdown(socket.SHUT_WR)
+
+        sender = threading.Thread(target=send)
+        sender.start()
+        while True:
+            data = client.recv(1024 * 1024)
+            if not data:
+                break
+            received.update(data)
+        sender.join()
+    return received.hexdigest()
+
+
+def test_port_forwarder_multiplexes_connections_on_one_transport(echo_server):
+    transport = LoopbackTransport()
+    forwarder = ssh.PortForwarder(transport)
+    first_port = forwarder.add_forward(0, "127.0.0.1", echo_server, bind_address="127.0.0.1")
+    second_port = forwarder.add_forward(0, "127.0.0.1", echo_server, bind_address="127.0.0.1")
+    thread = forwarder.start()
+
+    payload = os.urandom(1024 * 1024)
+    results = []
+    clients = [
+        threading.Thread(target=lambda port=port: results.append(_echo_through(port, payload)))
+        for port in [first_port, second_port] * 4
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    forwarder.close()
+
+    assert results == [hashlib.sha256(payload).hexdigest()] * 8
+    assert transport.opened == 8
+    assert not thread.is_alive()
+
+
+class FakeSFTPClient:
+    def __init__(self, uploads):
+        self.uploads = uploads
+
+    def get_channel(self):
+        return LocalExecChannel(None)
+
+    def put(self, source_path, destination_path):
+        self.uploads.append(destination_path)
+
+    def open(self, path, mode):
+        return open(os.devnull, mode)
+
+    def chmod(self, path, mode):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeLogin:
+    def __init__(self, ip_address, port=22):
+        self.ip_address = ip_address
+        self.port = port
+
+
+@pytest.fixture
+def broadcast_commands(monkeypatch):
+    commands = []
+    uploads = []
+
+    @ssh.contextlib.contextmanager
+    def fake_open_connection(connection_pool, hostname, port, username, password=None, pkey=None, timeout=None):
+        client = FakeClient(hostname, port, username)
+        client.open_sftp = lambda: FakeSFTPClient(uploads)
+        yield client
+
+    def fake_exec_checked(client, command, timeout=None):
+        commands.append((client.hostname, command))
+        if "@10.0.0.3:" in command:
+            raise ssh.AztkError("unreachable")
+        return ""
+
+    monkeypatch.setattr(ssh, "_open_connection", fake_open_connection)
+    monkeypatch.setattr(ssh, "_exec_checked", fake_exec_checked)
+    return commands, uploads
+
+
+def test_broadcast_copy_uploads_once_and_fans_out(broadcast_commands):
+    commands, uploads = broadcast_commands
+    nodes = []
+    for i in range(6):
+        node = FakeNode("node{}".format(i))
+        node.ip_address = "10.0.0.{}".format(i)
+        nodes.append((node, FakeLogin("public{}".format(i))))
+
+    outputs = _run(
+        ssh.clus_broadcast_copy(
+            "user", nodes, "/local/data.bin", "/remote/data.bin", ssh_key="key", container_name="spark"))
+
+    assert len(uploads) == 1
+    sends = [(host, command) for host, command in commands if "scp" in command]
+    assert sorted(
+        command.split("@")[1].split(" ")[0] for _, command in sends) == ["10.0.0.{}".format(i) for i in range(1, 6)]
+    # node3 failed to receive the file, so it never sends it on
+    assert not any(host == "public3" for host, _ in sends)
+    assert [output.id for output in outputs] == [node.id for node, _ in nodes]
+    assert [output.error is None for output in outputs] == [True, True, True, False, True, True]
+    installs = [host for host, command in commands if "docker cp" in command]
+    assert sorted(installs) == ["public0", "public1", "public2", "public4", "public5"]
+    # the receivers authorize a key generated for the copy, and every node removes it
+    authorized = [host for host, command in commands if "authorized_keys &&" in command and "echo" in command]
+    assert sorted(authorized) == ["public{}".format(i) for i in range(1, 6)]
+    cleanups = [host for host, command in commands if "rm -rf /tmp/aztk-broadcast-" in command]
+    assert sorted(cleanups) == ["public{}".format(i) for i in range(6)]
+
+
+def test_broadcast_copy_removes_the_key_from_every_node_when_it_crashes(broadcast_commands, monkeypatch):
+    commands, _ = broadcast_commands
+    exec_checked = ssh._exec_checked
+
+    def crash_on_send(client, command, timeout=None):
+        if "scp" in command:
+            raise RuntimeError("client died")
+        return exec_checked(client, command, timeout)
+
+    monkeypatch.setattr(ssh, "_exec_checked", crash_on_send)
+    nodes = []
+    for i in range(4):
+        node = FakeNode("node{}".format(i))
+        node.ip_address = "10.0.1.{}".format(i)
+        nodes.append((node, FakeLogin("public{}".format(i))))
+
+    with pytest.raises(RuntimeError):
+        _run(ssh.clus_broadcast_copy("user", nodes, "/local/data.bin", "/remote/data.bin", ssh_key="key"))
+
+    cleanups = [host for host, command in commands if "rm -rf /tmp/aztk-broadcast-" in command]
+    assert sorted(cleanups) == ["public{}".format(i) for i in range(4)]
+
+
+class LocalExecChannel:
+    """Stand-in for an SSH channel that runs the command in a local shell instead of a container"""
+
+    def __init__(self, container_root):
+        self.container_root = container_root
+        self.combine_stderr = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def set_combine_stderr(self, combine):
+        self.combine_stderr = combine
+
+    def exec_command(self, command):
+        command = command.replace("sudo docker exec -i spark ", "").replace("sudo docker exec spark ", "")
+        self.process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=self.container_root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if self.combine_stderr else subprocess.PIPE)
+
+    def makefile(self, mode, bufsize=-1):
+        return self.process.stdin if "w" in mode else self.process.stdout
+
+    def makefile_stderr(self, mode):
+        return self.process.stderr
+
+    def sendall(self, data):
+        self.process.stdin.write(data)
+
+    def shutdown_write(self):
+        self.process.stdin.close()
+
+    def recv(self, size):
+        return self.process.stdout.read1(size)
+
+    def recv_exit_status(self):
+        return self.process.wait()
+
+    def close(self):
+        pass
+
+
+def test_node_exec_script_sends_the_script_on_standard_input(tmpdir, monkeypatch):
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.transport.open_session = lambda: LocalExecChannel(str(tmpdir))
+    monkeypatch.setattr(ssh, "connect", lambda **kwargs: client)
+    # longer than the maximum length of a single command line argument
+    script = "".join("echo {} > /dev/null\n".format("x" * 1000) for _ in range(200)) + "echo done\n"
+
+    output = ssh.node_exec_script("node", script, "user", "10.0.0.4", 22, container_name="spark")
+    failed = ssh.node_exec_script("node", "exit 3\n", "user", "10.0.0.4", 22, container_name="spark")
+
+    assert output.error is None
+    assert output.output == "done\n"
+    assert isinstance(failed.error, ssh.AztkError)
+
+
+def test_copy_streams_into_and_out_of_container(tmpdir, monkeypatch):
+    container_root = tmpdir.mkdir("container")
+    source = tmpdir.join("source.bin")
+    payload = os.urandom(3 * 1024 * 1024)
+    source.write_binary(payload)
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.transport.open_session = lambda: LocalExecChannel(str(container_root))
+
+    put_output = ssh._node_copy(client, "node", str(source), str(container_root.join("copied.bin")), "spark")
+    get_output = ssh._copy_from_node(client, "node", str(container_root.join("copied.bin")), None, "spark")
+    missing_output = ssh._node_copy(client, "node", str(source), str(container_root.join("missing", "x")), "spark")
+
+    assert put_output.error is None
+    assert container_root.join("copied.bin").read_binary() == payload
+    assert get_output.error is None
+    get_output.output.seek(0)
+    assert get_output.output.read() == payload
+    assert isinstance(missing_output.error, ssh.AztkError)
+
+
+def test_copy_into_existing_container_directory_keeps_file_name(tmpdir):
+    container_root = tmpdir.mkdir("container")
+    container_root.mkdir("jars")
+    source = tmpdir.join("app|1.jar")
+    source.write("jar")
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.transport.open_session = lambda: LocalExecChannel(str(container_root))
+
+    into_directory = ssh._node_copy(client, "node", str(source), str(container_root.join("jars")), "spark")
+    renamed = ssh._node_copy(client, "node", str(source), str(container_root.join("jars", "a&b|.jar")), "spark")
+
+    assert into_directory.error is None and renamed.error is None
+    assert sorted(os.listdir(str(container_root.join("jars")))) == ["a&b|.jar", "app|1.jar"]
+    assert container_root.join("jars", "app|1.jar").read() == "jar"
+
+
+def test_directory_sync_only_copies_changed_files(tmpdir):
+    container_root = tmpdir.mkdir("container")
+    source = tmpdir.mkdir("package")
+    for i in range(5):
+        source.join("module{}.py".format(i)).write("x = {}\n".format(i))
+    source.mkdir("conf").join("spark-defaults.conf").write("spark.master local\n")
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.transport.open_session = lambda: LocalExecChannel(str(container_root))
+    destination = str(container_root.join("app"))
+
+    first = ssh._node_copy(client, "node", str(source), destination, "spark")
+    source.join("module3.py").write("x = 'changed'\n")
+    second = ssh._node_copy(client, "node", str(source), destination, "spark")
+
+    assert first.output == "6 of 6 files copied"
+    assert second.output == "1 of 6 files copied"
+    assert container_root.join("app", "module3.py").read() == "x = 'changed'\n"
+    assert container_root.join("app", "conf", "spark-defaults.conf").read() == "spark.master local\n"
+    assert ssh.local_manifest(str(source)) == ssh._remote_manifest(client, destination, "spark")
+
+
+class FlakySFTPClient:
+    """Serves payload, dropping the connection after fail_after chunks have been read"""
+
+    def __init__(self, payload, requests, fail_after=None):
+        self.payload = payload
+        self.requests = requests
+        self.fail_after = fail_after
+
+    def get_channel(self):
+        return LocalExecChannel(None)
+
+    def stat(self, path):
+        stat = lambda: None
+        stat.st_size = len(self.payload)
+        return stat
+
+    @ssh.contextlib.contextmanager
+    def open(self, path, mode):
+        remote_file = lambda: None
+        remote_file.readv = self.readv
+        yield remote_file
+
+    def readv(self, chunks):
+        self.requests.append(chunks)
+        for i, (offset, length) in enumerate(chunks):
+            if self.fail_after is not None and i == self.fail_after:
+                raise EOFError()
+            yield self.payload[offset:offset + length]
+
+    def close(self):
+        pass
+
+
+def test_download_resumes_after_connection_drop(monkeypatch):
+    monkeypatch.setattr(ssh.constants, "SSH_DOWNLOAD_CHUNK_SIZE", 1024)
+    monkeypatch.setattr(ssh.constants, "SSH_DOWNLOAD_WINDOW", 4096)
+    payload = os.urandom(10 * 1024 + 100)
+    requests = []
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.open_sftp = lambda: FlakySFTPClient(payload, requests, fail_after=2)
+    new_client = FakeClient("10.0.0.4", 22, "user")
+    new_client.open_sftp = lambda: FlakySFTPClient(payload, requests)
+
+    output = ssh._copy_from_node(client, "node", "/remote/file", None, reconnect=lambda: new_client)
+
+    assert output.error is None
+    assert output.output.read() == payload
+    assert max(sum(length for _, length in chunks) for chunks in requests) <= 4096
+    # the second connection resumes after the two chunks written by the first one
+    assert requests[1][0][0] == 2048
+
+
+def test_download_budget_spills_to_disk_when_exhausted():
+    budget = ssh.DownloadBudget(max_bytes=100)
+
+    in_memory = budget.temporary_file(60)
+    on_disk = budget.temporary_file(60)
+
+    assert isinstance(in_memory, ssh.tempfile.SpooledTemporaryFile)
+    assert not isinstance(on_disk, ssh.tempfile.SpooledTemporaryFile)
+    assert budget.remaining == 40
+
+
+@pytest.mark.parametrize("output", ["", "--aztk-manifest-hashes--\n", "\n--aztk-manifest-hashes--\n\n"])
+def test_remote_manifest_of_missing_or_empty_directory(monkeypatch, output):
+    monkeypatch.setattr(ssh, "_exec_checked", lambda *args, **kwargs: output)
+
+    assert ssh._remote_manifest(None, "/app") == {}
+
+
+def test_directory_sync_into_empty_directory(tmpdir):
+    container_root = tmpdir.mkdir("container")
+    container_root.mkdir("app")
+    source = tmpdir.mkdir("package")
+    source.join("module.py").write("x = 1\n")
+    client = FakeClient("10.0.0.4", 22, "user")
+    client.transport.open_session = lambda: LocalExecChannel(str(container_root))
+
+    output = ssh._node_copy(client, "node", str(source), str(container_root.join("app")), "spark")
+
+    assert output.output == "1 of 1 files copied"
+    assert container_root.join("app", "module.py").read() == "x = 1\n"
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import azure.batch.models as batch_models
+
+from aztk.utils import helpers
+from aztk.utils.vm_image_cache import VmImageCache
+
+
+class FakeBatchClient:
+    def __init__(self):
+        self.calls = 0
+        self.config = SimpleNamespace(base_url="https://account.region.batch.azure.com")
+        self.account = SimpleNamespace(list_node_agent_skus=self.list_node_agent_skus)
+
+    def list_node_agent_skus(self):
+        self.calls += 1
+        return [
+            batch_models.NodeAgentSku(
+                id="batch.node.ubuntu 16.04",
+                verified_image_references=[
+                    batch_models.ImageReference(publisher="Canonical", offer="UbuntuServer", sku="16.04-LTS",
+                                                version="latest")
+                ],
+            )
+        ]
+
+
+def select(batch_client, cache, refresh=False):
+    return helpers.select_latest_verified_vm_image_with_node_agent_sku(
+        "Canonical", "UbuntuServer", "16.04", batch_client, cache=cache, refresh=refresh)
+
+
+def test_resolved_image_is_cached_on_disk(tmp_path):
+    batch_client = FakeBatchClient()
+    path = str(tmp_path / "vm_images.json")
+
+    select(batch_client, VmImageCache(path))
+    sku, image_reference = select(batch_client, VmImageCache(path))
+
+    assert batch_client.calls == 1
+    assert sku == "batch.node.ubuntu 16.04"
+    assert (image_reference.offer, image_reference.sku, image_reference.version) == ("UbuntuServer", "16.04-LTS",
+                                                                                     "latest")
+
+
+def test_expired_and_refreshed_images_are_resolved_again(tmp_path):
+    batch_client = FakeBatchClient()
+    path = str(tmp_path / "vm_images.json")
+
+    select(batch_client, VmImageCache(path, ttl=0))
+    select(batch_client, VmImageCache(path, ttl=0))
+    select(batch_client, VmImageCache(path), refresh=True)
+
+    assert batch_client.calls == 3
+
+
+def test_cache_is_per_account(tmp_path):
+    batch_client = FakeBatchClient()
+    other_batch_client = FakeBatchClient()
+    other_batch_client.config.base_url = "https://other.region.batch.azure.com"
+    cache = VmImageCache(str(tmp_path / "vm_images.json"))
+
+    select(batch_client, cache)
+    select(other_batch_client, cache)
+
+    assert (batch_client.calls, other_batch_client.calls) == (1, 1)
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "vm_images.json"
+    path.write_text("{")
+    batch_client = FakeBatchClient()
+    cache = VmImageCache(str(path))
+
+    select(batch_client, cache)
+    select(batch_client, cache)
+    cache.clear()
+    select(batch_client, cache)
+
+    assert batch_client.calls == 2
@@ -0,0 +1,75 @@
+import threading
+
+import azure.batch.models as batch_models
+import pytest
+
+from aztk.error import WaitCancelledError, WaitTimeoutError
+from aztk.utils import waiter
+
+
+class RecordingWaiter(waiter.Waiter):
+    def __init__(self, **kwargs):
+        super().__init__(jitter=0, **kwargs)
+        self.sleeps = []
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+def test_delay_backs_off_while_state_is_unchanged_and_resets_on_change():
+    states = iter(["a", "a", "a", "b", "b", "done"])
+    recording_waiter = RecordingWaiter(initial_delay=1, max_delay=3, multiplier=2)
+
+    def poll():
+        state = next(states)
+        return state == "done", state
+
+    result = recording_waiter.wait(poll)
+
+    assert result == "done"
+    assert recording_waiter.sleeps == [1, 2, 3, 1, 2]
+
+
+def test_wait_times_out():
+    with pytest.raises(WaitTimeoutError):
+        waiter.Waiter(initial_delay=0.01, timeout=0.05).wait(lambda: (False, None))
+
+
+def test_wait_is_cancelled():
+    cancel_event = threading.Event()
+    timer = threading.Timer(0.05, cancel_event.set)
+    timer.start()
+    with pytest.raises(WaitCancelledError):
+        waiter.Waiter(initial_delay=10, cancel_event=cancel_event).wait(lambda: (False, None))
+    timer.cancel()
+
+
+class FakeTask:
+    def __init__(self, id, state):
+        self.id = id
+        self.state = state
+
+
+class FakeTaskOperations:
+    def __init__(self, ticks):
+        self.ticks = iter(ticks)
+        self.options = []
+
+    def list(self, job_id, task_list_options=None):
+        self.options.append(task_list_options)
+        return [FakeTask(id, batch_models.TaskState.running) for id in next(self.ticks)]
+
+
+class FakeBatchClient:
+    def __init__(self, ticks):
+        self.task = FakeTaskOperations(ticks)
+
+
+def test_wait_for_tasks_uses_one_filtered_list_call_per_poll():
+    batch_client = FakeBatchClient([["app-1", "app-2", "other"], ["app-2", "other"], ["other"]])
+
+    waiter.wait_for_tasks(batch_client, "cluster", ["app-1", "app-2"], waiter=RecordingWaiter())
+
+    assert len(batch_client.task.options) == 3
+    assert batch_client.task.options[0].filter == "state ne 'completed'"
+    assert batch_client.task.options[0].select == "id,state"